@@ -0,0 +1,195 @@
+"""
+Проектирование дешёвой связной магистрали по координатам узлов.
+
+Кандидаты — разреженный граф из topology (Делоне или k ближайших), вес
+ребра — connection_cost соединения на выбранном кабеле (длина ×
+cost_per_unit). Из кандидатов выбирается:
+  connectivity = 1 — минимальное остовное дерево (Краскал, система
+                     непересекающихся множеств). На рёбрах Делоне это
+                     точное евклидово MST всех пар;
+  connectivity = 2 — MST плюс самые дешёвые рёбра, закрывающие его мосты:
+                     после этого обрыв любого одного канала не делит сеть;
+  connectivity = k ≥ 3 — объединение k остовных лесов, каждый — минимальный
+                     по оставшимся кандидатам. Такое объединение
+                     k-рёберно-связно, если таковы кандидаты.
+Дополнение до k-связности — эвристика (точная задача NP-трудна).
+Всё — O(E log E) по числу кандидатов E, т. е. ~O(n log n) для 100k узлов.
+
+Уже существующие соединения (existing) считаются бесплатными: они входят
+в магистраль первыми, а в результат попадают только новые рёбра.
+"""
+from typing import Iterable, List, Optional, Tuple
+
+from models import Cable
+from topology import DEFAULT_K, EdgeList, edges_from_pairs, topology_edges
+from profiling import profiled
+
+# Способы кандидатов, которые всегда дают связный граф
+CONNECTED_CANDIDATES = ("delaunay", "gabriel", "complete")
+
+
+class DisjointSets:
+    """Система непересекающихся множеств 0..n-1 (объединение по размеру, сжатие путей)."""
+    __slots__ = ("parent", "size", "count")
+
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+        self.size = [1] * n
+        self.count = n  # число множеств
+
+    def find(self, a: int) -> int:
+        parent = self.parent
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
+
+    def union(self, a: int, b: int) -> bool:
+        """Объединяет множества a и b; False — они уже были одним."""
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        self.count -= 1
+        return True
+
+
+def _spanning_forest(n: int, ends: List[Tuple[int, int]], order: List[int], used: bytearray) -> List[int]:
+    """Краскал: рёбра (номера в ends) минимального остовного леса из ещё не использованных."""
+    sets = DisjointSets(n)
+    forest = []
+    for e in order:
+        if used[e]:
+            continue
+        a, b = ends[e]
+        if sets.union(a, b):
+            forest.append(e)
+            if sets.count == 1:
+                break
+    return forest
+
+
+def _cover_bridges(n: int, ends: List[Tuple[int, int]], order: List[int], tree: List[int]) -> List[int]:
+    """
+    Жадно закрывает мосты остовного леса tree: рёбра вне дерева берутся по
+    возрастанию стоимости, если путь между их концами по дереву содержит ещё
+    не закрытое ребро. Закрытые рёбра дерева стягиваются (up — верх уже
+    закрытого участка), поэтому каждое ребро дерева проходится один раз.
+    """
+    adjacency: List[List[int]] = [[] for _ in range(n)]
+    for e in tree:
+        a, b = ends[e]
+        adjacency[a].append(b)
+        adjacency[b].append(a)
+    parent = [-1] * n
+    depth = [0] * n
+    root = [-1] * n
+    for start in range(n):
+        if root[start] != -1:
+            continue
+        root[start] = start
+        stack = [start]
+        while stack:
+            a = stack.pop()
+            for b in adjacency[a]:
+                if root[b] == -1:
+                    root[b] = start
+                    parent[b] = a
+                    depth[b] = depth[a] + 1
+                    stack.append(b)
+
+    up = list(range(n))
+
+    def top(a: int) -> int:
+        while up[a] != a:
+            up[a] = up[up[a]]
+            a = up[a]
+        return a
+
+    in_tree = set(tree)
+    added = []
+    for e in order:
+        if e in in_tree:
+            continue
+        a, b = ends[e]
+        if root[a] != root[b]:
+            continue
+        a, b = top(a), top(b)
+        if a == b:
+            continue
+        added.append(e)
+        while a != b:
+            if depth[a] < depth[b]:
+                a, b = b, a
+            up[a] = parent[a]
+            a = top(a)
+    return added
+
+
+@profiled("design_backbone")
+def design_backbone(nodes, cable: Cable, candidates: str = "delaunay", k: int = DEFAULT_K,
+                    connectivity: int = 1, existing: Iterable[Tuple[int, int]] = (),
+                    radius: Optional[float] = None) -> EdgeList:
+    """
+    Рёбра магистрали (см. описание модуля) для узлов — списка Node или NodeTable.
+    candidates — способ из topology.METHODS (k — для knn, radius — для radius);
+    если такие кандидаты не связывают сеть, к ним добавляются рёбра Делоне.
+    existing — пары позиций узлов, уже связанных соединениями
+    (topology.existing_pairs). Возвращаются только новые рёбра.
+    """
+    if connectivity < 1:
+        raise ValueError("Связность магистрали должна быть не меньше 1.")
+    n = len(nodes)
+    fixed = {(a, b) if a < b else (b, a) for a, b in existing if a != b}
+    edges = topology_edges(nodes, candidates, k, radius).exclude(fixed)
+    ends, weights = _weighted(edges, cable, fixed)
+    order = _order(weights)
+    used = bytearray(len(ends))
+
+    forest = _spanning_forest(n, ends, order, used)
+    if len(forest) < n - 1 and candidates not in CONNECTED_CANDIDATES:
+        # k ближайших или радиус разбили узлы на группы — связываем их рёбрами Делоне
+        extra = topology_edges(nodes, "delaunay").exclude(fixed).exclude(edges.pairs())
+        more_ends, more_weights = _weighted(extra, cable, ())
+        ends += more_ends
+        weights += more_weights
+        order = _order(weights)
+        used = bytearray(len(ends))
+        forest = _spanning_forest(n, ends, order, used)
+
+    chosen = list(forest)
+    if connectivity == 2:
+        chosen += _cover_bridges(n, ends, order, forest)
+    elif connectivity > 2:
+        for e in forest:
+            used[e] = 1
+        for _ in range(connectivity - 1):
+            forest = _spanning_forest(n, ends, order, used)
+            if not forest:
+                break
+            for e in forest:
+                used[e] = 1
+            chosen += forest
+    return edges_from_pairs(nodes, (ends[e] for e in chosen if ends[e] not in fixed))
+
+
+def _weighted(edges: EdgeList, cable: Cable, fixed) -> Tuple[List[Tuple[int, int]], List[float]]:
+    """Концы и стоимости рёбер; существующие соединения — со стоимостью -1 (идут первыми)."""
+    ends = edges.pairs()
+    cost = cable.cost_per_unit
+    weights = [d * cost for d in edges.distance.tolist()]
+    ends += sorted(fixed)
+    weights += [-1.0] * len(fixed)
+    return ends, weights
+
+
+def _order(weights: List[float]) -> List[int]:
+    return sorted(range(len(weights)), key=weights.__getitem__)
+
+
+def backbone_cost(edges: EdgeList, cable: Cable) -> float:
+    """Суммарная стоимость каналов магистрали на кабеле cable (как sum_cable_costs)."""
+    return float(sum(edges.distance.tolist())) * cable.cost_per_unit
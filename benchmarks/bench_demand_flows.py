@@ -0,0 +1,85 @@
+"""
+Сравнение compute_flows_on_connections и compute_flows_by_demand
+на случайной геометрической сети с разреженной матрицей нагрузки.
+
+Запуск:
+    python benchmarks/bench_demand_flows.py --nodes 2000 --sources 5
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Router, Node, Cable, Connection, TrafficMatrix
+from logic import compute_flows_on_connections, compute_flows_by_demand
+
+
+def make_network(n_nodes: int, degree: int, seed: int):
+    """Случайные узлы на квадрате 1000x1000, каждый соединён с degree ближайшими."""
+    rnd = random.Random(seed)
+    router = Router("bench", 10**9, 1.0)
+    cable = Cable("bench", 1.0, 10**9)
+    nodes = [Node(rnd.uniform(0, 1000), rnd.uniform(0, 1000), f"n{i}", router)
+             for i in range(n_nodes)]
+
+    # Сначала цепочка, чтобы граф был связным, затем ближайшие соседи
+    pairs = set()
+    for i in range(n_nodes - 1):
+        pairs.add((i, i + 1))
+    for i, a in enumerate(nodes):
+        sample = rnd.sample(range(n_nodes), min(n_nodes, 40))
+        sample.sort(key=lambda j: (nodes[j].x - a.x) ** 2 + (nodes[j].y - a.y) ** 2)
+        for j in sample[1:degree + 1]:
+            if i != j:
+                pairs.add((min(i, j), max(i, j)))
+
+    connections = [Connection(f"c{k}", nodes[i], nodes[j], cable)
+                   for k, (i, j) in enumerate(sorted(pairs))]
+    return nodes, connections
+
+
+def make_sparse_demands(nodes, n_sources: int, per_source: int, seed: int) -> TrafficMatrix:
+    rnd = random.Random(seed + 1)
+    tm = TrafficMatrix()
+    for src in rnd.sample(nodes, min(n_sources, len(nodes))):
+        for dst in rnd.sample(nodes, min(per_source, len(nodes))):
+            tm.set_demand(src.name, dst.name, float(rnd.randint(1, 100)))
+    return tm
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    res = fn(*args)
+    return time.perf_counter() - start, res
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, nargs="+", default=[200, 1000])
+    parser.add_argument("--degree", type=int, default=3)
+    parser.add_argument("--sources", type=int, default=5)
+    parser.add_argument("--per-source", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'nodes':>8} {'edges':>8} {'demands':>8} {'all-pairs, s':>13} {'by-demand, s':>13} {'speedup':>8}")
+    for n in args.nodes:
+        nodes, connections = make_network(n, args.degree, args.seed)
+        tm = make_sparse_demands(nodes, args.sources, args.per_source, args.seed)
+
+        t_old, old = timed(compute_flows_on_connections, nodes, connections, tm, 128.0)
+        t_new, new = timed(compute_flows_by_demand, nodes, connections, tm, 128.0)
+
+        for conn in connections:
+            if abs(old[conn]["flow"] - new[conn]["flow"]) > 1e-6 or old[conn]["packet"] != new[conn]["packet"]:
+                raise SystemExit(f"Результаты расходятся на соединении {conn.name}")
+
+        print(f"{n:>8} {len(connections):>8} {len(tm.demands):>8} "
+              f"{t_old:>13.3f} {t_new:>13.3f} {t_old / t_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Масштабирование parallel.shortest_path_trees по числу процессов.
+
+Запуск:
+    python benchmarks/bench_parallel.py --nodes 2000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic import build_compact_graph
+from parallel import shortest_path_trees
+from bench_demand_flows import make_network
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1000, 3000])
+    parser.add_argument("--degree", type=int, default=3)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"CPU: {os.cpu_count()}")
+    print(f"{'nodes':>8} {'edges':>8} {'workers':>8} {'time, s':>9} {'speedup':>8}")
+    for n in args.nodes:
+        nodes, connections = make_network(n, args.degree, args.seed)
+        graph = build_compact_graph(nodes, connections)
+        base = None
+        reference = None
+        for workers in args.workers:
+            start = time.perf_counter()
+            dists, preds = shortest_path_trees(graph, workers, min_parallel_nodes=0)
+            elapsed = time.perf_counter() - start
+            if reference is None:
+                reference = dists
+            elif any(a != b for a, b in zip(reference, dists)):
+                raise SystemExit("Расстояния при разном числе процессов не совпадают")
+            base = base or elapsed
+            print(f"{n:>8} {graph.edge_count():>8} {workers:>8} {elapsed:>9.3f} {base / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
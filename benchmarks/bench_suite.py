@@ -0,0 +1,271 @@
+"""
+Набор бенчмарков функций logic на синтетических сетях (benchmarks/generators.py).
+
+Для каждого генератора и размера сети замеряются:
+  dijkstra_with_paths          — один источник по словарному графу;
+  calculate_all_shortest_paths — деревья путей от всех источников;
+  compute_flows_on_connections — потоки по гравитационной матрице нагрузки;
+  load_data_from_file          — чтение сценария, записанного save_data_to_file.
+
+Время — минимум из --repeat запусков (без tracemalloc), пиковая память —
+отдельным запуском под tracemalloc. Функции с квадратичной стоимостью
+ограничены по размеру (FUNCTION_LIMITS); кроме того, если замер дольше
+--budget секунд, большие размеры этой пары «генератор/функция» пропускаются.
+
+Результаты пишутся в JSON (--output) и сравниваются с прошлым запуском:
+    python benchmarks/bench_suite.py --sizes 10 100 1000 -o base.json
+    python benchmarks/bench_suite.py --sizes 10 100 1000 -o new.json --compare base.json
+    python benchmarks/bench_suite.py --compare base.json new.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generators import GENERATORS, gravity_traffic
+from logic import (
+    build_graph,
+    dijkstra_with_paths,
+    calculate_all_shortest_paths,
+    compute_flows_on_connections,
+    save_data_to_file,
+    load_data_from_file,
+)
+
+RESULTS_FORMAT = 1
+DEFAULT_SIZES = [10, 100, 1000, 10_000, 100_000]
+PACKET_SIZE = 128.0
+
+# Наибольшее число узлов, на котором функция ещё запускается (все пары — O(n²) и дольше)
+FUNCTION_LIMITS = {
+    "dijkstra_with_paths": 100_000,
+    "calculate_all_shortest_paths": 2_000,
+    "compute_flows_on_connections": 2_000,
+    "load_data_from_file": 100_000,
+}
+
+# Полная матрица нагрузки — только до этого размера, дальше выборка источников
+FULL_TRAFFIC_LIMIT = 300
+TRAFFIC_SOURCES = 50
+TRAFFIC_PER_SOURCE = 50
+
+
+def make_case(nodes, connections, seed: int) -> Dict[str, Any]:
+    """Сеть и матрица нагрузки для одного размера."""
+    if len(nodes) <= FULL_TRAFFIC_LIMIT:
+        tm = gravity_traffic(nodes, seed)
+    else:
+        tm = gravity_traffic(nodes, seed, n_sources=TRAFFIC_SOURCES, per_source=TRAFFIC_PER_SOURCE)
+    return {"nodes": nodes, "connections": connections, "traffic_matrix": tm}
+
+
+def _prepare(function: str, case: Dict[str, Any], tmpdir: str) -> Callable[[], Any]:
+    """Подготовка вне замера; возвращает функцию без аргументов, которую и замеряем."""
+    nodes = case["nodes"]
+    connections = case["connections"]
+    tm = case["traffic_matrix"]
+    if function == "dijkstra_with_paths":
+        graph = build_graph(nodes, connections)
+        start = nodes[0].name
+        return lambda: dijkstra_with_paths(graph, start)
+    if function == "calculate_all_shortest_paths":
+        return lambda: calculate_all_shortest_paths(nodes, connections)
+    if function == "compute_flows_on_connections":
+        return lambda: compute_flows_on_connections(nodes, connections, tm, PACKET_SIZE)
+    if function == "load_data_from_file":
+        filename = os.path.join(tmpdir, f"case_{len(nodes)}.json")
+        routers = [nodes[0].router] if nodes else []
+        cables = [connections[0].cable] if connections else []
+        save_data_to_file(filename, routers, nodes, connections, tm, cables)
+        return lambda: load_data_from_file(filename)
+    raise ValueError(f"Неизвестная функция: {function}")
+
+
+def measure(fn: Callable[[], Any], repeat: int, memory: bool = True) -> Dict[str, Any]:
+    """Минимальное и среднее время из repeat запусков и пик памяти по tracemalloc."""
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    result = {"seconds": min(times), "mean_seconds": sum(times) / len(times), "repeat": repeat}
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn()
+            result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def environment() -> Dict[str, Any]:
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "numpy": numpy_version,
+    }
+
+
+def run_suite(generators: List[str], functions: List[str], sizes: List[int], seed: int = 0,
+              repeat: int = 3, budget: float = 60.0, memory: bool = True,
+              log: Optional[Callable[[str], None]] = None) -> List[Dict[str, Any]]:
+    results = []
+    # (генератор, функция), для которых следующий размер уже не уложится в budget
+    exhausted = set()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for gen_name in generators:
+            generator, gen_limit = GENERATORS[gen_name]
+            for n in sorted(sizes):
+                todo = [f for f in functions
+                        if n <= min(gen_limit, FUNCTION_LIMITS[f]) and (gen_name, f) not in exhausted]
+                if not todo:
+                    continue
+                started = time.perf_counter()
+                case = make_case(*generator(n, seed), seed)
+                build_seconds = time.perf_counter() - started
+                for function in todo:
+                    fn = _prepare(function, case, tmpdir)
+                    row = {
+                        "function": function,
+                        "generator": gen_name,
+                        "nodes": n,
+                        "connections": len(case["connections"]),
+                        "demands": len(case["traffic_matrix"].demands),
+                        "generate_seconds": build_seconds,
+                    }
+                    row.update(measure(fn, repeat, memory))
+                    results.append(row)
+                    if row["seconds"] > budget:
+                        exhausted.add((gen_name, function))
+                    if log is not None:
+                        peak = row.get("peak_bytes")
+                        peak_str = "-" if peak is None else f"{peak / 2**20:.1f}"
+                        log(f"{gen_name:>10} {n:>7} {row['connections']:>8} {function:>30} "
+                            f"{row['seconds']:>10.4f} {peak_str:>10}")
+                del case
+    return results
+
+
+def _key(row: Dict[str, Any]) -> Tuple[str, str, int]:
+    return row["function"], row["generator"], row["nodes"]
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any], threshold: float = 1.25) -> List[Dict[str, Any]]:
+    """
+    Сопоставляет замеры двух файлов по (функция, генератор, размер).
+    Возвращает строки с отношениями new/old; regression — время выросло больше threshold.
+    """
+    old_rows = {_key(row): row for row in old["results"]}
+    rows = []
+    for row in new["results"]:
+        base = old_rows.get(_key(row))
+        if base is None:
+            continue
+        time_ratio = row["seconds"] / base["seconds"] if base["seconds"] > 0 else float('inf')
+        mem_ratio = None
+        if row.get("peak_bytes") and base.get("peak_bytes"):
+            mem_ratio = row["peak_bytes"] / base["peak_bytes"]
+        rows.append({
+            "function": row["function"],
+            "generator": row["generator"],
+            "nodes": row["nodes"],
+            "old_seconds": base["seconds"],
+            "new_seconds": row["seconds"],
+            "time_ratio": time_ratio,
+            "memory_ratio": mem_ratio,
+            "regression": time_ratio > threshold,
+        })
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, Any]]):
+    print(f"{'function':>30} {'generator':>10} {'nodes':>7} {'old, s':>10} {'new, s':>10} "
+          f"{'time':>7} {'memory':>7}")
+    for r in rows:
+        mem = "-" if r["memory_ratio"] is None else f"{r['memory_ratio']:.2f}x"
+        mark = "  !" if r["regression"] else ""
+        print(f"{r['function']:>30} {r['generator']:>10} {r['nodes']:>7} {r['old_seconds']:>10.4f} "
+              f"{r['new_seconds']:>10.4f} {r['time_ratio']:>6.2f}x {mem:>7}{mark}")
+
+
+def _load_results(filename) -> Dict[str, Any]:
+    with open(filename, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("format") != RESULTS_FORMAT:
+        raise SystemExit(f"{filename}: неизвестный формат результатов")
+    return data
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--generators", nargs="+", choices=sorted(GENERATORS), default=sorted(GENERATORS))
+    parser.add_argument("--functions", nargs="+", choices=sorted(FUNCTION_LIMITS), default=list(FUNCTION_LIMITS))
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--budget", type=float, default=60.0,
+                        help="секунд на замер; дольше — большие размеры этой функции пропускаются")
+    parser.add_argument("--no-memory", action="store_true", help="не замерять память (быстрее)")
+    parser.add_argument("-o", "--output", help="файл результатов (JSON)")
+    parser.add_argument("--compare", nargs="+", metavar="FILE",
+                        help="сравнить с прошлым файлом; с двумя файлами — только сравнение, без замеров")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="во сколько раз время может вырасти, прежде чем это считается регрессией")
+    parser.add_argument("--fail-on-regression", action="store_true", help="код возврата 1 при регрессии")
+    args = parser.parse_args(argv)
+
+    if args.compare and len(args.compare) > 2:
+        parser.error("--compare принимает один или два файла")
+
+    if args.compare and len(args.compare) == 2:
+        new = _load_results(args.compare[1])
+    else:
+        print(f"{'generator':>10} {'nodes':>7} {'edges':>8} {'function':>30} {'seconds':>10} {'peak, MiB':>10}")
+        results = run_suite(args.generators, args.functions, args.sizes, args.seed, args.repeat,
+                            args.budget, not args.no_memory, log=lambda line: print(line, flush=True))
+        new = {
+            "format": RESULTS_FORMAT,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "environment": environment(),
+            "parameters": {"seed": args.seed, "repeat": args.repeat, "sizes": sorted(args.sizes),
+                           "generators": args.generators, "functions": args.functions,
+                           "packet_size": PACKET_SIZE},
+            "results": results,
+        }
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(new, f, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        old = _load_results(args.compare[0])
+        if old.get("parameters", {}).get("seed") != new.get("parameters", {}).get("seed"):
+            print("Внимание: запуски сделаны с разным seed", file=sys.stderr)
+        rows = compare(old, new, args.threshold)
+        print()
+        print_comparison(rows)
+        if args.fail_on_regression and any(r["regression"] for r in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
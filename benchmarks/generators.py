@@ -0,0 +1,203 @@
+"""
+Генераторы синтетических сетей и матриц нагрузки для бенчмарков.
+
+Все генераторы детерминированы (seed) и возвращают (nodes, connections)
+из моделей приложения: узлы с координатами (стоимость канала = расстояние),
+один общий роутер и кабель с большой пропускной способностью.
+"""
+import math
+import os
+import random
+import sys
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Router, Node, Cable, Connection, TrafficMatrix
+from spatial import GridIndex
+from topology import topology_edges
+
+Network = Tuple[List[Node], List[Connection]]
+
+
+def _equipment():
+    return Router("bench", 10**9, 1.0), Cable("bench", 1.0, 10**9)
+
+
+def _random_nodes(n: int, rnd: random.Random, side: float, router: Router) -> List[Node]:
+    return [Node(rnd.uniform(0, side), rnd.uniform(0, side), f"n{i}", router) for i in range(n)]
+
+
+def _side(n: int) -> float:
+    """Сторона квадрата, на котором плотность узлов не зависит от n (≈1 узел на 10×10)."""
+    return 10.0 * math.sqrt(max(n, 1))
+
+
+def _connect(nodes: List[Node], pairs, cable: Cable) -> List[Connection]:
+    return [Connection(f"c{k}", nodes[i], nodes[j], cable) for k, (i, j) in enumerate(sorted(pairs))]
+
+
+def random_geometric(n: int, seed: int = 0, avg_degree: float = 6.0) -> Network:
+    """
+    Случайный геометрический граф: узлы равномерно на квадрате, рёбра между
+    всеми парами ближе радиуса r (r подобран под среднюю степень avg_degree).
+    Соседи ищутся через GridIndex, поэтому генерация ~O(n) и для 100k узлов.
+    """
+    rnd = random.Random(seed)
+    router, cable = _equipment()
+    side = _side(n)
+    nodes = _random_nodes(n, rnd, side, router)
+    radius = math.sqrt(avg_degree * side * side / (math.pi * max(n - 1, 1)))
+    index = GridIndex(radius)
+    for i, node in enumerate(nodes):
+        index.insert(i, node.x, node.y)
+    r2 = radius * radius
+    pairs = set()
+    for i, a in enumerate(nodes):
+        for j in index.query(a.x - radius, a.y - radius, a.x + radius, a.y + radius):
+            if j > i:
+                b = nodes[j]
+                if (a.x - b.x) ** 2 + (a.y - b.y) ** 2 <= r2:
+                    pairs.add((i, j))
+    return nodes, _connect(nodes, pairs, cable)
+
+
+def grid(n: int, seed: int = 0) -> Network:
+    """Решётка ближе всего к квадратной (rows × cols ≥ n, лишние узлы не создаются), шаг 10."""
+    router, cable = _equipment()
+    cols = max(1, math.ceil(math.sqrt(n)))
+    nodes = [Node(10.0 * (i % cols), 10.0 * (i // cols), f"n{i}", router) for i in range(n)]
+    pairs = set()
+    for i in range(n):
+        if (i + 1) % cols and i + 1 < n:
+            pairs.add((i, i + 1))
+        if i + cols < n:
+            pairs.add((i, i + cols))
+    return nodes, _connect(nodes, pairs, cable)
+
+
+def waxman(n: int, seed: int = 0, alpha: float = 0.15, avg_degree: float = 4.0) -> Network:
+    """
+    Граф Уоксмана: пара (u, v) принимается с вероятностью exp(-d / (alpha·L)),
+    L — диагональ области. Вместо множителя beta задаётся средняя степень:
+    случайные пары проверяются, пока не наберётся n·avg_degree/2 рёбер, так что
+    генерация стоит O(рёбер), а не O(n²).
+    """
+    rnd = random.Random(seed)
+    router, cable = _equipment()
+    side = _side(n)
+    nodes = _random_nodes(n, rnd, side, router)
+    scale = alpha * side * math.sqrt(2)
+    target = min(int(n * avg_degree / 2), n * (n - 1) // 2)
+    pairs = set()
+    while len(pairs) < target:
+        i, j = rnd.randrange(n), rnd.randrange(n)
+        if i == j:
+            continue
+        a, b = nodes[i], nodes[j]
+        if rnd.random() < math.exp(-math.hypot(a.x - b.x, a.y - b.y) / scale):
+            pairs.add((min(i, j), max(i, j)))
+    return nodes, _connect(nodes, pairs, cable)
+
+
+def barabasi_albert(n: int, seed: int = 0, m: int = 2) -> Network:
+    """
+    Граф Барабаши–Альберт: каждый новый узел присоединяется к m существующим
+    с вероятностью, пропорциональной их степени (список концов рёбер).
+    Координаты случайные — от них зависит стоимость каналов.
+    """
+    rnd = random.Random(seed)
+    router, cable = _equipment()
+    nodes = _random_nodes(n, rnd, _side(n), router)
+    m = max(1, min(m, n - 1))
+    pairs = set()
+    # Начальное ядро — полный граф на m + 1 узле
+    endpoints = []
+    for i in range(min(m + 1, n)):
+        for j in range(i):
+            pairs.add((j, i))
+            endpoints += (i, j)
+    for i in range(m + 1, n):
+        targets = set()
+        while len(targets) < m:
+            targets.add(rnd.choice(endpoints))
+        for j in targets:
+            pairs.add((j, i))
+            endpoints += (i, j)
+    return nodes, _connect(nodes, pairs, cable)
+
+
+def complete(n: int, seed: int = 0) -> Network:
+    """Полносвязный граф (как после «Полносвязный граф» в GUI)."""
+    rnd = random.Random(seed)
+    router, cable = _equipment()
+    nodes = _random_nodes(n, rnd, _side(n), router)
+    pairs = ((i, j) for i in range(n) for j in range(i + 1, n))
+    return nodes, _connect(nodes, pairs, cable)
+
+
+def nearest(n: int, seed: int = 0, k: int = 4) -> Network:
+    """Граф k ближайших соседей на случайных узлах (topology.knn_edges)."""
+    rnd = random.Random(seed)
+    router, cable = _equipment()
+    nodes = _random_nodes(n, rnd, _side(n), router)
+    return nodes, _connect(nodes, topology_edges(nodes, "knn", k).pairs(), cable)
+
+
+def delaunay(n: int, seed: int = 0) -> Network:
+    """Триангуляция Делоне случайных узлов — планарная сеть без длинных каналов."""
+    rnd = random.Random(seed)
+    router, cable = _equipment()
+    nodes = _random_nodes(n, rnd, _side(n), router)
+    return nodes, _connect(nodes, topology_edges(nodes, "delaunay").pairs(), cable)
+
+
+# Имя -> (генератор, наибольшее разумное число узлов)
+GENERATORS: Dict[str, Tuple[Callable[..., Network], int]] = {
+    "geometric": (random_geometric, 100_000),
+    "grid": (grid, 100_000),
+    "waxman": (waxman, 100_000),
+    "ba": (barabasi_albert, 100_000),
+    "complete": (complete, 1_000),
+    "knn": (nearest, 100_000),
+    "delaunay": (delaunay, 100_000),
+}
+
+
+def gravity_traffic(nodes: List[Node], seed: int = 0, total: float = 1e6, gamma: float = 1.0,
+                    n_sources: Optional[int] = None, per_source: Optional[int] = None) -> TrafficMatrix:
+    """
+    Гравитационная модель: T(i, j) ∝ w_i·w_j / (1 + d_ij)^gamma, где веса w —
+    логнормальные «массы» узлов; сумма нагрузок равна total.
+
+    Без ограничений заполняются все пары (O(n²) — только для малых сетей).
+    n_sources / per_source ограничивают число источников и приёмников у
+    каждого: они выбираются с вероятностью, пропорциональной весу.
+    """
+    rnd = random.Random(seed + 1)
+    weights = [rnd.lognormvariate(0.0, 1.0) for _ in nodes]
+    ids = range(len(nodes))
+    if n_sources is None or n_sources >= len(nodes):
+        sources = list(ids)
+    else:
+        sources = list({i for i in rnd.choices(ids, weights=weights, k=n_sources)})
+
+    raw = {}
+    for i in sources:
+        if per_source is None or per_source >= len(nodes):
+            targets = ids
+        else:
+            targets = set(rnd.choices(ids, weights=weights, k=per_source))
+        a = nodes[i]
+        for j in targets:
+            if j == i:
+                continue
+            b = nodes[j]
+            d = math.hypot(a.x - b.x, a.y - b.y)
+            raw[(i, j)] = weights[i] * weights[j] / (1.0 + d) ** gamma
+
+    tm = TrafficMatrix()
+    norm = total / sum(raw.values()) if raw else 0.0
+    for (i, j), value in raw.items():
+        tm.set_demand(nodes[i].name, nodes[j].name, value * norm)
+    return tm
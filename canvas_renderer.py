@@ -0,0 +1,378 @@
+import tkinter as tk
+from itertools import islice
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+
+from models import Node, Connection
+from spatial import GridIndex, SegmentIndex
+
+# Функция перевода координат: логические -> Canvas или Canvas -> логические
+Projection = Callable[[float, float], Tuple[float, float]]
+# Видимая область в логических координатах: (x0, y0, x1, y1)
+Viewport = Tuple[float, float, float, float]
+
+
+class NetworkRenderer:
+    """
+    Отрисовка сети на Canvas без полной перерисовки.
+
+    Для каждого видимого узла и соединения запоминаются id элементов Canvas,
+    поэтому при правке меняются только их координаты (canvas.coords), а
+    добавление и удаление затрагивает лишь элементы одного объекта. Сетка и
+    оси рисуются заново только при изменении размеров холста или положения
+    центра.
+
+    Элементы создаются только для того, что попадает в окно просмотра
+    (узлы ищутся в GridIndex, соединения — в SegmentIndex). Уровни детализации:
+    - подписи скрываются при мелком масштабе или слишком большом числе узлов;
+    - если видимых соединений больше EDGE_MAX_COUNT (или узлов больше
+      NODE_MAX_COUNT), вместо отдельных элементов рисуются тепловые плитки.
+
+    Порядок слоёв: сетка, тепловые плитки, линии соединений, узлы и подписи.
+    Все элементы сети помечены тегом "net": при панорамировании и зуме они
+    сдвигаются одним вызовом canvas.move/canvas.scale (zoom_items, pan_items),
+    а точная перепроекция (reproject) откладывается до конца жеста.
+    """
+    NODE_RADIUS = 5
+    LABEL_OFFSET = 15
+    # Подписи видны при масштабе не мельче этого (пикселей на единицу координат)...
+    LABEL_MIN_SCALE = 1.0
+    # ... и если видимых узлов не больше этого числа
+    LABEL_MAX_COUNT = 400
+    # Пороги перехода к тепловым плиткам
+    EDGE_MAX_COUNT = 5000
+    NODE_MAX_COUNT = 20000
+    # Размер тепловой плитки, пикселей
+    HEAT_TILE = 24
+    # Запас вокруг окна, пикселей: небольшой сдвиг не открывает пустых краёв
+    VIEW_MARGIN = 50
+
+    def __init__(self, canvas: tk.Canvas, to_canvas: Projection, to_logic: Projection,
+                 grid_step: int = 50, index_cell: float = 10.0):
+        self.canvas = canvas
+        self.to_canvas = to_canvas
+        self.to_logic = to_logic
+        self.grid_step = grid_step
+        self.width = int(canvas.cget("width"))
+        self.height = int(canvas.cget("height"))
+
+        # Все объекты сети (в логических координатах)
+        self.node_index = GridIndex(index_cell)
+        self.conn_index = SegmentIndex(index_cell)
+        self._conn_ends: Dict[Connection, Tuple[Node, Node]] = {}
+        self._incident: Dict[Node, Set[Connection]] = {}
+
+        # Только то, что сейчас нарисовано
+        self.node_items: Dict[Node, Tuple[int, int]] = {}   # узел -> (круг, подпись)
+        self.conn_items: Dict[Connection, int] = {}         # соединение -> линия
+        self._heat_items: List[int] = []
+
+        self.viewport: Viewport = (0.0, 0.0, 0.0, 0.0)
+        self.labels_visible = True
+        self.edges_aggregated = False
+        self.nodes_aggregated = False
+        self._grid_key = None
+        # Невидимый маркер слоя: линии соединений поднимаются сразу над ним,
+        # а тепловые плитки опускаются сразу под него
+        self._conn_layer = canvas.create_line(0, 0, 0, 0, state="hidden", tags=("layer",))
+
+    # ------------------------------------------------------------------
+    # Сетка и оси
+    def draw_grid(self, width: int, height: int, center_x: float, center_y: float, force: bool = False):
+        """Рисует сетку и оси, если изменились размеры холста или центр."""
+        self.width, self.height = width, height
+        key = (width, height, center_x, center_y)
+        if key == self._grid_key and not force:
+            return
+        canvas = self.canvas
+        canvas.delete("grid")
+        for x in range(0, width, self.grid_step):
+            canvas.create_line(x, 0, x, height, fill="lightgray", tags=("grid",))
+        for y in range(0, height, self.grid_step):
+            canvas.create_line(0, y, width, y, fill="lightgray", tags=("grid",))
+        canvas.create_line(center_x, 0, center_x, height, fill="red", tags=("grid", "axis", "axis_v"))
+        canvas.create_line(0, center_y, width, center_y, fill="red", tags=("grid", "axis", "axis_h"))
+        canvas.tag_lower("grid")
+        self._grid_key = key
+
+    # ------------------------------------------------------------------
+    # Быстрые преобразования во время жеста: O(1) работы на Python
+    def zoom_items(self, x: float, y: float, factor: float):
+        """Масштабирует все элементы сети относительно точки (x, y) холста."""
+        canvas = self.canvas
+        canvas.scale("net", x, y, factor, factor)
+        for axis in canvas.find_withtag("axis_v"):
+            x1, y1, x2, y2 = canvas.coords(axis)
+            nx = x + (x1 - x) * factor
+            canvas.coords(axis, nx, y1, nx, y2)
+        for axis in canvas.find_withtag("axis_h"):
+            x1, y1, x2, y2 = canvas.coords(axis)
+            ny = y + (y1 - y) * factor
+            canvas.coords(axis, x1, ny, x2, ny)
+
+    def pan_items(self, dx: float, dy: float):
+        """Сдвигает все элементы сети и оси на (dx, dy) пикселей."""
+        self.canvas.move("net", dx, dy)
+        self.canvas.move("axis_v", dx, 0)
+        self.canvas.move("axis_h", 0, dy)
+
+    # ------------------------------------------------------------------
+    # Окно просмотра
+    def _compute_viewport(self) -> Viewport:
+        m = self.VIEW_MARGIN
+        ax, ay = self.to_logic(-m, -m)
+        bx, by = self.to_logic(self.width + m, self.height + m)
+        return (min(ax, bx), min(ay, by), max(ax, bx), max(ay, by))
+
+    def _pixels_per_unit(self) -> float:
+        x0, y0 = self.to_canvas(0.0, 0.0)
+        x1, y1 = self.to_canvas(1.0, 0.0)
+        return abs(x1 - x0) + abs(y1 - y0)
+
+    def _node_visible(self, node: Node) -> bool:
+        if self.nodes_aggregated:
+            return False
+        x0, y0, x1, y1 = self.viewport
+        return x0 <= node.x <= x1 and y0 <= node.y <= y1
+
+    def _conn_visible(self, conn: Connection) -> bool:
+        if self.edges_aggregated:
+            return False
+        x0, y0, x1, y1 = self.viewport
+        a, b = conn.node1, conn.node2
+        return (min(a.x, b.x) <= x1 and max(a.x, b.x) >= x0
+                and min(a.y, b.y) <= y1 and max(a.y, b.y) >= y0)
+
+    def refresh(self):
+        """
+        Пересчитывает окно просмотра и уровень детализации: удаляет элементы,
+        ушедшие из окна, создаёт появившиеся и сдвигает остальные.
+        Работа пропорциональна числу видимых объектов, а не размеру сети.
+        """
+        self.viewport = self._compute_viewport()
+        nodes = set(islice(self.node_index.query(*self.viewport), self.NODE_MAX_COUNT + 1))
+        self.nodes_aggregated = len(nodes) > self.NODE_MAX_COUNT
+        conns = set(islice(self.conn_index.query(*self.viewport), self.EDGE_MAX_COUNT + 1))
+        self.edges_aggregated = len(conns) > self.EDGE_MAX_COUNT
+
+        heat_nodes = nodes
+        if self.nodes_aggregated:
+            heat_nodes = self.node_index.query(*self.viewport)
+            nodes = set()
+        if self.edges_aggregated:
+            conns = set()
+
+        labels = (not self.nodes_aggregated and len(nodes) <= self.LABEL_MAX_COUNT
+                  and self._pixels_per_unit() >= self.LABEL_MIN_SCALE)
+        if labels != self.labels_visible:
+            self.labels_visible = labels
+            self.canvas.itemconfigure("label", state="normal" if labels else "hidden")
+
+        for conn in [c for c in self.conn_items if c not in conns]:
+            self.canvas.delete(self.conn_items.pop(conn))
+        for node in [n for n in self.node_items if n not in nodes]:
+            self.canvas.delete(*self.node_items.pop(node))
+        for conn in conns:
+            self._show_connection(conn)
+        for node in nodes:
+            self._show_node(node)
+
+        self._draw_heat(heat_nodes if (self.nodes_aggregated or self.edges_aggregated) else ())
+
+    def _draw_heat(self, nodes: Iterable[Node]):
+        """
+        Тепловые плитки: в каждую плитку экрана складывается число концов
+        соединений (и сами узлы), попавших в неё. Это приближает плотность
+        пучков рёбер за O(видимых узлов), не перебирая сами соединения.
+        """
+        canvas = self.canvas
+        if self._heat_items:
+            canvas.delete(*self._heat_items)
+            self._heat_items = []
+        tile = self.HEAT_TILE
+        counts: Dict[Tuple[int, int], int] = {}
+        for node in nodes:
+            cx, cy = self.to_canvas(node.x, node.y)
+            key = (int(cx // tile), int(cy // tile))
+            counts[key] = counts.get(key, 0) + 1 + len(self._incident.get(node, ()))
+        if not counts:
+            return
+        peak = max(counts.values())
+        for (tx, ty), count in counts.items():
+            t = count / peak
+            color = "#%02x%02x%02x" % (255, int(235 - 190 * t), int(200 - 180 * t))
+            rect = canvas.create_rectangle(tx * tile, ty * tile, (tx + 1) * tile, (ty + 1) * tile,
+                                           fill=color, outline="", tags=("heat", "net"))
+            canvas.tag_lower(rect, self._conn_layer)
+            self._heat_items.append(rect)
+
+    def _refresh_heat_if_needed(self):
+        if self.nodes_aggregated or self.edges_aggregated:
+            self._draw_heat(self.node_index.query(*self.viewport))
+
+    # ------------------------------------------------------------------
+    # Элементы Canvas видимых объектов
+    def _show_node(self, node: Node):
+        cx, cy = self.to_canvas(node.x, node.y)
+        r = self.NODE_RADIUS
+        items = self.node_items.get(node)
+        if items is None:
+            oval = self.canvas.create_oval(cx - r, cy - r, cx + r, cy + r, fill="blue", tags=("node", "net"))
+            text = self.canvas.create_text(cx, cy - self.LABEL_OFFSET, text=node.name, fill="black",
+                                           state="normal" if self.labels_visible else "hidden",
+                                           tags=("label", "net"))
+            self.node_items[node] = (oval, text)
+        else:
+            oval, text = items
+            self.canvas.coords(oval, cx - r, cy - r, cx + r, cy + r)
+            self.canvas.coords(text, cx, cy - self.LABEL_OFFSET)
+
+    def _show_connection(self, conn: Connection):
+        x1, y1 = self.to_canvas(conn.node1.x, conn.node1.y)
+        x2, y2 = self.to_canvas(conn.node2.x, conn.node2.y)
+        line = self.conn_items.get(conn)
+        if line is None:
+            line = self.canvas.create_line(x1, y1, x2, y2, fill="black", tags=("conn", "net"))
+            self.canvas.tag_raise(line, self._conn_layer)
+            self.conn_items[conn] = line
+        else:
+            self.canvas.coords(line, x1, y1, x2, y2)
+
+    def _sync_node(self, node: Node):
+        if self._node_visible(node):
+            self._show_node(node)
+        else:
+            items = self.node_items.pop(node, None)
+            if items is not None:
+                self.canvas.delete(*items)
+
+    def _sync_connection(self, conn: Connection):
+        if self._conn_visible(conn):
+            self._show_connection(conn)
+        else:
+            line = self.conn_items.pop(conn, None)
+            if line is not None:
+                self.canvas.delete(line)
+
+    # ------------------------------------------------------------------
+    # Узлы
+    def add_node(self, node: Node):
+        self.node_index.insert(node, node.x, node.y)
+        self._incident.setdefault(node, set())
+        self._sync_node(node)
+        self._refresh_heat_if_needed()
+
+    def update_node(self, node: Node):
+        """Узел переместился или переименован: двигаем его и только инцидентные линии."""
+        if node not in self.node_index:
+            self.add_node(node)
+            return
+        self.node_index.move(node, node.x, node.y)
+        self._sync_node(node)
+        items = self.node_items.get(node)
+        if items is not None:
+            self.canvas.itemconfigure(items[1], text=node.name)
+        for conn in self._incident.get(node, ()):
+            self._index_connection(conn)
+            self._sync_connection(conn)
+        self._refresh_heat_if_needed()
+
+    def node_at(self, x: float, y: float):
+        """Нарисованный узел под точкой холста (x, y) — ближайший в пределах радиуса — или None."""
+        if self.nodes_aggregated:
+            return None
+        lx, ly = self.to_logic(x, y)
+        r = (self.NODE_RADIUS + 2) / max(self._pixels_per_unit(), 1e-12)
+        best, best_d = None, r * r
+        for node in self.node_index.query(lx - r, ly - r, lx + r, ly + r):
+            d = (node.x - lx) ** 2 + (node.y - ly) ** 2
+            if d <= best_d:
+                best, best_d = node, d
+        return best
+
+    def remove_node(self, node: Node):
+        """Удаляет элементы узла и линии всех его соединений."""
+        for conn in list(self._incident.get(node, ())):
+            self._drop_connection(conn)
+        items = self.node_items.pop(node, None)
+        if items is not None:
+            self.canvas.delete(*items)
+        self.node_index.remove(node)
+        self._incident.pop(node, None)
+        self._refresh_heat_if_needed()
+
+    # ------------------------------------------------------------------
+    # Соединения
+    def add_connection(self, conn: Connection):
+        self._link(conn)
+        self._index_connection(conn)
+        self._sync_connection(conn)
+        self._refresh_heat_if_needed()
+
+    def add_connections(self, connections: Iterable[Connection]):
+        """Массовое добавление (например, полносвязный граф): индексируем всё, затем один refresh."""
+        for conn in connections:
+            self._link(conn)
+            self._index_connection(conn)
+        self.refresh()
+
+    def update_connection(self, conn: Connection):
+        """Соединение сменило концы: обновляем индекс инцидентности и координаты линии."""
+        if self._conn_ends.get(conn) != (conn.node1, conn.node2):
+            self._unlink(conn)
+            self._link(conn)
+        self._index_connection(conn)
+        self._sync_connection(conn)
+        self._refresh_heat_if_needed()
+
+    def remove_connection(self, conn: Connection):
+        self._drop_connection(conn)
+        self._refresh_heat_if_needed()
+
+    def _drop_connection(self, conn: Connection):
+        line = self.conn_items.pop(conn, None)
+        if line is not None:
+            self.canvas.delete(line)
+        self.conn_index.remove(conn)
+        self._unlink(conn)
+
+    def _index_connection(self, conn: Connection):
+        a, b = conn.node1, conn.node2
+        self.conn_index.insert(conn, a.x, a.y, b.x, b.y)
+
+    def _link(self, conn: Connection):
+        self._conn_ends[conn] = (conn.node1, conn.node2)
+        self._incident.setdefault(conn.node1, set()).add(conn)
+        self._incident.setdefault(conn.node2, set()).add(conn)
+
+    def _unlink(self, conn: Connection):
+        ends = self._conn_ends.pop(conn, None)
+        if ends is None:
+            return
+        for node in ends:
+            incident = self._incident.get(node)
+            if incident is not None:
+                incident.discard(conn)
+
+    # ------------------------------------------------------------------
+    # Вся сеть
+    def reproject(self):
+        """Масштаб или центр изменились: пересчитываем видимую часть без пересоздания элементов."""
+        self.refresh()
+
+    def reset(self, nodes: List[Node], connections: List[Connection]):
+        """Полная замена сети (например, после загрузки файла)."""
+        self.canvas.delete("node", "label", "conn", "heat")
+        self.node_items.clear()
+        self.conn_items.clear()
+        self._heat_items = []
+        self.node_index = GridIndex(self.node_index.cell_size)
+        self.conn_index = SegmentIndex(self.conn_index.base_size)
+        self._conn_ends.clear()
+        self._incident.clear()
+        for node in nodes:
+            self.node_index.insert(node, node.x, node.y)
+            self._incident.setdefault(node, set())
+        for conn in connections:
+            self._link(conn)
+            self._index_connection(conn)
+        self.refresh()
@@ -0,0 +1,83 @@
+"""
+Индекс каталога оборудования для выбора «самого дешёвого с пропускной
+способностью не меньше нагрузки».
+
+Позиции (роутеры или кабели) сортируются по capacity, и для каждой позиции
+запоминается самая дешёвая среди неё и всех более ёмких (минимум стоимости
+по суффиксу — это и есть фронт Парето «стоимость/ёмкость»). Тогда выбор для
+одной нагрузки — bisect по ёмкостям, для всех узлов сразу — один
+searchsorted NumPy. Индекс строится за O(R log R) и перестраивается, только
+когда каталог меняется.
+"""
+from bisect import bisect_left
+from typing import Callable, Generic, Iterable, List, Optional, Sequence, TypeVar
+
+from models import Router, Cable
+
+try:
+    import numpy as np
+except ImportError:  # NumPy необязателен, без него — bisect для каждой нагрузки
+    np = None
+
+T = TypeVar("T")
+
+
+class CatalogueIndex(Generic[T]):
+    """
+    Индекс позиций каталога по ёмкости. cheapest(load) возвращает ту же
+    позицию, что min(позиций с capacity >= load, key=cost): при равной
+    стоимости — ту, что раньше в исходном списке.
+    """
+    def __init__(self, items: Iterable[T], cost: Callable[[T], float]):
+        self.items: List[T] = list(items)
+        order = sorted(range(len(self.items)), key=lambda i: self.items[i].capacity)
+        self.capacities = [self.items[i].capacity for i in order]
+        # best[p] — самая дешёвая позиция среди order[p:]; в конце — None для нагрузок больше всех ёмкостей
+        self.best: List[Optional[T]] = [None] * (len(order) + 1)
+        best_key = None
+        for p in range(len(order) - 1, -1, -1):
+            i = order[p]
+            key = (cost(self.items[i]), i)
+            if best_key is None or key < best_key:
+                best_key = key
+            self.best[p] = self.items[best_key[1]]
+        self._capacities_array = np.array(self.capacities, dtype=float) if np is not None else None
+
+    @classmethod
+    def of_routers(cls, routers: Iterable[Router]) -> 'CatalogueIndex[Router]':
+        return cls(routers, lambda r: r.cost)
+
+    @classmethod
+    def of_cables(cls, cables: Iterable[Cable]) -> 'CatalogueIndex[Cable]':
+        return cls(cables, lambda c: c.cost_per_unit)
+
+    def __len__(self):
+        return len(self.items)
+
+    def cheapest(self, load: float) -> Optional[T]:
+        """Самая дешёвая позиция с capacity >= load или None."""
+        return self.best[bisect_left(self.capacities, load)]
+
+    def cheapest_many(self, loads: Sequence[float]) -> List[Optional[T]]:
+        """cheapest для каждой нагрузки; с NumPy — одним searchsorted."""
+        best = self.best
+        if self._capacities_array is not None:
+            positions = np.searchsorted(self._capacities_array, np.asarray(loads, dtype=float), side="left")
+            return [best[p] for p in positions.tolist()]
+        capacities = self.capacities
+        return [best[bisect_left(capacities, load)] for load in loads]
+
+    def frontier(self) -> List[T]:
+        """Фронт Парето: позиции, которые бывают ответом, по возрастанию ёмкости."""
+        result = []
+        capacities = self.capacities
+        for p, item in enumerate(self.best[:-1]):
+            # bisect попадает только в первую из позиций с равной ёмкостью
+            if p and capacities[p - 1] == capacities[p]:
+                continue
+            if not result or result[-1] is not item:
+                result.append(item)
+        return result
+
+    def __repr__(self):
+        return f"CatalogueIndex({len(self.items)} items, frontier {len(self.frontier())})"
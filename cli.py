@@ -0,0 +1,273 @@
+"""
+Анализ сети без графического интерфейса (cron, CI, пакетная обработка).
+
+Для каждого сценария (JSON из save_data_to_file или снимок .gvms) считаются
+потоки и задержки по соединениям, минимальные роутеры по узлам и минимальный
+кабель, а с --paths — кратчайшие пути между всеми парами узлов.
+
+Результаты пишутся в каталог --output:
+  json: <имя>.report.json — всё, кроме путей;
+  csv:  <имя>.flows.csv и <имя>.routers.csv;
+  --paths: <имя>.paths.csv (пишется построчно, в памяти не собирается).
+С --profile в отчёт добавляется раздел "profile" — время, число вызовов и
+счётчики по фазам расчёта (см. profiling.py); сводка печатается в stderr.
+«-o -» печатает JSON-отчёт одного сценария в stdout.
+
+Примеры:
+    python cli.py firstSave.json -o -
+    python cli.py big.gvms --engine csr --workers 8 --paths -o reports
+    python cli.py scenarios/ --format csv --jobs 4 -o reports
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from graph import CompactGraph
+from dense import DenseGraph
+from logic import (
+    ENGINES,
+    load_data_from_file,
+    build_routing_graph,
+    calculate_all_shortest_paths,
+    compute_flows_by_demand,
+    connection_delay,
+    export_shortest_paths_csv,
+    find_min_router_per_node,
+    find_min_cable,
+    sum_cable_costs,
+)
+from snapshot import load_snapshot, SNAPSHOT_EXTENSION
+import profiling
+
+# Размер пакета по умолчанию — как в gui.Application
+DEFAULT_PACKET_SIZE = 128.0
+SCENARIO_EXTENSIONS = (".json", SNAPSHOT_EXTENSION)
+
+
+def load_scenario(filename, compact: bool = False) -> Dict[str, Any]:
+    """
+    Загружает сценарий из JSON или бинарного снимка (по расширению).
+    compact=True — узлы и соединения в столбцовых NodeTable/ConnectionTable.
+    """
+    if filename.endswith(SNAPSHOT_EXTENSION):
+        return load_snapshot(filename, compact)
+    return load_data_from_file(filename, compact)
+
+
+def _engine_name(graph) -> str:
+    if isinstance(graph, DenseGraph):
+        return "dense"
+    if isinstance(graph, CompactGraph):
+        return "csr"
+    return "dict"
+
+
+def analyze(data: Dict[str, Any], engine: str = "auto", workers: int = 1,
+            packet_size: float = DEFAULT_PACKET_SIZE, paths_file: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Полный расчёт по загруженному сценарию. Возвращает отчёт из простых типов
+    (готов для json.dump). Бесконечная задержка записывается как null.
+    Если задан paths_file, кратчайшие пути пишутся туда в CSV.
+    """
+    nodes = data["nodes"]
+    connections = data["connections"]
+    traffic_matrix = data["traffic_matrix"]
+    routers = data["routers"]
+    cables = data.get("cables", [])
+
+    graph = build_routing_graph(nodes, connections, engine)
+    flows = compute_flows_by_demand(nodes, connections, traffic_matrix, packet_size, graph)
+
+    flow_rows = []
+    finite_delays = []
+    for conn in connections:
+        info = flows[conn]
+        delay = connection_delay(info["flow"], info["packet"], conn.cable.capacity)
+        if delay != float('inf'):
+            finite_delays.append(delay)
+        flow_rows.append({
+            "connection": conn.name,
+            "node1": conn.node1.name,
+            "node2": conn.node2.name,
+            "cable": conn.cable.cable_name,
+            "flow": info["flow"],
+            "packet": info["packet"],
+            "capacity": conn.cable.capacity,
+            "delay": None if delay == float('inf') else delay,
+        })
+
+    min_routers = find_min_router_per_node(nodes, routers, traffic_matrix)
+    min_cable = find_min_cable(cables, traffic_matrix)
+
+    report = {
+        "nodes": len(nodes),
+        "connections": len(connections),
+        "engine": _engine_name(graph),
+        "packet_size": packet_size,
+        "flows": flow_rows,
+        "average_delay": sum(finite_delays) / len(finite_delays) if finite_delays else None,
+        "min_routers": {name: (r.model_name if r else None) for name, r in min_routers.items()},
+        "min_cable": min_cable.cable_name if min_cable else None,
+        "router_cost_total": sum(r.cost for r in min_routers.values() if r is not None),
+        "cable_cost_total": sum_cable_costs(connections),
+    }
+
+    if paths_file is not None:
+        # Параллельный расчёт идёт по CompactGraph; другие движки он строит сам
+        paths_graph = graph if workers == 1 or isinstance(graph, CompactGraph) else None
+        paths = calculate_all_shortest_paths(nodes, connections, paths_graph, workers)
+        report["paths_file"] = os.path.basename(paths_file)
+        report["paths_written"] = export_shortest_paths_csv(paths_file, paths)
+    return report
+
+
+def _write_flows_csv(filename, report: Dict[str, Any]):
+    with open(filename, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(("connection", "node1", "node2", "cable", "flow", "packet", "capacity", "delay"))
+        for row in report["flows"]:
+            delay = "inf" if row["delay"] is None else row["delay"]
+            writer.writerow((row["connection"], row["node1"], row["node2"], row["cable"],
+                             row["flow"], row["packet"], row["capacity"], delay))
+
+
+def _write_routers_csv(filename, report: Dict[str, Any]):
+    with open(filename, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(("node", "router"))
+        for name, model in report["min_routers"].items():
+            writer.writerow((name, "" if model is None else model))
+
+
+def run_scenario(source: str, output: str, fmt: str = "json", engine: str = "auto", workers: int = 1,
+                 packet_size: float = DEFAULT_PACKET_SIZE, with_paths: bool = False,
+                 profile: bool = False, profile_memory: bool = False, compact: bool = False) -> Dict[str, Any]:
+    """
+    Загружает сценарий, считает его и пишет результаты в каталог output
+    (или JSON в stdout при output == "-"). Возвращает краткую сводку.
+    profile=True — профилировать загрузку и расчёт (profile_memory — ещё и память).
+    """
+    started = time.perf_counter()
+    stem = os.path.splitext(os.path.basename(source))[0]
+    to_stdout = output == "-"
+    if not to_stdout:
+        os.makedirs(output, exist_ok=True)
+    paths_file = None
+    if with_paths:
+        paths_file = os.path.join("." if to_stdout else output, f"{stem}.paths.csv")
+
+    if profile:
+        profiling.reset()
+        profiling.enable(profile_memory)
+    try:
+        report = analyze(load_scenario(source, compact), engine, workers, packet_size, paths_file)
+    finally:
+        if profile:
+            profiling.disable()
+    report["scenario"] = os.path.basename(source)
+    stats = profiling.stats() if profile else None
+    if stats is not None:
+        report["profile"] = stats.to_dict()
+
+    if to_stdout:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    elif fmt == "json":
+        with open(os.path.join(output, f"{stem}.report.json"), "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    else:
+        _write_flows_csv(os.path.join(output, f"{stem}.flows.csv"), report)
+        _write_routers_csv(os.path.join(output, f"{stem}.routers.csv"), report)
+
+    summary = {
+        "scenario": report["scenario"],
+        "nodes": report["nodes"],
+        "connections": report["connections"],
+        "engine": report["engine"],
+        "average_delay": report["average_delay"],
+        "seconds": time.perf_counter() - started,
+    }
+    if stats is not None:
+        summary["profile"] = stats.format_table()
+    return summary
+
+
+def _run_safe(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Обёртка для пула процессов: ошибка одного сценария не останавливает пакет."""
+    try:
+        return run_scenario(**kwargs)
+    except Exception as e:
+        return {"scenario": os.path.basename(kwargs["source"]), "error": f"{type(e).__name__}: {e}"}
+
+
+def find_scenarios(directory: str) -> List[str]:
+    """Файлы сценариев каталога (JSON и снимки), по имени."""
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.endswith(SCENARIO_EXTENSIONS) and os.path.isfile(os.path.join(directory, name))
+    )
+
+
+def _print_summary(summary: Dict[str, Any]):
+    if "error" in summary:
+        print(f"{summary['scenario']}: ОШИБКА {summary['error']}", file=sys.stderr)
+        return
+    delay = summary["average_delay"]
+    delay_str = "нет" if delay is None else f"{delay:.4f}"
+    print(f"{summary['scenario']}: узлов {summary['nodes']}, соединений {summary['connections']}, "
+          f"движок {summary['engine']}, средняя задержка {delay_str}, {summary['seconds']:.2f} с",
+          file=sys.stderr)
+    if "profile" in summary:
+        print(summary["profile"], file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="файл сценария (.json или .gvms) или каталог со сценариями")
+    parser.add_argument("-o", "--output", default=".", help="каталог результатов; '-' — JSON в stdout")
+    parser.add_argument("--format", choices=("json", "csv"), default="json")
+    parser.add_argument("--engine", choices=ENGINES, default="auto", help="движок маршрутизации")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="процессов для кратчайших путей внутри сценария (0 — по числу ядер)")
+    parser.add_argument("--jobs", type=int, default=1, help="сценариев, считаемых параллельно")
+    parser.add_argument("--packet-size", type=float, default=DEFAULT_PACKET_SIZE)
+    parser.add_argument("--paths", action="store_true", help="записать кратчайшие пути в <имя>.paths.csv")
+    parser.add_argument("--compact", action="store_true",
+                        help="хранить узлы и соединения по столбцам (меньше памяти на больших сетях)")
+    parser.add_argument("--profile", action="store_true", help="профилировать фазы расчёта (раздел profile в отчёте)")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="вместе с --profile замерять память по фазам (tracemalloc, медленнее)")
+    args = parser.parse_args(argv)
+
+    if os.path.isdir(args.source):
+        sources = find_scenarios(args.source)
+        if not sources:
+            parser.error(f"в каталоге {args.source} нет сценариев ({', '.join(SCENARIO_EXTENSIONS)})")
+    else:
+        sources = [args.source]
+    if args.output == "-" and (len(sources) > 1 or args.format != "json"):
+        parser.error("вывод в stdout возможен только для одного сценария в формате json")
+
+    tasks = [dict(source=source, output=args.output, fmt=args.format, engine=args.engine,
+                  workers=args.workers or None, packet_size=args.packet_size, with_paths=args.paths,
+                  profile=args.profile or args.profile_memory, profile_memory=args.profile_memory,
+                  compact=args.compact)
+             for source in sources]
+    if args.jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            summaries = list(pool.map(_run_safe, tasks))
+    else:
+        summaries = [_run_safe(task) for task in tasks]
+
+    for summary in summaries:
+        _print_summary(summary)
+    return 1 if any("error" in s for s in summaries) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+from typing import List, Optional
+
+from models import Node, Connection
+from paths import ShortestPathsView
+from json_stream import ProgressCallback
+from profiling import PROFILER, profiled
+
+try:
+    import numpy as np
+except ImportError:  # без NumPy плотный движок недоступен
+    np = None
+
+# Плотный движок выбирается, если доля существующих рёбер не меньше этой величины
+DENSE_MIN_DENSITY = 0.3
+# ... и узлов не больше этого числа (матрицы N×N: расстояния, предки, номер канала)
+DENSE_MAX_NODES = 3000
+
+
+def graph_density(n_nodes: int, n_edges: int) -> float:
+    """Доля рёбер от числа пар узлов: 1.0 для полносвязного графа."""
+    if n_nodes < 2:
+        return 0.0
+    return 2.0 * n_edges / (n_nodes * (n_nodes - 1))
+
+
+def dense_engine_suits(nodes: List[Node], connections: List[Connection]) -> bool:
+    """Стоит ли считать маршруты на матрицах (DenseGraph), а не Дейкстрой от каждого узла по очереди."""
+    return (np is not None
+            and 2 <= len(nodes) <= DENSE_MAX_NODES
+            and graph_density(len(nodes), len(connections)) >= DENSE_MIN_DENSITY)
+
+
+class DenseGraph:
+    """
+    Граф в виде плотных матриц NumPy для небольших плотных сетей
+    (например, после make_complete_graph).
+
+    cost[i, j]      — стоимость канала (inf, если канала нет, 0 на диагонали);
+    edge_conn[i, j] — номер соединения в списке connections (-1, если нет).
+    После solve():
+    dist[i, j]      — длина кратчайшего пути;
+    pred[i, j]      — предок j в дереве путей из i (-1 для i и недостижимых).
+
+    Из путей равной стоимости выбирается тот же, что у dijkstra_with_paths
+    и CompactGraph (см. solve), так что движок можно менять без изменения
+    результатов.
+    """
+    def __init__(self, names: List[str], cost, edge_conn):
+        self.names = names
+        self.index = {name: i for i, name in enumerate(names)}
+        self.cost = cost
+        self.edge_conn = edge_conn
+        self.dist = None
+        self.pred = None
+
+    @classmethod
+    def from_network(cls, nodes: List[Node], connections: List[Connection]) -> 'DenseGraph':
+        """Матрица стоимостей из Connection.connection_cost; из дублей пары берётся последнее соединение."""
+        if np is None:
+            raise RuntimeError("Для плотного движка маршрутизации нужен NumPy.")
+        names = [node.name for node in nodes]
+        index = {name: i for i, name in enumerate(names)}
+        n = len(names)
+
+        pair_conn = {}
+        for k, conn in enumerate(connections):
+            a = index[conn.node1.name]
+            b = index[conn.node2.name]
+            if a != b:
+                pair_conn[(a, b) if a < b else (b, a)] = k
+
+        m = len(pair_conn)
+        ends = np.fromiter((x for pair in pair_conn for x in pair), dtype=np.intp, count=2 * m).reshape(m, 2)
+        conn_ids = np.fromiter(pair_conn.values(), dtype=np.int32, count=m)
+        costs = np.fromiter((connections[k].connection_cost for k in pair_conn.values()),
+                            dtype=np.float64, count=m)
+
+        cost = np.full((n, n), np.inf)
+        np.fill_diagonal(cost, 0.0)
+        edge_conn = np.full((n, n), -1, dtype=np.int32)
+        a, b = ends[:, 0], ends[:, 1]
+        cost[a, b] = costs
+        cost[b, a] = costs
+        edge_conn[a, b] = conn_ids
+        edge_conn[b, a] = conn_ids
+        return cls(names, cost, edge_conn)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    @profiled("DenseGraph.solve")
+    def solve(self, progress: Optional[ProgressCallback] = None):
+        """
+        Дейкстра сразу от всех источников: N шагов, на каждом каждый источник
+        извлекает ближайший ещё не извлечённый узел и ослабляет через него
+        свою строку расстояний — операции над матрицей N×N.
+
+        Узлы переставлены по именам, поэтому из узлов на равном расстоянии
+        первым извлекается узел с меньшим именем, как из кучи (расстояние, имя)
+        в dijkstra_with_paths, а предок меняется только при строгом улучшении.
+        Пути и их стоимости (суммы вдоль пути в том же порядке) поэтому те же,
+        что у движков "dict" и "csr".
+        progress(шаг, N), если задан, вызывается после каждого шага.
+        """
+        n = len(self.names)
+        order = np.array(sorted(range(n), key=self.names.__getitem__), dtype=np.intp)  # место по имени -> номер
+        cost = self.cost[np.ix_(order, order)]
+        rows = np.arange(n)
+
+        dist = np.full((n, n), np.inf)
+        dist[rows, rows] = 0.0
+        pred = np.full((n, n), -1, dtype=np.int32)
+        frontier = dist.copy()  # расстояния ещё не извлечённых узлов, inf — извлечён
+        better = np.empty((n, n), dtype=bool)
+
+        counting = PROFILER.enabled
+        improved = steps = 0
+        for step in range(n):
+            node = frontier.argmin(axis=1)
+            cur = frontier[rows, node]
+            if not np.isfinite(cur).any():
+                break
+            steps += 1
+            frontier[rows, node] = np.inf
+            via = cost.take(node, axis=0)
+            np.add(via, cur[:, None], out=via)
+            np.less(via, dist, out=better)
+            if counting:
+                improved += int(np.count_nonzero(better))
+            np.copyto(dist, via, where=better)
+            np.copyto(frontier, via, where=better)
+            np.copyto(pred, np.broadcast_to(node[:, None].astype(np.int32), pred.shape), where=better)
+            if progress is not None:
+                progress(step + 1, n)
+        if progress is not None and steps < n:
+            progress(n, n)  # остальные узлы ни из одного источника недостижимы
+
+        if counting:
+            PROFILER.add_counts("DenseGraph.solve", steps=steps, relaxations=steps * n * n, improvements=improved)
+        # Обратно к номерам узлов
+        self.dist = np.empty((n, n))
+        self.dist[np.ix_(order, order)] = dist
+        self.pred = np.empty((n, n), dtype=np.int32)
+        self.pred[np.ix_(order, order)] = np.where(pred >= 0, order[pred], -1)
+        return self
+
+    def _ensure_solved(self):
+        if self.pred is None:
+            self.solve()
+
+    @profiled("reconstruct_path")
+    def path_ids(self, start: int, end: int) -> List[int]:
+        """Путь (список номеров) из start в end по строке start матрицы предков."""
+        self._ensure_solved()
+        pred = self.pred[start]
+        if start != end and pred[end] == -1:
+            return []
+        path = [end]
+        current = end
+        while current != start:
+            current = int(pred[current])
+            path.append(current)
+        path.reverse()
+        return path
+
+    def all_paths(self, cache_size: int = 0) -> ShortestPathsView:
+        """Результат в формате calculate_all_shortest_paths (пути строятся при обращении)."""
+        self._ensure_solved()
+        names = self.names
+        index = self.index
+
+        def path_fn(src: str, dst: str) -> List[str]:
+            return [names[i] for i in self.path_ids(index[src], index[dst])]
+
+        def cost_fn(src: str, dst: str) -> float:
+            return float(self.dist[index[src], index[dst]])
+
+        return ShortestPathsView(names, path_fn, cache_size, cost_fn)
+
+    @profiled("DenseGraph.accumulate_flows")
+    def accumulate_flows(self, src_ids, dst_ids, traffic, n_connections: int):
+        """
+        Раскладывает нагрузки (src_ids[i] -> dst_ids[i], traffic[i]) по каналам,
+        поднимаясь по матрице предков от приёмников всеми парами одновременно.
+        Возвращает (flow, used): суммарный трафик и признак «канал лежит на
+        каком-либо пути» для каждого номера соединения.
+
+        Нагрузки прибавляются к каждому каналу в порядке записей, как при
+        обходе путей в compute_flows_on_connections, — суммы совпадают бит в бит.
+        """
+        self._ensure_solved()
+        pred = self.pred
+        src = np.asarray(src_ids, dtype=np.intp)
+        cur = np.asarray(dst_ids, dtype=np.intp)
+        load = np.asarray(traffic, dtype=np.float64)
+
+        demand = np.flatnonzero((src != cur) & (pred[src, cur] != -1))
+        src, cur = src[demand], cur[demand]
+
+        flow = np.zeros(n_connections)
+        used = np.zeros(n_connections, dtype=bool)
+        hop_conns, hop_demands = [], []
+        demands = int(demand.size)
+        steps = 0
+        while cur.size:
+            steps += 1
+            prev = pred[src, cur]
+            hop_conns.append(self.edge_conn[prev, cur])
+            hop_demands.append(demand)
+            active = prev != src
+            src, cur, demand = src[active], prev[active], demand[active]
+        hops = 0
+        if hop_conns:
+            conn_ids = np.concatenate(hop_conns)
+            demand_ids = np.concatenate(hop_demands)
+            # Канал встречается в пути не больше раза: упорядочив по записям,
+            # получаем для каждого канала тот же порядок сложения
+            by_demand = np.argsort(demand_ids, kind="stable")
+            np.add.at(flow, conn_ids[by_demand], load[demand_ids[by_demand]])
+            used[conn_ids] = True
+            hops = int(conn_ids.size)
+        if PROFILER.enabled:
+            PROFILER.add_counts("DenseGraph.accumulate_flows", demands=demands, steps=steps, hops=hops)
+        return flow, used
@@ -0,0 +1,208 @@
+import heapq
+from array import array
+from typing import List, Dict, Tuple, Optional
+
+from models import Node, Connection, NodeTable, ConnectionTable
+from profiling import PROFILER, profiled
+
+try:
+    import numpy as np
+except ImportError:  # NumPy необязателен, без него работаем на array
+    np = None
+
+
+class CompactGraph:
+    """
+    Неориентированный граф в формате CSR (compressed sparse row).
+
+    Имена узлов один раз переводятся в плотные номера 0..N-1, соседи узла i
+    лежат в targets[offsets[i]:offsets[i + 1]], веса рёбер — в weights,
+    а edge_conn хранит номер соединения (индекс в списке connections)
+    для каждой позиции, чтобы по дереву путей можно было найти канал.
+
+    Массивы — array('i')/array('d'), либо массивы NumPy, если он установлен.
+
+    Равные по стоимости пути выбираются так же, как в dijkstra_with_paths
+    по словарю из build_graph: соседи узла лежат в порядке первого появления
+    пары в connections, а из узлов на одном расстоянии из кучи первым
+    извлекается узел с меньшим именем (rank — место имени в сортировке).
+    """
+    def __init__(self, names: List[str], offsets, targets, weights, edge_conn):
+        self.names = names
+        self.index = {name: i for i, name in enumerate(names)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.edge_conn = edge_conn
+        by_rank = sorted(range(len(names)), key=names.__getitem__)
+        self.by_rank = array('i', by_rank)
+        self.rank = array('i', bytes(4 * len(names)))
+        for r, i in enumerate(by_rank):
+            self.rank[i] = r
+
+    @classmethod
+    def from_network(cls, nodes: List[Node], connections: List[Connection]) -> 'CompactGraph':
+        """
+        Строит граф по спискам узлов и соединений.
+        Как и в build_graph, из нескольких соединений между одной парой узлов
+        учитывается последнее.
+        """
+        if isinstance(nodes, NodeTable):
+            names = list(nodes.names)
+        else:
+            names = [node.name for node in nodes]
+
+        if isinstance(connections, ConnectionTable) and connections.nodes is nodes:
+            # Концы уже хранятся номерами строк таблицы узлов
+            ends = zip(connections.node1, connections.node2)
+            cost_of = connections.cost.__getitem__
+        else:
+            index = {name: i for i, name in enumerate(names)}
+            ends = ((index[conn.node1.name], index[conn.node2.name]) for conn in connections)
+            cost_of = lambda k: connections[k].connection_cost
+
+        pair_conn = {}
+        for k, (a, b) in enumerate(ends):
+            if a == b:
+                continue
+            pair_conn[(a, b) if a < b else (b, a)] = k
+
+        n = len(names)
+        if np is not None:
+            return cls._from_pairs_numpy(names, n, pair_conn, cost_of)
+        return cls._from_pairs_array(names, n, pair_conn, cost_of)
+
+    @classmethod
+    def _from_pairs_array(cls, names, n, pair_conn, cost_of):
+        degree = [0] * (n + 1)
+        for a, b in pair_conn:
+            degree[a + 1] += 1
+            degree[b + 1] += 1
+        for i in range(n):
+            degree[i + 1] += degree[i]
+        offsets = array('i', degree)
+
+        m = offsets[n]
+        targets = array('i', bytes(4 * m))
+        weights = array('d', bytes(8 * m))
+        edge_conn = array('i', bytes(4 * m))
+        fill = list(degree[:n])
+        for (a, b), k in pair_conn.items():
+            cost = cost_of(k)
+            for u, v in ((a, b), (b, a)):
+                pos = fill[u]
+                targets[pos] = v
+                weights[pos] = cost
+                edge_conn[pos] = k
+                fill[u] = pos + 1
+        return cls(names, offsets, targets, weights, edge_conn)
+
+    @classmethod
+    def _from_pairs_numpy(cls, names, n, pair_conn, cost_of):
+        m = len(pair_conn)
+        ends = np.fromiter((x for pair in pair_conn for x in pair), dtype=np.int32, count=2 * m).reshape(m, 2)
+        conn_ids = np.fromiter(pair_conn.values(), dtype=np.int32, count=m)
+        costs = np.fromiter(map(cost_of, pair_conn.values()), dtype=np.float64, count=m)
+
+        # Оба направления пары подряд: устойчивая сортировка сохраняет у каждого
+        # узла порядок пар, как у _from_pairs_array и build_graph
+        src = ends.ravel()
+        dst = ends[:, ::-1].ravel()
+        order = np.argsort(src, kind="stable")
+
+        offsets = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(np.bincount(src, minlength=n), out=offsets[1:])
+        targets = np.ascontiguousarray(dst[order], dtype=np.int32)
+        weights = np.ascontiguousarray(np.repeat(costs, 2)[order])
+        edge_conn = np.ascontiguousarray(np.repeat(conn_ids, 2)[order], dtype=np.int32)
+        return cls(names, offsets, targets, weights, edge_conn)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def edge_count(self) -> int:
+        """Число неориентированных рёбер."""
+        return len(self.targets) // 2
+
+    def neighbors(self, node_id: int) -> List[Tuple[int, float]]:
+        """Список (сосед, вес) для узла node_id."""
+        lo, hi = self.offsets[node_id], self.offsets[node_id + 1]
+        return [(int(self.targets[p]), float(self.weights[p])) for p in range(lo, hi)]
+
+    @profiled("CompactGraph.shortest_path_tree")
+    def shortest_path_tree(self, start: int):
+        """
+        Дейкстра по номерам узлов.
+        Возвращает (dist, pred, pred_conn):
+          dist[i]      — длина кратчайшего пути (inf, если узел недостижим);
+          pred[i]      — номер предка в дереве путей (-1 для корня и недостижимых);
+          pred_conn[i] — номер соединения между pred[i] и i (-1, если предка нет).
+        """
+        n = len(self.names)
+        # memoryview одинаково быстро индексируется и для array, и для NumPy
+        offsets = memoryview(self.offsets)
+        targets = memoryview(self.targets)
+        weights = memoryview(self.weights)
+        edge_conn = memoryview(self.edge_conn)
+        rank, by_rank = self.rank, self.by_rank
+
+        dist = array('d', [float('inf')]) * n
+        pred = array('i', [-1]) * n
+        pred_conn = array('i', [-1]) * n
+        visited = bytearray(n)
+
+        dist[start] = 0.0
+        # В куче — (расстояние, rank узла): при равенстве расстояний порядок как по именам
+        queue = [(0.0, rank[start])]
+        pop, push = heapq.heappop, heapq.heappush
+        improved = 0
+        while queue:
+            cur_dist, node = pop(queue)
+            node = by_rank[node]
+            if visited[node]:
+                continue
+            visited[node] = 1
+            lo, hi = offsets[node], offsets[node + 1]
+            for neighbor, weight, conn_id in zip(targets[lo:hi], weights[lo:hi], edge_conn[lo:hi]):
+                d = cur_dist + weight
+                if d < dist[neighbor]:
+                    dist[neighbor] = d
+                    pred[neighbor] = node
+                    pred_conn[neighbor] = conn_id
+                    push(queue, (d, rank[neighbor]))
+                    improved += 1
+        if PROFILER.enabled:
+            # Счётчики те же, что у dijkstra_with_paths для словаря смежности
+            settled = [i for i in range(n) if visited[i]]
+            PROFILER.add_counts("CompactGraph.shortest_path_tree", heap_pushes=improved + 1,
+                                heap_pops=improved + 1,
+                                relaxations=sum(offsets[i + 1] - offsets[i] for i in settled),
+                                improvements=improved, settled=len(settled))
+        return dist, pred, pred_conn
+
+    @profiled("reconstruct_path")
+    def path_ids(self, pred, start: int, end: int) -> List[int]:
+        """Восстанавливает путь (список номеров) из start в end по массиву pred."""
+        path = []
+        current = end
+        while current != -1:
+            path.append(current)
+            if current == start:
+                break
+            current = pred[current]
+        path.reverse()
+        if path and path[0] == start:
+            return path
+        return []
+
+    def distances_by_name(self, dist) -> Dict[str, float]:
+        """Переводит массив расстояний в словарь {имя: расстояние}."""
+        return {name: dist[i] for i, name in enumerate(self.names)}
+
+    def predecessors_by_name(self, pred) -> Dict[str, Optional[str]]:
+        """Переводит массив предков в словарь {имя: имя предка или None}."""
+        names = self.names
+        return {name: (names[pred[i]] if pred[i] != -1 else None) for i, name in enumerate(names)}
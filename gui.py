@@ -3,20 +3,49 @@ from tkinter import ttk, messagebox, filedialog
 
 # Импорт моделей (узел, роутер, кабель, соединение, матрица трафика)
 from models import Node, Router, Cable, Connection, TrafficMatrix
+# Сеть с индексами по имени узла, паре узлов и инцидентным соединениям
+from network import Network
 # Импорт логических функций для вычислений, сохранения и загрузки данных
 from logic import (
-    calculate_all_shortest_paths,
-    compute_flows_on_connections,
     save_data_to_file,
-    load_data_from_file,
+    load_data_from_file_streaming,
     find_min_router_per_node,
     find_min_cable,
     sum_router_costs,
-    sum_cable_costs
+    sum_cable_costs,
+    export_shortest_paths_csv,
+    connection_delay
 )
+# Индекс каталога по ёмкости: самый дешёвый роутер/кабель для нагрузки за O(log R)
+from catalogue import CatalogueIndex
+# Кэш кратчайших путей и потоков, сбрасываемый при изменении топологии
+from routing import RoutingCache
+# Бинарные снимки сети (альтернатива JSON для больших сетей)
+from snapshot import save_snapshot, load_snapshot, SNAPSHOT_EXTENSION
+# Отрисовка сети на Canvas с обновлением элементов на месте
+from canvas_renderer import NetworkRenderer
+# Таблица, которая держит в Treeview только видимые строки
+from virtual_table import TableModel, VirtualTreeview
+# Постраничное представление кратчайших путей
+from paths import PathsTable
+# Фоновые задачи: расчёт в рабочем потоке, результат — в поток Tk через очередь
+from tasks import BackgroundTask
+# Пакетное построение соединений по координатам узлов
+from topology import DEFAULT_K, topology_edges, existing_pairs, make_connections
+# Проектирование магистрали: минимальное остовное дерево по кандидатам Делоне/k ближайших
+from backbone import design_backbone
+# Необязательное профилирование фаз расчёта (окно «Профиль»)
+import profiling
 
 # Основной класс приложения, наследуемый от tk.Tk
 class Application(tk.Tk):
+    # Множитель масштаба за один щелчок колеса мыши и допустимые пределы масштаба
+    ZOOM_STEP = 1.2
+    MIN_SCALE = 0.01
+    MAX_SCALE = 1000.0
+    # Через сколько мс после последнего движения пересчитывать видимую часть сети
+    SETTLE_DELAY_MS = 150
+
     def __init__(self):
         # Инициализация родительского класса Tk
         super().__init__()
@@ -28,13 +57,18 @@ class Application(tk.Tk):
         self.center_x = self.canvas_width // 2  # Вычисление центра по оси X
         self.center_y = self.canvas_height // 2 # Вычисление центра по оси Y
         self.SCALE = 4.0  # Начальный масштаб для отображения координат
+        self._settle_job = None  # Отложенная перепроекция после зума/панорамирования
+        self._pan_last = None    # Последняя точка курсора при перетаскивании холста
+        self._drag_node = None   # Узел, который перетаскивают мышью
+        self._drag_offset = (0.0, 0.0)  # Смещение курсора от центра узла (логические единицы)
+        self._drag_moved = False
 
         # Основные данные приложения
         self.routers = []         # Список роутеров
-        self.nodes = []           # Список узлов сети
-        self.connections = []     # Список соединений между узлами
+        self.network = Network()  # Узлы и соединения сети (см. свойства nodes и connections)
         self.traffic_matrix = TrafficMatrix()  # Матрица трафика между узлами
         self.cables = []          # Список кабелей для соединений
+        self.routing_cache = RoutingCache()  # Кэш маршрутов (сбрасывается при правке топологии)
 
         # Глобальный размер пакета для расчётов задержки
         self.global_packet_size = 128.0
@@ -46,6 +80,7 @@ class Application(tk.Tk):
         # Добавляем несколько типов кабелей
         self.cables.append(Cable("DefaultCable", 1.0, 1000))
         self.cables.append(Cable("HighSpeedCable", 2.0, 10000))
+        self.rebuild_catalogue()
 
         # ----------------- Создание интерфейса -----------------
         # Создаем основной фрейм, в который будут помещаться все элементы
@@ -75,10 +110,17 @@ class Application(tk.Tk):
 
         # Кнопка для создания полносвязного графа
         ttk.Button(btn_frame, text="Полносвязный граф", command=self.make_complete_graph).pack(side=tk.LEFT, padx=5)
+        # Кнопка для разреженных топологий по координатам (k ближайших, радиус, Делоне, Габриэль)
+        ttk.Button(btn_frame, text="Топология", command=self.show_topology_dialog).pack(side=tk.LEFT, padx=5)
+        # Кнопка для дешёвой связной магистрали (остовное дерево с резервированием)
+        ttk.Button(btn_frame, text="Магистраль", command=self.show_backbone_dialog).pack(side=tk.LEFT, padx=5)
 
         # Кнопка для изменения глобального размера пакета
         ttk.Button(btn_frame, text="Packet Size", command=self.show_packet_size_dialog).pack(side=tk.LEFT, padx=5)
 
+        # Кнопка для окна профилирования расчётов
+        ttk.Button(btn_frame, text="Профиль", command=self.show_profile_dialog).pack(side=tk.LEFT, padx=5)
+
         # Кнопки сохранения и загрузки данных
         ttk.Button(btn_frame, text="Сохранить", command=self.save_data).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="Загрузить", command=self.load_data).pack(side=tk.LEFT, padx=5)
@@ -86,6 +128,18 @@ class Application(tk.Tk):
         # Создание Canvas для визуального отображения сети
         self.canvas = tk.Canvas(main_frame, bg="white", width=self.canvas_width, height=self.canvas_height)
         self.canvas.pack(fill=tk.BOTH, expand=True)
+        # Отрисовщик хранит id элементов Canvas для каждого узла и соединения
+        self.renderer = NetworkRenderer(self.canvas, self.logic_to_canvas_coords, self.canvas_to_logic_coords)
+        # При изменении размеров окна перерисовывается только сетка
+        self.canvas.bind("<Configure>", self.on_canvas_resize)
+        # Зум колесом мыши (Windows/macOS — <MouseWheel>, X11 — кнопки 4 и 5)
+        self.canvas.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.canvas.bind("<Button-4>", self.on_mouse_wheel)
+        self.canvas.bind("<Button-5>", self.on_mouse_wheel)
+        # Левая кнопка: перетаскивание узла, если нажали на узел, иначе — панорамирование
+        self.canvas.bind("<ButtonPress-1>", self.on_button_press)
+        self.canvas.bind("<B1-Motion>", self.on_button_motion)
+        self.canvas.bind("<ButtonRelease-1>", self.on_button_release)
 
         # Нижняя панель для настройки масштаба отображения
         bottom_frame = ttk.Frame(self)
@@ -102,48 +156,185 @@ class Application(tk.Tk):
         # Первоначальное рисование координатной сетки и элементов сети
         self.draw_centered_grid()
 
+    # --------------------------------------------------------------------------
+    # Списки узлов и соединений для расчётов и таблиц (изменяются через self.network)
+    @property
+    def nodes(self):
+        return self.network.nodes
+
+    @property
+    def connections(self):
+        return self.network.connections
+
+    # --------------------------------------------------------------------------
+    # Индексы каталога роутеров и кабелей для поиска самого дешёвого подходящего
+    def rebuild_catalogue(self):
+        """Перестраивает индексы каталога (вызывать при изменении self.routers или self.cables)."""
+        self.router_index = CatalogueIndex.of_routers(self.routers)
+        self.cable_index = CatalogueIndex.of_cables(self.cables)
+
     # --------------------------------------------------------------------------
     # Метод для создания полносвязного графа
     def make_complete_graph(self):
         """Создает соединения между всеми парами узлов, если соединения ещё не существуют."""
+        self.build_topology("complete", title="Полносвязный граф")
+
+    def build_topology(self, method, k=DEFAULT_K, radius=None, title="Топология"):
+        """
+        Добавляет соединения топологии method (см. topology.METHODS) между
+        парами узлов, которые ещё не связаны. Для всех соединений берётся
+        первый кабель.
+        """
+        if not self.cables:
+            messagebox.showinfo(title, "Нет ни одного кабеля! Добавьте кабель.")
+            return
+        self.add_designed_connections(
+            title, self.cables[0],
+            lambda nodes, existing: topology_edges(nodes, method, k, radius).exclude(existing))
+
+    def build_backbone(self, cable, candidates="delaunay", k=DEFAULT_K, connectivity=1):
+        """Достраивает сеть до дешёвой магистрали заданной связности (backbone.design_backbone)."""
+        self.add_designed_connections(
+            "Магистраль", cable,
+            lambda nodes, existing: design_backbone(nodes, cable, candidates, k, connectivity, existing))
+
+    def add_designed_connections(self, title, cable, design):
+        """
+        Пакетно добавляет соединения на кабеле cable. design(nodes, existing)
+        выполняется в фоне и возвращает topology.EdgeList новых рёбер; existing —
+        пары позиций узлов, которые уже связаны (их нужно пропустить).
+        """
         # Проверка: должно быть не менее двух узлов для создания соединений
         if len(self.nodes) < 2:
-            messagebox.showinfo("Полносвязный граф", "Недостаточно узлов для полносвязной сети.")
+            messagebox.showinfo(title, "Недостаточно узлов для построения соединений.")
             return
 
         # Проверка: если список кабелей пуст, невозможно создать соединения
+        if cable is None:
+            messagebox.showinfo(title, "Нет ни одного кабеля! Добавьте кабель.")
+            return
+
+        nodes = self.nodes
+        connections = self.connections
+
+        def compute(ctx):
+            ctx.status("Поиск пар узлов...")
+            edges = design(nodes, existing_pairs(nodes, connections))
+            ctx.check()
+            ctx.status(f"Создание {len(edges)} соединений...")
+            return make_connections(nodes, edges, cable)
+
+        def on_done(added):
+            for conn in added:
+                self.network.add_connection(conn)
+            if added:
+                self.routing_cache.invalidate()
+            # Рисуем только новые соединения (и только видимые из них)
+            self.renderer.add_connections(added)
+            cost = sum(conn.connection_cost for conn in added)
+            messagebox.showinfo(title,
+                                f"Добавлено {len(added)} новых соединений стоимостью {cost:.2f} "
+                                f"(использован кабель '{cable.cable_name}').")
+
+        self.run_task(title, compute, on_done)
+
+    # --------------------------------------------------------------------------
+    # Диалог выбора разреженной топологии (k ближайших, радиус, Делоне, Габриэль)
+    def show_topology_dialog(self):
+        """Открывает диалог построения соединений по координатам узлов выбранным способом."""
+        dialog = tk.Toplevel(self)
+        dialog.title("Топология")
+
+        labels = {
+            "k ближайших соседей": "knn",
+            "По радиусу": "radius",
+            "Триангуляция Делоне": "delaunay",
+            "Граф Габриэля": "gabriel",
+            "Полносвязный граф": "complete",
+        }
+        tk.Label(dialog, text="Способ:").grid(row=0, column=0, padx=5, pady=5, sticky="e")
+        method_box = ttk.Combobox(dialog, values=list(labels), state="readonly", width=25)
+        method_box.current(0)
+        method_box.grid(row=0, column=1, padx=5, pady=5)
+
+        tk.Label(dialog, text="k (соседей):").grid(row=1, column=0, padx=5, pady=5, sticky="e")
+        k_entry = tk.Entry(dialog)
+        k_entry.insert(0, str(DEFAULT_K))
+        k_entry.grid(row=1, column=1, padx=5, pady=5)
+
+        tk.Label(dialog, text="Радиус:").grid(row=2, column=0, padx=5, pady=5, sticky="e")
+        radius_entry = tk.Entry(dialog)
+        radius_entry.grid(row=2, column=1, padx=5, pady=5)
+
+        def on_confirm():
+            method = labels[method_box.get()]
+            try:
+                k = int(k_entry.get())
+                if k <= 0:
+                    raise ValueError
+            except ValueError:
+                messagebox.showerror("Ошибка", "k должно быть целым числом > 0.")
+                return
+            radius = None
+            if method == "radius":
+                try:
+                    radius = float(radius_entry.get())
+                    if radius <= 0:
+                        raise ValueError
+                except ValueError:
+                    messagebox.showerror("Ошибка", "Радиус должен быть числом > 0.")
+                    return
+            dialog.destroy()
+            self.build_topology(method, k, radius, title=method_box.get())
+
+        ttk.Button(dialog, text="Построить", command=on_confirm).grid(row=3, column=0, columnspan=2, pady=10)
+
+    # --------------------------------------------------------------------------
+    # Диалог проектирования магистрали (минимальное остовное дерево и резервирование)
+    def show_backbone_dialog(self):
+        """Открывает диалог построения дешёвой связной магистрали по координатам узлов."""
         if not self.cables:
-            messagebox.showinfo("Полносвязный граф", "Нет ни одного кабеля! Добавьте кабель.")
+            messagebox.showinfo("Магистраль", "Нет ни одного кабеля! Добавьте кабель.")
             return
+        dialog = tk.Toplevel(self)
+        dialog.title("Магистраль")
+
+        candidates = {"Триангуляция Делоне": "delaunay", "k ближайших соседей": "knn"}
+        tk.Label(dialog, text="Кандидаты:").grid(row=0, column=0, padx=5, pady=5, sticky="e")
+        candidates_box = ttk.Combobox(dialog, values=list(candidates), state="readonly", width=25)
+        candidates_box.current(0)
+        candidates_box.grid(row=0, column=1, padx=5, pady=5)
+
+        tk.Label(dialog, text="k (соседей):").grid(row=1, column=0, padx=5, pady=5, sticky="e")
+        k_entry = tk.Entry(dialog)
+        k_entry.insert(0, str(DEFAULT_K))
+        k_entry.grid(row=1, column=1, padx=5, pady=5)
+
+        tk.Label(dialog, text="Рёберная связность:").grid(row=2, column=0, padx=5, pady=5, sticky="e")
+        connectivity_box = ttk.Combobox(dialog, values=["1 — дерево", "2", "3"], width=25)
+        connectivity_box.current(0)
+        connectivity_box.grid(row=2, column=1, padx=5, pady=5)
+
+        tk.Label(dialog, text="Кабель:").grid(row=3, column=0, padx=5, pady=5, sticky="e")
+        cable_box = ttk.Combobox(dialog, values=[c.cable_name for c in self.cables], state="readonly", width=25)
+        selected = getattr(self, "selected_cable", None)  # последний кабель из диалога соединения
+        cable_box.current(self.cables.index(selected) if selected in self.cables else 0)
+        cable_box.grid(row=3, column=1, padx=5, pady=5)
 
-        # Выбираем кабель, который будет использоваться для всех новых соединений
-        cable_for_all = self.cables[0]
-
-        # Создаем множество уже существующих пар узлов, у которых есть соединение
-        existing_pairs = set()
-        for c in self.connections:
-            pair = frozenset([c.node1, c.node2])
-            existing_pairs.add(pair)
-
-        # Счетчик добавленных соединений
-        new_count = 0
-        # Перебираем все возможные пары узлов (без повторений)
-        for i in range(len(self.nodes)):
-            for j in range(i+1, len(self.nodes)):
-                n1 = self.nodes[i]
-                n2 = self.nodes[j]
-                pair = frozenset([n1, n2])
-                # Если такой пары нет в уже существующих соединениях, создаем новое соединение
-                if pair not in existing_pairs:
-                    conn_name = f"auto_{n1.name}_{n2.name}"
-                    new_conn = Connection(conn_name, n1, n2, cable_for_all)
-                    self.connections.append(new_conn)
-                    new_count += 1
-
-        # Перерисовываем Canvas, чтобы отобразить новые соединения
-        self.draw_centered_grid()
-        messagebox.showinfo("Полносвязный граф",
-                            f"Добавлено {new_count} новых соединений (использован кабель '{cable_for_all.cable_name}').")
+        def on_confirm():
+            try:
+                k = int(k_entry.get())
+                connectivity = int(connectivity_box.get().split()[0])
+                if k <= 0 or connectivity <= 0:
+                    raise ValueError
+            except (ValueError, IndexError):
+                messagebox.showerror("Ошибка", "k и связность должны быть целыми числами > 0.")
+                return
+            cable = self.cables[cable_box.current()]
+            dialog.destroy()
+            self.build_backbone(cable, candidates[candidates_box.get()], k, connectivity)
+
+        ttk.Button(dialog, text="Построить", command=on_confirm).grid(row=4, column=0, columnspan=2, pady=10)
 
     # --------------------------------------------------------------------------
     # Диалог для изменения глобального размера пакета (Packet Size)
@@ -176,25 +367,26 @@ class Application(tk.Tk):
     # Метод для рисования координатной сетки и осей на Canvas
     def draw_centered_grid(self, step=50):
         """
-        Очищает Canvas, рисует сетку с заданным шагом,
-        затем рисует центральные оси и вызывает перерисовку узлов и соединений.
+        Рисует сетку с заданным шагом и центральные оси (если изменились
+        размеры холста), затем заново создаёт элементы узлов и соединений.
+        Нужен только при полной замене сети; правки отдельных элементов
+        обновляют Canvas через self.renderer.
         """
-        self.canvas.delete("all")  # Очищаем холст
-
-        # Рисуем вертикальные линии сетки с шагом step
-        for x in range(0, self.canvas_width, step):
-            self.canvas.create_line(x, 0, x, self.canvas_height, fill="lightgray")
-        # Рисуем горизонтальные линии сетки с шагом step
-        for y in range(0, self.canvas_height, step):
-            self.canvas.create_line(0, y, self.canvas_width, y, fill="lightgray")
-
-        # Рисуем центральные оси (по центру холста) красного цвета
-        self.canvas.create_line(self.center_x, 0, self.center_x, self.canvas_height, fill="red")
-        self.canvas.create_line(0, self.center_y, self.canvas_width, self.center_y, fill="red")
+        self.renderer.grid_step = step
+        self.renderer.draw_grid(self.canvas_width, self.canvas_height, self.center_x, self.center_y)
 
         # После рисования сетки перерисовываем все элементы сети
         self.redraw_all()
 
+    # --------------------------------------------------------------------------
+    # Изменение размеров Canvas
+    def on_canvas_resize(self, event):
+        """Перерисовывает сетку под новый размер холста и досоздаёт элементы, ставшие видимыми."""
+        self.canvas_width = event.width
+        self.canvas_height = event.height
+        self.renderer.draw_grid(self.canvas_width, self.canvas_height, self.center_x, self.center_y)
+        self.renderer.refresh()
+
     # --------------------------------------------------------------------------
     # Преобразование логических координат в координаты Canvas
     def logic_to_canvas_coords(self, x: float, y: float):
@@ -208,23 +400,19 @@ class Application(tk.Tk):
         cy = self.center_y - scaled_y  # Смещение по оси Y (инверсия оси Y)
         return (cx, cy)
 
+    # --------------------------------------------------------------------------
+    # Обратное преобразование: координаты Canvas в логические
+    def canvas_to_logic_coords(self, cx: float, cy: float):
+        """Преобразует координаты Canvas в логические (обратно logic_to_canvas_coords)."""
+        x = (cx - self.center_x) / self.SCALE
+        y = (self.center_y - cy) / self.SCALE
+        return (x, y)
+
     # --------------------------------------------------------------------------
     # Перерисовка всех соединений и узлов на Canvas
     def redraw_all(self):
-        """Рисует линии соединений и узлы сети на Canvas."""
-        # Сначала прорисовываем линии для каждого соединения
-        for conn in self.connections:
-            x1, y1 = self.logic_to_canvas_coords(conn.node1.x, conn.node1.y)
-            x2, y2 = self.logic_to_canvas_coords(conn.node2.x, conn.node2.y)
-            self.canvas.create_line(x1, y1, x2, y2, fill="black")
-
-        # Затем рисуем узлы поверх линий
-        for node in self.nodes:
-            cx, cy = self.logic_to_canvas_coords(node.x, node.y)
-            # Рисуем узел в виде синего круга
-            self.canvas.create_oval(cx - 5, cy - 5, cx + 5, cy + 5, fill="blue")
-            # Отображаем название узла над ним
-            self.canvas.create_text(cx, cy - 15, text=node.name, fill="black")
+        """Заново создаёт линии соединений и узлы сети, попадающие в окно (линии под узлами)."""
+        self.renderer.reset(self.nodes, self.connections)
 
     # --------------------------------------------------------------------------
     # Применение нового масштаба, введенного пользователем
@@ -234,11 +422,109 @@ class Application(tk.Tk):
             new_scale = float(self.scale_entry.get())
             if new_scale <= 0:
                 raise ValueError  # Масштаб должен быть положительным числом
-            self.SCALE = new_scale  # Обновляем глобальный масштаб
-            self.draw_centered_grid()  # Перерисовываем холст с новым масштабом
+            # Масштабируем относительно начала координат, как и раньше
+            self.zoom_at(self.center_x, self.center_y, new_scale / self.SCALE)
         except ValueError:
             messagebox.showerror("Ошибка", "Некорректное значение масштаба (должно быть > 0).")
 
+    # --------------------------------------------------------------------------
+    # Зум и панорамирование
+    def zoom_at(self, x: float, y: float, factor: float):
+        """
+        Меняет масштаб в factor раз, оставляя точку (x, y) холста на месте.
+        Элементы сразу масштабируются средствами Canvas, а видимая часть сети
+        пересчитывается, когда пользователь перестанет крутить колесо.
+        """
+        new_scale = min(max(self.SCALE * factor, self.MIN_SCALE), self.MAX_SCALE)
+        factor = new_scale / self.SCALE
+        if factor == 1.0:
+            return
+        self.SCALE = new_scale
+        self.center_x = x + (self.center_x - x) * factor
+        self.center_y = y + (self.center_y - y) * factor
+        self.renderer.zoom_items(x, y, factor)
+        self.scale_entry.delete(0, tk.END)
+        self.scale_entry.insert(0, f"{self.SCALE:g}")
+        self.schedule_settle()
+
+    def on_mouse_wheel(self, event):
+        """Колесо вверх — приблизить, вниз — отдалить (относительно курсора)."""
+        if event.num == 4 or event.delta > 0:
+            factor = self.ZOOM_STEP
+        elif event.num == 5 or event.delta < 0:
+            factor = 1.0 / self.ZOOM_STEP
+        else:
+            return
+        self.zoom_at(event.x, event.y, factor)
+
+    def on_button_press(self, event):
+        node = self.renderer.node_at(event.x, event.y)
+        if node is None:
+            self.on_pan_start(event)
+            return
+        lx, ly = self.canvas_to_logic_coords(event.x, event.y)
+        self._drag_node = node
+        self._drag_offset = (node.x - lx, node.y - ly)
+        self._drag_moved = False
+
+    def on_button_motion(self, event):
+        if self._drag_node is None:
+            self.on_pan_move(event)
+            return
+        # Каждый кадр: новые длины только у соединений узла и сдвиг только их линий
+        lx, ly = self.canvas_to_logic_coords(event.x, event.y)
+        node = self._drag_node
+        self.network.move_node(node, lx + self._drag_offset[0], ly + self._drag_offset[1])
+        self.renderer.update_node(node)
+        self._drag_moved = True
+
+    def on_button_release(self, event):
+        if self._drag_node is None:
+            self.on_pan_end(event)
+            return
+        node, moved = self._drag_node, self._drag_moved
+        self._drag_node = None
+        if moved:
+            self.commit_node_move(node)
+
+    def commit_node_move(self, node):
+        """Узел перемещён: кэш маршрутов узнаёт только о новых весах его соединений."""
+        pairs = {frozenset((c.node1.name, c.node2.name)) for c in self.network.connections_of(node)}
+        for pair in pairs:
+            if len(pair) == 2:
+                self.routing_cache.update_pair(self.network, *pair)
+
+    def on_pan_start(self, event):
+        self._pan_last = (event.x, event.y)
+
+    def on_pan_move(self, event):
+        """Сдвигает сеть вслед за курсором одним canvas.move."""
+        if self._pan_last is None:
+            return
+        dx = event.x - self._pan_last[0]
+        dy = event.y - self._pan_last[1]
+        self._pan_last = (event.x, event.y)
+        if dx or dy:
+            self.center_x += dx
+            self.center_y += dy
+            self.renderer.pan_items(dx, dy)
+            self.schedule_settle()
+
+    def on_pan_end(self, event):
+        self._pan_last = None
+
+    def schedule_settle(self):
+        """Откладывает точную перепроекцию: каждый новый вызов сдвигает её на SETTLE_DELAY_MS."""
+        if self._settle_job is not None:
+            self.after_cancel(self._settle_job)
+        self._settle_job = self.after(self.SETTLE_DELAY_MS, self.settle_view)
+
+    def settle_view(self):
+        """Жест закончился: перерисовываем оси и пересчитываем видимую часть сети."""
+        self._settle_job = None
+        self.renderer.draw_grid(self.canvas_width, self.canvas_height, self.center_x, self.center_y)
+        self.renderer.reproject()
+
     # --------------------------------------------------------------------------
     # Диалоговое окно для добавления нового узла
     def add_node_dialog(self):
@@ -318,6 +604,7 @@ class Application(tk.Tk):
                     cost = float(cost_e.get())
                     new_r = Router(model, cap, cost)
                     self.routers.append(new_r)
+                    self.rebuild_catalogue()
                     router_tree.insert("", tk.END, values=(new_r.model_name, new_r.capacity, new_r.cost))
                     sub.destroy()  # Закрываем окно добавления роутера
                 except ValueError:
@@ -343,9 +630,10 @@ class Application(tk.Tk):
                     return
 
                 new_node = Node(x_val, y_val, name_val, self.selected_router)
-                self.nodes.append(new_node)
+                self.network.add_node(new_node)
+                self.routing_cache.node_added(new_node.name)
                 dialog.destroy()  # Закрываем окно добавления узла
-                self.draw_centered_grid()  # Обновляем отображение сети
+                self.renderer.add_node(new_node)  # Рисуем только новый узел
             except ValueError:
                 messagebox.showerror("Ошибка", "Неверные координаты (ожидается число).")
 
@@ -443,6 +731,7 @@ class Application(tk.Tk):
                     c_cap = int(cap_e.get())
                     new_c = Cable(c_name, c_cost, c_cap)
                     self.cables.append(new_c)
+                    self.rebuild_catalogue()
                     cable_tree.insert("", tk.END, values=(new_c.cable_name, new_c.cost_per_unit, new_c.capacity))
                     sub.destroy()
                 except ValueError:
@@ -466,14 +755,15 @@ class Application(tk.Tk):
             if self.selected_cable is None:
                 messagebox.showerror("Ошибка", "Выберите кабель из списка.")
                 return
-            node1_obj = next((n for n in self.nodes if n.name == n1_name), None)
-            node2_obj = next((n for n in self.nodes if n.name == n2_name), None)
+            node1_obj = self.network.node(n1_name)
+            node2_obj = self.network.node(n2_name)
             if not node1_obj or not node2_obj:
                 messagebox.showerror("Ошибка", "Указанные узлы не найдены.")
                 return
             new_conn = Connection(conn_name, node1_obj, node2_obj, self.selected_cable)
-            self.connections.append(new_conn)
-            self.draw_centered_grid()  # Перерисовываем холст после добавления соединения
+            self.network.add_connection(new_conn)
+            self.routing_cache.update_pair(self.network, n1_name, n2_name)
+            self.renderer.add_connection(new_conn)  # Рисуем только новую линию
             dialog.destroy()
 
         ttk.Button(dialog, text="Добавить соединение", command=on_confirm)\
@@ -488,14 +778,16 @@ class Application(tk.Tk):
         frame_top = ttk.Frame(dialog)
         frame_top.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=5, pady=5)
         columns = ("src", "dst", "traffic")
-        tree = ttk.Treeview(frame_top, columns=columns, show="headings", height=8)
-        for col in columns:
-            tree.heading(col, text=col.capitalize())
-        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar = ttk.Scrollbar(frame_top, orient="vertical", command=tree.yview)
-        tree.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side=tk.LEFT, fill=tk.Y)
-        self._fill_traffic_table(tree)  # Заполняем таблицу значениями из матрицы
+        # Строки таблицы — пары (src, dst); значения читаются из матрицы при показе
+        model = TableModel(
+            columns,
+            load_rows=lambda: list(self.traffic_matrix.demands),
+            row_values=lambda pair: (pair[0], pair[1], self.traffic_matrix.demands.get(pair, 0.0)),
+            row_names=lambda pair: pair,
+            sort_keys={"traffic": lambda pair: self.traffic_matrix.demands.get(pair, 0.0)},
+        )
+        table = VirtualTreeview(frame_top, model, height=8, headings=[c.capitalize() for c in columns])
+        table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
         # Нижняя часть окна для добавления новой записи в матрицу
         frame_bottom = ttk.Frame(dialog)
@@ -522,29 +814,16 @@ class Application(tk.Tk):
                 src_node = src_var.get()
                 dst_node = dst_var.get()
                 self.traffic_matrix.set_demand(src_node, dst_node, t_val)
-                self._refresh_table(tree)
+                table.refresh(reload=True)
             except ValueError:
                 messagebox.showerror("Ошибка", "Некорректное значение traffic.")
         ttk.Button(frame_bottom, text="Добавить запись", command=on_add_record)\
             .grid(row=3, column=0, columnspan=2, pady=5)
         def on_refresh():
-            self._refresh_table(tree)
+            table.refresh(reload=True)
         ttk.Button(frame_bottom, text="Обновить", command=on_refresh)\
             .grid(row=3, column=2, padx=20, pady=5)
 
-    # Метод для заполнения таблицы матрицы трафика
-    def _fill_traffic_table(self, treeview: ttk.Treeview):
-        """Заполняет Treeview данными из матрицы трафика."""
-        for (src, dst), traffic in self.traffic_matrix.demands.items():
-            treeview.insert("", tk.END, values=(src, dst, traffic))
-
-    # Метод для обновления таблицы матрицы трафика
-    def _refresh_table(self, treeview: ttk.Treeview):
-        """Очищает и заново заполняет таблицу данными из матрицы трафика."""
-        for item in treeview.get_children():
-            treeview.delete(item)
-        self._fill_traffic_table(treeview)
-
     # --------------------------------------------------------------------------
     # Диалог для отображения списка узлов с функциями редактирования и удаления
     def show_nodes_dialog(self):
@@ -552,40 +831,43 @@ class Application(tk.Tk):
         dialog = tk.Toplevel(self)
         dialog.title("Список узлов")
         columns = ("name", "x", "y", "router_model", "router_capacity", "router_cost")
-        tree = ttk.Treeview(dialog, columns=columns, show="headings", height=10)
-        for col in columns:
-            tree.heading(col, text=col)
-        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar = ttk.Scrollbar(dialog, orient="vertical", command=tree.yview)
-        tree.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side=tk.LEFT, fill=tk.Y)
+        def node_values(node):
+            return (
+                node.name,
+                f"{node.x}",
+                f"{node.y}",
+                node.router.model_name if node.router else "None",
+                f"{node.router.capacity}" if node.router else "0",
+                f"{node.router.cost}" if node.router else "0",
+            )
+        # Числовые колонки сортируются как числа, а не как строки
+        model = TableModel(
+            columns,
+            load_rows=lambda: self.nodes,
+            row_values=node_values,
+            row_names=lambda node: (node.name,),
+            sort_keys={
+                "x": lambda node: node.x,
+                "y": lambda node: node.y,
+                "router_capacity": lambda node: node.router.capacity if node.router else 0,
+                "router_cost": lambda node: node.router.cost if node.router else 0,
+            },
+        )
+        table = VirtualTreeview(dialog, model, height=10)
+        table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         def fill_nodes():
-            for item in tree.get_children():
-                tree.delete(item)
-            for node in self.nodes:
-                vals = (
-                    node.name,
-                    f"{node.x}",
-                    f"{node.y}",
-                    node.router.model_name if node.router else "None",
-                    f"{node.router.capacity}" if node.router else "0",
-                    f"{node.router.cost}" if node.router else "0",
-                )
-                tree.insert("", tk.END, values=vals)
-        fill_nodes()
+            table.refresh(reload=True)
         btn_frame = ttk.Frame(dialog)
         btn_frame.pack(side=tk.RIGHT, fill=tk.Y, padx=5, pady=5)
         def on_edit_node():
-            item_id = tree.focus()
-            if not item_id:
+            node_obj = table.selected_key()
+            if node_obj is None:
                 messagebox.showerror("Ошибка", "Выберите узел для редактирования.")
                 return
-            vals = tree.item(item_id, "values")
-            old_name = vals[0]
-            node_obj = next((n for n in self.nodes if n.name == old_name), None)
-            if not node_obj:
+            if node_obj not in self.network:
                 messagebox.showerror("Ошибка", "Узел не найден.")
                 return
+            old_name = node_obj.name
             edit_dialog = tk.Toplevel(dialog)
             edit_dialog.title(f"Редактировать узел {old_name}")
             tk.Label(edit_dialog, text="Название:").grid(row=0, column=0, padx=5, pady=5, sticky=tk.E)
@@ -614,31 +896,36 @@ class Application(tk.Tk):
                     new_y = float(y_e.get())
                     router_name = router_combo.get()
                     new_router = next((r for r in self.routers if r.model_name == router_name), None)
-                    node_obj.name = new_name
-                    node_obj.x = new_x
-                    node_obj.y = new_y
+                    renamed = new_name != node_obj.name
+                    moved = (new_x, new_y) != (node_obj.x, node_obj.y)
+                    self.network.rename_node(node_obj, new_name)
+                    # Пересчитываются только соединения этого узла
+                    self.network.move_node(node_obj, new_x, new_y)
                     node_obj.router = new_router
+                    if renamed:
+                        # Имена — ключи графа маршрутов: его проще построить заново
+                        self.routing_cache.invalidate()
+                    elif moved:
+                        self.commit_node_move(node_obj)
                     fill_nodes()
-                    self.draw_centered_grid()
+                    self.renderer.update_node(node_obj)
                     edit_dialog.destroy()
                 except ValueError:
                     messagebox.showerror("Ошибка", "Некорректные координаты.")
             ttk.Button(edit_dialog, text="Сохранить", command=on_save).grid(row=4, column=0, columnspan=2, pady=10)
         def on_delete_node():
-            item_id = tree.focus()
-            if not item_id:
+            node_obj = table.selected_key()
+            if node_obj is None:
                 messagebox.showerror("Ошибка", "Выберите узел для удаления.")
                 return
-            vals = tree.item(item_id, "values")
-            node_name = vals[0]
-            node_obj = next((n for n in self.nodes if n.name == node_name), None)
-            if not node_obj:
+            if node_obj not in self.network:
                 messagebox.showerror("Ошибка", "Узел не найден.")
                 return
-            self.connections = [c for c in self.connections if c.node1 != node_obj and c.node2 != node_obj]
-            self.nodes.remove(node_obj)
+            # Соединения узла находятся по индексу инцидентности, а не перебором всех
+            self.network.remove_node(node_obj)
+            self.routing_cache.invalidate()
             fill_nodes()
-            self.draw_centered_grid()
+            self.renderer.remove_node(node_obj)  # Вместе с линиями его соединений
         ttk.Button(btn_frame, text="Edit", command=on_edit_node).pack(pady=5)
         ttk.Button(btn_frame, text="Delete", command=on_delete_node).pack(pady=5)
 
@@ -649,40 +936,41 @@ class Application(tk.Tk):
         dialog = tk.Toplevel(self)
         dialog.title("Список соединений")
         columns = ("name", "node1", "node2", "cable", "distance", "cost")
-        tree = ttk.Treeview(dialog, columns=columns, show="headings", height=12)
-        for col in columns:
-            tree.heading(col, text=col.capitalize())
-        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar = ttk.Scrollbar(dialog, orient="vertical", command=tree.yview)
-        tree.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side=tk.LEFT, fill=tk.Y)
+        def conn_values(conn):
+            return (
+                conn.name,
+                conn.node1.name,
+                conn.node2.name,
+                conn.cable.cable_name,
+                f"{conn.distance:.2f}",
+                f"{conn.connection_cost:.2f}"
+            )
+        # Фильтр по имени узла ищет соединения по любому из концов
+        model = TableModel(
+            columns,
+            load_rows=lambda: self.connections,
+            row_values=conn_values,
+            row_names=lambda conn: (conn.node1.name, conn.node2.name),
+            sort_keys={
+                "distance": lambda conn: conn.distance,
+                "cost": lambda conn: conn.connection_cost,
+            },
+        )
+        table = VirtualTreeview(dialog, model, height=12, headings=[c.capitalize() for c in columns])
+        table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         def fill_connections():
-            for item in tree.get_children():
-                tree.delete(item)
-            for conn in self.connections:
-                vals = (
-                    conn.name,
-                    conn.node1.name,
-                    conn.node2.name,
-                    conn.cable.cable_name,
-                    f"{conn.distance:.2f}",
-                    f"{conn.connection_cost:.2f}"
-                )
-                tree.insert("", tk.END, values=vals)
-        fill_connections()
+            table.refresh(reload=True)
         btn_frame = ttk.Frame(dialog)
         btn_frame.pack(side=tk.RIGHT, fill=tk.Y, padx=5, pady=5)
         def on_edit_connection():
-            item_id = tree.focus()
-            if not item_id:
+            conn_obj = table.selected_key()
+            if conn_obj is None:
                 messagebox.showerror("Ошибка", "Выберите соединение для редактирования.")
                 return
-            vals = tree.item(item_id, "values")
-            conn_name = vals[0]
-            conn_obj = next((c for c in self.connections if c.name == conn_name), None)
-            if not conn_obj:
+            if conn_obj not in self.network:
                 messagebox.showerror("Ошибка", "Соединение не найдено.")
                 return
+            conn_name = conn_obj.name
             edit_dialog = tk.Toplevel(dialog)
             edit_dialog.title(f"Редактировать соединение {conn_name}")
             tk.Label(edit_dialog, text="Название:").grid(row=0, column=0, padx=5, pady=5, sticky=tk.E)
@@ -709,62 +997,117 @@ class Application(tk.Tk):
                 if n1_name == n2_name:
                     messagebox.showerror("Ошибка", "Узел 1 и Узел 2 должны быть разными.")
                     return
-                node1_obj = next((n for n in self.nodes if n.name == n1_name), None)
-                node2_obj = next((n for n in self.nodes if n.name == n2_name), None)
+                node1_obj = self.network.node(n1_name)
+                node2_obj = self.network.node(n2_name)
                 cable_obj = next((cb for cb in self.cables if cb.cable_name == cab_name), None)
                 if not (node1_obj and node2_obj and cable_obj):
                     messagebox.showerror("Ошибка", "Неверные узлы или кабель.")
                     return
+                old_pair = (conn_obj.node1.name, conn_obj.node2.name)
                 conn_obj.name = new_name
-                conn_obj.node1 = node1_obj
-                conn_obj.node2 = node2_obj
+                self.network.reconnect(conn_obj, node1_obj, node2_obj)
                 conn_obj.cable = cable_obj
                 # Пересчитываем дистанцию и стоимость соединения
-                conn_obj.distance = conn_obj._calc_distance()
-                conn_obj.connection_cost = conn_obj.distance * cable_obj.cost_per_unit
+                conn_obj.recalculate()
+                # Чиним кэш маршрутов только для старой и новой пары узлов
+                self.routing_cache.update_pair(self.network, *old_pair)
+                if frozenset(old_pair) != frozenset([n1_name, n2_name]):
+                    self.routing_cache.update_pair(self.network, n1_name, n2_name)
                 fill_connections()
-                self.draw_centered_grid()
+                self.renderer.update_connection(conn_obj)
                 edit_dialog.destroy()
             ttk.Button(edit_dialog, text="Сохранить", command=on_save).grid(row=4, column=0, columnspan=2, pady=10)
         def on_delete_connection():
-            item_id = tree.focus()
-            if not item_id:
+            conn_obj = table.selected_key()
+            if conn_obj is None:
                 messagebox.showerror("Ошибка", "Выберите соединение для удаления.")
                 return
-            vals = tree.item(item_id, "values")
-            conn_name = vals[0]
-            conn_obj = next((c for c in self.connections if c.name == conn_name), None)
-            if not conn_obj:
+            if conn_obj not in self.network:
                 messagebox.showerror("Ошибка", "Соединение не найдено.")
                 return
-            self.connections.remove(conn_obj)
+            self.network.remove_connection(conn_obj)
+            self.routing_cache.update_pair(self.network, conn_obj.node1.name, conn_obj.node2.name)
             fill_connections()
-            self.draw_centered_grid()
+            self.renderer.remove_connection(conn_obj)
         ttk.Button(btn_frame, text="Edit", command=on_edit_connection).pack(pady=5)
         ttk.Button(btn_frame, text="Delete", command=on_delete_connection).pack(pady=5)
 
     # --------------------------------------------------------------------------
     # Диалог для отображения кратчайших путей между узлами
     def show_shortest_paths_dialog(self):
-        """Открывает окно с выводом кратчайших путей для каждой пары узлов."""
-        paths_dict = calculate_all_shortest_paths(self.nodes, self.connections)
+        """
+        Открывает окно с кратчайшими путями для каждой пары узлов.
+        Пары показываются постранично (VirtualTreeview поверх PathsTable):
+        пути и их стоимость восстанавливаются только для видимых строк.
+        """
+        nodes, connections = self.nodes, self.connections
+
+        def compute(ctx):
+            return self.routing_cache.shortest_paths(nodes, connections, ctx.progress)
+
+        self.run_task("Расчёт кратчайших путей", compute, self._show_shortest_paths_result)
+
+    def _show_shortest_paths_result(self, paths_dict):
+        """
+        Окно с таблицей путей по уже посчитанным деревьям. Окно не модальное:
+        правки сети кэш не вносит в выданные деревья, поэтому таблица остаётся
+        согласованным снимком, а стоимость берётся из расстояний тех же деревьев.
+        """
+        model = PathsTable(paths_dict)
+
         dialog = tk.Toplevel(self)
         dialog.title("Кратчайшие пути")
-        row_idx = 0
-        # Проходим по всем исходным узлам и их целям, выводя найденные пути
-        for src, dst_map in paths_dict.items():
-            for dst, path_list in dst_map.items():
-                if path_list:
-                    path_str = " -> ".join(path_list)
-                    label_text = f"{src} -> {dst}: {path_str}"
-                else:
-                    label_text = f"{src} -> {dst}: (нет пути)"
-                tk.Label(dialog, text=label_text).grid(row=row_idx, column=0, sticky=tk.W, padx=5, pady=2)
-                row_idx += 1
+
+        # Фильтры по префиксу имени источника и приёмника
+        filter_frame = ttk.Frame(dialog)
+        filter_frame.pack(side=tk.TOP, fill=tk.X, padx=5, pady=5)
+        tk.Label(filter_frame, text="Источник:").pack(side=tk.LEFT, padx=5)
+        src_var = tk.StringVar()
+        ttk.Entry(filter_frame, textvariable=src_var, width=15).pack(side=tk.LEFT, padx=5)
+        tk.Label(filter_frame, text="Приёмник:").pack(side=tk.LEFT, padx=5)
+        dst_var = tk.StringVar()
+        ttk.Entry(filter_frame, textvariable=dst_var, width=15).pack(side=tk.LEFT, padx=5)
+
+        table = VirtualTreeview(dialog, model, height=20, show_filter=False, sortable=False,
+                                headings=("Источник", "Приёмник", "Переходов", "Стоимость", "Путь"))
+        table.tree.column("path", width=400)
+        table.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        def on_filter(*_):
+            model.set_filters(src_var.get(), dst_var.get())
+            table.reset_view()
+        src_var.trace_add("write", on_filter)
+        dst_var.trace_add("write", on_filter)
+
+        def on_export():
+            filename = filedialog.asksaveasfilename(
+                parent=dialog, defaultextension=".csv",
+                filetypes=[("CSV", "*.csv"), ("All Files", "*.*")])
+            if not filename:
+                return
+            src_prefix, dst_prefix = src_var.get(), dst_var.get()
+            self.run_task(
+                "Экспорт путей",
+                lambda ctx: export_shortest_paths_csv(filename, paths_dict, None, src_prefix, dst_prefix,
+                                                      ctx.progress),
+                lambda count: messagebox.showinfo("Экспорт", f"Записано путей: {count}.", parent=dialog),
+                on_error=lambda e: messagebox.showerror("Ошибка экспорта", str(e), parent=dialog),
+            )
+        ttk.Button(filter_frame, text="Экспорт в CSV", command=on_export).pack(side=tk.RIGHT, padx=5)
 
     # --------------------------------------------------------------------------
     # Диалог для отображения потоков на соединениях с расчетом задержки
     def show_data_flows_dialog(self):
+        """Считает потоки в фоне и затем открывает окно с результатом."""
+        nodes, connections = self.nodes, self.connections
+        traffic_matrix, packet_size = self.traffic_matrix, self.global_packet_size
+        self.run_task(
+            "Расчёт потоков",
+            lambda ctx: self.routing_cache.flows(nodes, connections, traffic_matrix, packet_size, ctx.progress),
+            self._show_data_flows_result,
+        )
+
+    def _show_data_flows_result(self, conn_data):
         """Открывает окно, показывающее потоки, пакет, пропускную способность и рассчитанную задержку для каждого соединения."""
         dialog = tk.Toplevel(self)
         dialog.title("Потоки по соединениям")
@@ -776,26 +1119,13 @@ class Application(tk.Tk):
         scrollbar = ttk.Scrollbar(dialog, orient="vertical", command=tree.yview)
         tree.configure(yscroll=scrollbar.set)
         scrollbar.pack(side=tk.LEFT, fill=tk.Y)
-        # Вычисляем данные потоков на соединениях с учетом глобального размера пакета
-        conn_data = compute_flows_on_connections(
-            self.nodes, self.connections, self.traffic_matrix, self.global_packet_size
-        )
         delays_list = []  # Список для хранения конечных значений задержки
         for conn, info in conn_data.items():
             flow = info["flow"]
             packet_size = info["packet"]
             capacity = conn.cable.capacity
-            if flow >= capacity:
-                delay_str = "∞"
-                delay_val = float('inf')
-            else:
-                denom = capacity - flow
-                if denom <= 0:
-                    delay_str = "∞"
-                    delay_val = float('inf')
-                else:
-                    delay_val = packet_size / denom  # Новая формула расчёта задержки
-                    delay_str = f"{delay_val:.4f}"
+            delay_val = connection_delay(flow, packet_size, capacity)
+            delay_str = "∞" if delay_val == float('inf') else f"{delay_val:.4f}"
             if delay_val != float('inf'):
                 delays_list.append(delay_val)
             vals = (
@@ -818,17 +1148,83 @@ class Application(tk.Tk):
             tk.Label(avg_frame, text="Нет конечных значений задержки (все ∞?)")\
               .pack(side=tk.LEFT, padx=5)
 
+    # --------------------------------------------------------------------------
+    # Окно профилирования: включение и статистика по фазам расчёта
+    def show_profile_dialog(self):
+        """
+        Показывает статистику profiling по фазам (вызовы, время, счётчики, память).
+        Профилирование включается здесь же и действует для всех последующих расчётов.
+        """
+        dialog = tk.Toplevel(self)
+        dialog.title("Профиль")
+
+        options = ttk.Frame(dialog)
+        options.pack(side=tk.TOP, fill=tk.X, padx=5, pady=5)
+        enabled_var = tk.BooleanVar(value=profiling.is_enabled())
+        memory_var = tk.BooleanVar(value=profiling.PROFILER.track_allocations)
+
+        def apply_options():
+            if enabled_var.get():
+                profiling.enable(memory_var.get())
+            else:
+                profiling.disable()
+
+        ttk.Checkbutton(options, text="Профилирование включено", variable=enabled_var,
+                        command=apply_options).pack(side=tk.LEFT, padx=5)
+        ttk.Checkbutton(options, text="Учитывать память (медленнее)", variable=memory_var,
+                        command=apply_options).pack(side=tk.LEFT, padx=5)
+
+        columns = ("phase", "calls", "seconds", "avg_ms", "peak_kib", "counters")
+        headings = ("Фаза", "Вызовов", "Время, с", "Среднее, мс", "Пик, КиБ", "Счётчики")
+        table_frame = ttk.Frame(dialog)
+        table_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        tree = ttk.Treeview(table_frame, columns=columns, show="headings", height=10)
+        for col, text in zip(columns, headings):
+            tree.heading(col, text=text)
+        tree.column("counters", width=400)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=tree.yview)
+        tree.configure(yscroll=scrollbar.set)
+        scrollbar.pack(side=tk.LEFT, fill=tk.Y)
+
+        def refresh():
+            tree.delete(*tree.get_children())
+            for phase in profiling.stats().ordered():
+                avg_ms = 1000.0 * phase.seconds / phase.calls if phase.calls else 0.0
+                peak = "-" if phase.peak_bytes is None else f"{phase.peak_bytes / 1024:.1f}"
+                counters = ", ".join(f"{k}={v}" for k, v in sorted(phase.counters.items()))
+                tree.insert("", tk.END, values=(phase.name, phase.calls, f"{phase.seconds:.4f}",
+                                                f"{avg_ms:.3f}", peak, counters))
+
+        def on_reset():
+            profiling.reset()
+            refresh()
+
+        def on_copy():
+            self.clipboard_clear()
+            self.clipboard_append(profiling.stats().format_table())
+
+        buttons = ttk.Frame(dialog)
+        buttons.pack(side=tk.BOTTOM, fill=tk.X, padx=5, pady=5)
+        ttk.Button(buttons, text="Обновить", command=refresh).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons, text="Сбросить", command=on_reset).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons, text="Копировать", command=on_copy).pack(side=tk.LEFT, padx=5)
+        refresh()
+
     # --------------------------------------------------------------------------
     # Вычисление минимальных ресурсов и суммарных затрат
     def compute_min_resources(self):
         """Вычисляет минимальные варианты роутеров для каждого узла и минимальный кабель, затем выводит суммарные затраты."""
-        try:
-            min_routers = find_min_router_per_node(self.nodes, self.routers, self.traffic_matrix)
-            min_cable = find_min_cable(self.cables, self.traffic_matrix)
+        nodes, routers, cables = self.nodes, self.router_index, self.cable_index
+        connections, traffic_matrix = self.connections, self.traffic_matrix
+
+        def compute(ctx):
+            min_routers = find_min_router_per_node(nodes, routers, traffic_matrix)
+            min_cable = find_min_cable(cables, traffic_matrix)
             total_router_cost = sum(
                 router.cost for router in min_routers.values() if router is not None
             )
-            total_cable_cost = sum_cable_costs(self.connections)
+            total_cable_cost = sum_cable_costs(connections)
             msg = "Минимальные роутеры по узлам:\n"
             for node_name, router in min_routers.items():
                 if router:
@@ -843,18 +1239,28 @@ class Application(tk.Tk):
             msg += "\n"
             msg += f"Сумма всех цен роутеров (min вариант): {total_router_cost:.2f}\n"
             msg += f"Сумма всех цен кабелей (текущая сеть): {total_cable_cost:.2f}\n"
-            messagebox.showinfo("Результат", msg)
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Произошла ошибка при вычислении минимальных ресурсов:\n{e}")
+            return msg
+
+        self.run_task(
+            "Расчёт минимальных ресурсов",
+            compute,
+            lambda msg: messagebox.showinfo("Результат", msg),
+            on_error=lambda e: messagebox.showerror(
+                "Ошибка", f"Произошла ошибка при вычислении минимальных ресурсов:\n{e}"),
+        )
 
     # --------------------------------------------------------------------------
     # Сохранение данных в файл
     def save_data(self):
-        """Открывает диалог для выбора файла и сохраняет все данные сети в JSON формате."""
-        filename = filedialog.asksaveasfilename(defaultextension=".json")
+        """Открывает диалог для выбора файла и сохраняет все данные сети в JSON или бинарный снимок."""
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON Files", "*.json"), ("Network snapshot", "*" + SNAPSHOT_EXTENSION)]
+        )
         if filename:
+            save_fn = save_snapshot if filename.endswith(SNAPSHOT_EXTENSION) else save_data_to_file
             try:
-                save_data_to_file(
+                save_fn(
                     filename,
                     self.routers,
                     self.nodes,
@@ -869,21 +1275,91 @@ class Application(tk.Tk):
     # --------------------------------------------------------------------------
     # Загрузка данных из файла
     def load_data(self):
-        """Открывает диалог для выбора файла и загружает данные сети из JSON файла."""
-        filename = filedialog.askopenfilename(filetypes=[("JSON Files", "*.json")])
+        """Открывает диалог для выбора файла и загружает данные сети из JSON файла или бинарного снимка."""
+        filename = filedialog.askopenfilename(
+            filetypes=[("JSON Files", "*.json"), ("Network snapshot", "*" + SNAPSHOT_EXTENSION)]
+        )
         if not filename:
             return
-        try:
-            data = load_data_from_file(filename)
-            self.routers = data["routers"]
-            self.nodes = data["nodes"]
-            self.connections = data["connections"]
-            self.traffic_matrix = data["traffic_matrix"]
-            self.cables = data.get("cables", [])
-            self.draw_centered_grid()  # Обновляем отображение сети после загрузки
-            messagebox.showinfo("Загрузка", "Все данные успешно загружены.")
-        except Exception as e:
-            messagebox.showerror("Ошибка при загрузке", str(e))
+
+        def load(ctx):
+            if filename.endswith(SNAPSHOT_EXTENSION):
+                return load_snapshot(filename)
+            # Потоковый разбор сообщает прогресс по прочитанным байтам
+            return load_data_from_file_streaming(filename, ctx.progress)
+
+        self.run_task("Загрузка", load, self._apply_loaded_data,
+                      on_error=lambda e: messagebox.showerror("Ошибка при загрузке", str(e)))
+
+    def _apply_loaded_data(self, data):
+        """Подставляет загруженные данные и перерисовывает сеть (в потоке Tk)."""
+        self.routers = data["routers"]
+        self.network.reset(data["nodes"], data["connections"])
+        self.traffic_matrix = data["traffic_matrix"]
+        self.cables = data.get("cables", [])
+        self.rebuild_catalogue()
+        self.routing_cache.invalidate()
+        self.draw_centered_grid()  # Обновляем отображение сети после загрузки
+        messagebox.showinfo("Загрузка", "Все данные успешно загружены.")
+
+    # --------------------------------------------------------------------------
+    # Запуск долгого расчёта в фоне с окном прогресса
+    def run_task(self, title, fn, on_done, on_error=None):
+        """
+        Выполняет fn(context) в рабочем потоке (см. tasks.BackgroundTask) и
+        показывает окно с полосой прогресса и кнопкой «Отмена». context.progress
+        передаётся в функции расчёта как progress-колбэк. on_done(result)
+        вызывается в потоке Tk. Пока задача идёт, окно прогресса модальное:
+        сеть нельзя изменить посреди расчёта.
+        """
+        dialog = tk.Toplevel(self)
+        dialog.title(title)
+        dialog.transient(self)
+        status = tk.Label(dialog, text=f"{title}...")
+        status.pack(padx=10, pady=(10, 5))
+        # Пока не пришёл первый прогресс, полоса «бегает» (объём работы неизвестен)
+        bar = ttk.Progressbar(dialog, length=300, mode="indeterminate", maximum=100)
+        bar.pack(padx=10, pady=5)
+        bar.start(10)
+        cancel_button = ttk.Button(dialog, text="Отмена")
+        cancel_button.pack(pady=(5, 10))
+
+        def on_progress(done, total):
+            if total <= 0:
+                return
+            if str(bar["mode"]) != "determinate":
+                bar.stop()
+                bar.configure(mode="determinate")
+            bar["value"] = 100.0 * done / total
+
+        def close():
+            bar.stop()
+            dialog.grab_release()
+            dialog.destroy()
+
+        def on_task_done(result):
+            close()
+            on_done(result)
+
+        def on_task_error(e):
+            close()
+            if on_error is not None:
+                on_error(e)
+            else:
+                messagebox.showerror("Ошибка", str(e))
+
+        task = BackgroundTask(self, fn, on_task_done, on_error=on_task_error, on_cancel=close,
+                              on_progress=on_progress, on_status=lambda text: status.configure(text=text))
+
+        def on_cancel_click():
+            task.cancel()
+            cancel_button.configure(state=tk.DISABLED)
+            status.configure(text="Отмена...")
+
+        cancel_button.configure(command=on_cancel_click)
+        dialog.protocol("WM_DELETE_WINDOW", on_cancel_click)
+        dialog.grab_set()
+        return task.start()
 
 # --------------------------------------------------------------------------
 # Функция для применения тёмной темы ко всему приложению
@@ -0,0 +1,122 @@
+import json
+import os
+import re
+from typing import Any, Callable, Iterator, Optional, TextIO, Tuple
+
+# Размер читаемого за раз куска файла (символов)
+CHUNK_SIZE = 1 << 16
+
+# progress(прочитано_байт, всего_байт)
+ProgressCallback = Callable[[int, int], None]
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Символы, которыми может продолжиться JSON после значения внутри объекта/массива
+_DELIMITERS = ",]}:"
+
+
+class _Reader:
+    """Буфер поверх файла: дочитывает куски по мере разбора и отбрасывает разобранное."""
+    def __init__(self, f: TextIO, total: int, progress: Optional[ProgressCallback], chunk_size: int):
+        self.f = f
+        self.total = total
+        self.progress = progress
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.read_bytes = 0
+        self.decoder = json.JSONDecoder()
+
+    def fill(self) -> bool:
+        """Дочитывает следующий кусок. Возвращает False, если файл закончился."""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Разобранную часть буфера выбрасываем, чтобы память не росла
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        self.read_bytes += len(chunk.encode("utf-8"))
+        if self.progress is not None:
+            self.progress(min(self.read_bytes, self.total), self.total)
+        return True
+
+    def peek(self) -> str:
+        """Первый непробельный символ (не сдвигая позицию); '' в конце файла."""
+        while True:
+            buf = self.buf
+            pos = _WHITESPACE.match(buf, self.pos).end()
+            self.pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Ошибка JSON: ожидался '{char}', найдено '{found or 'конец файла'}'.")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Разбирает одно JSON-значение целиком, при необходимости дочитывая файл."""
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # Число или литерал могли оборваться на границе куска: значение
+            # считаем законченным, только если за ним виден разделитель
+            after = _WHITESPACE.match(self.buf, end).end()
+            if (after == len(self.buf) or self.buf[after] not in _DELIMITERS) and self.fill():
+                continue
+            self.pos = end
+            return obj
+
+
+def iter_sections(f: TextIO, progress: Optional[ProgressCallback] = None,
+                  chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[str, Any]]:
+    """
+    Потоковый разбор JSON-объекта верхнего уровня, не загружая файл целиком.
+
+    Для каждого ключа, значение которого — массив, выдаёт пары (ключ, элемент)
+    по одному элементу; для остальных ключей — одну пару (ключ, значение).
+    progress, если задан, вызывается после чтения каждого куска.
+    """
+    try:
+        total = os.fstat(f.fileno()).st_size
+    except (AttributeError, OSError, ValueError):
+        total = 0
+    reader = _Reader(f, total, progress, chunk_size)
+
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        if not isinstance(key, str):
+            raise ValueError("Ошибка JSON: ключ объекта должен быть строкой.")
+        reader.expect(":")
+        if reader.peek() == "[":
+            reader.pos += 1
+            if reader.peek() == "]":
+                reader.pos += 1
+            else:
+                while True:
+                    yield key, reader.value()
+                    sep = reader.peek()
+                    reader.expect(sep if sep in ",]" else ",")
+                    if sep == "]":
+                        break
+        else:
+            yield key, reader.value()
+
+        sep = reader.peek()
+        reader.expect(sep if sep in ",}" else ",")
+        if sep == "}":
+            return
@@ -1,17 +1,34 @@
+import csv
 import heapq
 import json
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional, Union
 from math import sqrt
-from models import Node, Connection, TrafficMatrix, Router, Cable
+from models import Node, Connection, TrafficMatrix, Router, Cable, NodeTable, ConnectionTable
+from graph import CompactGraph
+from parallel import shortest_path_trees
+from dense import DenseGraph, dense_engine_suits
+from paths import ShortestPathsView, PathsTable
+from json_stream import iter_sections, ProgressCallback
+from profiling import PROFILER, profiled
+from catalogue import CatalogueIndex
+
+@profiled("dijkstra_with_paths")
+def dijkstra_with_paths(graph: Union[Dict[str, Dict[str, float]], CompactGraph], start: str):
+    """
+    Алгоритм Дейкстры, возвращающий (distances, predecessors).
+    graph — словарь смежности из build_graph или CompactGraph.
+    """
+    if isinstance(graph, CompactGraph):
+        dist, pred, _ = graph.shortest_path_tree(graph.index[start])
+        return graph.distances_by_name(dist), graph.predecessors_by_name(pred)
 
-def dijkstra_with_paths(graph: Dict[str, Dict[str, float]], start: str):
-    """Алгоритм Дейкстры, возвращающий (distances, predecessors)."""
     distances = {n: float('inf') for n in graph}
     distances[start] = 0
     visited = set()
     predecessors = {n: None for n in graph}
 
     queue = [(0, start)]
+    improved = 0
     while queue:
         cur_dist, node = heapq.heappop(queue)
         if node in visited:
@@ -24,8 +41,15 @@ def dijkstra_with_paths(graph: Dict[str, Dict[str, float]], start: str):
                 distances[neighbor] = dist
                 predecessors[neighbor] = node
                 heapq.heappush(queue, (dist, neighbor))
+                improved += 1
+    if PROFILER.enabled:
+        # Очередь выбирается до конца, поэтому извлечений столько же, сколько вставок
+        PROFILER.add_counts("dijkstra_with_paths", heap_pushes=improved + 1, heap_pops=improved + 1,
+                            relaxations=sum(len(graph[n]) for n in visited),
+                            improvements=improved, settled=len(visited))
     return distances, predecessors
 
+@profiled("reconstruct_path")
 def reconstruct_path(predecessors: Dict[str, str], start: str, end: str) -> List[str]:
     """
     Восстанавливаем путь из start в end по словарю predecessors.
@@ -42,6 +66,7 @@ def reconstruct_path(predecessors: Dict[str, str], start: str, end: str) -> List
         return path
     return []
 
+@profiled("build_graph")
 def build_graph(nodes: List[Node], connections: List[Connection]) -> Dict[str, Dict[str, float]]:
     """
     Создаём словарь смежности вида:
@@ -50,7 +75,18 @@ def build_graph(nodes: List[Node], connections: List[Connection]) -> Dict[str, D
        ...
     }
     """
-    graph = {node.name: {} for node in nodes}
+    if isinstance(nodes, NodeTable):
+        graph = {name: {} for name in nodes.names}
+    else:
+        graph = {node.name: {} for node in nodes}
+    if isinstance(connections, ConnectionTable):
+        # Столбцы таблицы читаются напрямую, без объектов-видов
+        names = connections.nodes.names
+        for a, b, cost in zip(connections.node1, connections.node2, connections.cost):
+            n1, n2 = names[a], names[b]
+            graph[n1][n2] = cost
+            graph[n2][n1] = cost
+        return graph
     for conn in connections:
         n1, n2 = conn.node1.name, conn.node2.name
         cost = conn.connection_cost
@@ -58,22 +94,143 @@ def build_graph(nodes: List[Node], connections: List[Connection]) -> Dict[str, D
         graph[n2][n1] = cost
     return graph
 
-def calculate_all_shortest_paths(nodes: List[Node], connections: List[Connection]) -> Dict[str, Dict[str, List[str]]]:
+def build_compact_graph(nodes: List[Node], connections: List[Connection]) -> CompactGraph:
+    """
+    Компактный вариант build_graph: номера узлов вместо имён и CSR-массивы
+    вместо словаря словарей (см. graph.CompactGraph).
+    """
+    return CompactGraph.from_network(nodes, connections)
+
+# Движки маршрутизации для build_routing_graph
+ENGINES = ("auto", "dict", "csr", "dense")
+
+def build_routing_graph(nodes: List[Node], connections: List[Connection], engine: str = "auto"):
+    """
+    Строит граф для расчёта маршрутов выбранным движком:
+      "dict"  — словарь смежности (build_graph), Дейкстра от каждого узла;
+      "csr"   — CompactGraph, Дейкстра по номерам узлов;
+      "dense" — DenseGraph, Дейкстра от всех узлов сразу на матрицах (нужен NumPy);
+      "auto"  — "dense" для небольших плотных сетей, иначе "dict".
+
+    Все движки выбирают из путей равной стоимости один и тот же путь,
+    поэтому пути, их стоимости и потоки от выбора движка не зависят.
+    """
+    if engine == "auto":
+        engine = "dense" if dense_engine_suits(nodes, connections) else "dict"
+    if engine == "dict":
+        return build_graph(nodes, connections)
+    if engine == "csr":
+        return build_compact_graph(nodes, connections)
+    if engine == "dense":
+        return DenseGraph.from_network(nodes, connections)
+    raise ValueError(f"Неизвестный движок маршрутизации: {engine}")
+
+@profiled("calculate_all_shortest_paths")
+def calculate_all_shortest_paths(nodes: List[Node], connections: List[Connection],
+                                 graph: Union[CompactGraph, DenseGraph, None] = None,
+                                 workers: int = 1,
+                                 cache_size: int = 0,
+                                 progress: Optional[ProgressCallback] = None) -> ShortestPathsView:
     """
     Для каждого узла считаем кратчайшие пути (списки узлов) до всех остальных.
     Возвращаем { src_name: { dst_name: [src, ..., dst], ... }, ... }
+
+    Результат — ShortestPathsView: деревья предков считаются сразу, а сами
+    списки узлов восстанавливаются при обращении (cache_size > 0 — LRU-кэш путей).
+    Если нужен настоящий словарь, используйте .to_dict().
+
+    Если передан graph (CompactGraph, DenseGraph или словарь смежности,
+    построенный по тем же узлам и соединениям), расчёт идёт по нему. Без graph
+    плотные сети считаются на матрицах DenseGraph (см. build_routing_graph).
+    workers > 1 (или None — по числу ядер) распределяет источники по процессам
+    (см. parallel.shortest_path_trees); процессы считают по CompactGraph, и
+    словарь смежности для этого заменяется на него. DenseGraph решается
+    целиком в текущем процессе, workers для него не важен.
+
+    progress(готово, всего), если задан, вызывается по мере расчёта; исключение
+    из него прерывает расчёт (так работает отмена фоновой задачи).
     """
-    graph = build_graph(nodes, connections)
-    result = {}
-    for node in nodes:
+    if workers != 1 and not isinstance(graph, DenseGraph):
+        if not isinstance(graph, CompactGraph):
+            graph = build_compact_graph(nodes, connections)
+        return _all_shortest_paths_compact(graph, workers, cache_size, progress)
+    if graph is None:
+        graph = build_routing_graph(nodes, connections)
+    if isinstance(graph, DenseGraph):
+        if graph.pred is None:
+            graph.solve(progress)
+        return graph.all_paths(cache_size)
+    if isinstance(graph, CompactGraph):
+        return _all_shortest_paths_compact(graph, cache_size=cache_size, progress=progress)
+
+    trees = {}
+    for i, node in enumerate(nodes):
         src = node.name
-        dist_map, pred_map = dijkstra_with_paths(graph, src)
-        result[src] = {}
-        for other in graph:
-            if other != src:
-                path_list = reconstruct_path(pred_map, src, other)
-                result[src][other] = path_list
-    return result
+        trees[src] = dijkstra_with_paths(graph, src)
+        if progress is not None:
+            progress(i + 1, len(nodes))
+
+    def path_fn(src: str, dst: str) -> List[str]:
+        return reconstruct_path(trees[src][1], src, dst)
+
+    def cost_fn(src: str, dst: str) -> float:
+        return trees[src][0][dst]
+
+    return ShortestPathsView([node.name for node in nodes], path_fn, cache_size, cost_fn)
+
+def path_cost(graph: Dict[str, Dict[str, float]], path: List[str]) -> Optional[float]:
+    """
+    Стоимость пути по словарю смежности из build_graph (None для пустого пути).
+    """
+    if not path:
+        return None
+    return sum(graph[a][b] for a, b in zip(path, path[1:]))
+
+def export_shortest_paths_csv(filename, paths: ShortestPathsView,
+                              graph: Optional[Dict[str, Dict[str, float]]] = None,
+                              src_prefix: str = "", dst_prefix: str = "",
+                              progress: Optional[ProgressCallback] = None) -> int:
+    """
+    Записывает кратчайшие пути в CSV (src, dst, hops, cost, path) построчно:
+    пути восстанавливаются и пишутся по одному, весь список в памяти не строится.
+    Стоимость берётся из расстояний тех же деревьев (paths.cost); если передан
+    словарь смежности graph из build_graph — суммируется по нему.
+    Необязательные префиксы ограничивают источники и приёмники.
+    progress(записано, всего) вызывается каждые 1000 строк.
+    Возвращает число записанных строк.
+    """
+    table = PathsTable(paths, None if graph is None else lambda p: path_cost(graph, p))
+    table.set_filters(src_prefix, dst_prefix)
+    total = len(table)
+    count = 0
+    with open(filename, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(PathsTable.columns)
+        for row in table.iter_rows():
+            writer.writerow(row)
+            count += 1
+            if progress is not None and count % 1000 == 0:
+                progress(count, total)
+    if progress is not None:
+        progress(count, total)
+    return count
+
+def _all_shortest_paths_compact(graph: CompactGraph, workers: int = 1,
+                                cache_size: int = 0,
+                                progress: Optional[ProgressCallback] = None) -> ShortestPathsView:
+    """calculate_all_shortest_paths для CompactGraph: деревья хранятся массивами номеров."""
+    names = graph.names
+    index = graph.index
+    dists, preds = shortest_path_trees(graph, workers, progress=progress)
+
+    def path_fn(src: str, dst: str) -> List[str]:
+        src_id = index[src]
+        return [names[i] for i in graph.path_ids(preds[src_id], src_id, index[dst])]
+
+    def cost_fn(src: str, dst: str) -> float:
+        return dists[index[src]][index[dst]]
+
+    return ShortestPathsView(names, path_fn, cache_size, cost_fn)
 
 def calculate_data_flows(paths_dict: Dict[str, Dict[str, List[str]]],
                          traffic_matrix: TrafficMatrix) -> List[Tuple[str, str, float]]:
@@ -95,10 +252,12 @@ def calculate_data_flows(paths_dict: Dict[str, Dict[str, List[str]]],
                     flows.append((src, dst, traffic))
     return flows
 
+@profiled("compute_flows_on_connections")
 def compute_flows_on_connections(nodes: List[Node],
                                  connections: List[Connection],
                                  traffic_matrix: TrafficMatrix,
-                                 global_packet_size: float) -> Dict[Connection, Dict[str, float]]:
+                                 global_packet_size: float,
+                                 graph: Union[CompactGraph, DenseGraph, None] = None) -> Dict[Connection, Dict[str, float]]:
     """
     Для каждого соединения считаем:
       - Суммарный трафик, проходящий через него (flow)
@@ -114,8 +273,17 @@ def compute_flows_on_connections(nodes: List[Node],
       }
     """
 
+    if graph is None and dense_engine_suits(nodes, connections):
+        graph = DenseGraph.from_network(nodes, connections)
+
+    # Плотная сеть: трафик раскладывается прямо по матрице предков
+    if isinstance(graph, DenseGraph):
+        result = {conn: {"flow": 0.0, "packet": 0.0} for conn in connections}
+        add_dense_flows(graph, connections, traffic_matrix, global_packet_size, result)
+        return result
+
     # 1) Считаем кратчайшие пути
-    paths_dict = calculate_all_shortest_paths(nodes, connections)
+    paths_dict = calculate_all_shortest_paths(nodes, connections, graph)
 
     # 2) Подготовим словарь с начальными значениями
     result = {}
@@ -129,67 +297,233 @@ def compute_flows_on_connections(nodes: List[Node],
         conn_map[key] = conn
 
     # 4) Идём по каждой записи матрицы нагрузки
-    for key, traffic in traffic_matrix.demands.items():
-        if isinstance(key, tuple) and len(key) == 2:
-            src, dst = key
-            path = paths_dict.get(src, {}).get(dst, [])
-            for i in range(len(path) - 1):
-                n1, n2 = path[i], path[i+1]
-                ckey = frozenset([n1, n2])
-                if ckey in conn_map:
-                    c = conn_map[ckey]
-                    result[c]["flow"] += traffic
-                    # packet_size для всего один
-                    result[c]["packet"] = global_packet_size
+    with PROFILER.phase("compute_flows_on_connections.accumulate"):
+        for key, traffic in traffic_matrix.demands.items():
+            if isinstance(key, tuple) and len(key) == 2:
+                src, dst = key
+                path = paths_dict.get(src, {}).get(dst, [])
+                for i in range(len(path) - 1):
+                    n1, n2 = path[i], path[i+1]
+                    ckey = frozenset([n1, n2])
+                    if ckey in conn_map:
+                        c = conn_map[ckey]
+                        result[c]["flow"] += traffic
+                        # packet_size для всего один
+                        result[c]["packet"] = global_packet_size
 
     return result
 
-def find_min_router(routers: List[Router], traffic_matrix: TrafficMatrix):
+def group_demands_by_source(traffic_matrix: TrafficMatrix) -> Dict[str, List[Tuple[str, float]]]:
+    """
+    Группирует записи матрицы нагрузки по узлу-источнику:
+    { src_name: [(dst_name, traffic), ...], ... }
+    """
+    return traffic_matrix.demands_by_source()
+
+def _tree_order(tree_edges, start):
+    """
+    Порядок обхода дерева кратчайших путей от корня start к листьям.
+    tree_edges — пары (узел, предок); пары с предком None пропускаются.
+    В списке каждый узел стоит после своего предка, недостижимые узлы не попадают.
+    """
+    children = {}
+    for node, parent in tree_edges:
+        if parent is not None:
+            children.setdefault(parent, []).append(node)
+    order = [start]
+    i = 0
+    while i < len(order):
+        order.extend(children.get(order[i], ()))
+        i += 1
+    return order
+
+@profiled("compute_flows_by_demand")
+def compute_flows_by_demand(nodes: List[Node],
+                            connections: List[Connection],
+                            traffic_matrix: TrafficMatrix,
+                            global_packet_size: float,
+                            graph: Union[Dict[str, Dict[str, float]], CompactGraph, DenseGraph, None] = None,
+                            progress: Optional[ProgressCallback] = None) -> Dict[Connection, Dict[str, float]]:
+    """
+    То же, что compute_flows_on_connections, но Дейкстра запускается только
+    для узлов, которые встречаются в матрице нагрузки как источники.
+
+    Списки путей не строятся: нагрузка каждого приёмника складывается в узле,
+    а затем поднимается по дереву предков к источнику, так что каждое ребро
+    дерева обрабатывается один раз на источник.
+
+    graph — результат build_routing_graph (любой движок); без него расчёт
+    всегда идёт по словарю смежности: движок по плотности здесь не
+    выбирается, чтобы результат совпадал с compute_flows_on_connections.
+    progress — как в calculate_all_shortest_paths (по числу источников).
+    """
+    result = {}
+    for conn in connections:
+        result[conn] = {"flow": 0.0, "packet": 0.0}
+
+    if isinstance(graph, DenseGraph):
+        if graph.pred is None:
+            graph.solve(progress)
+        add_dense_flows(graph, connections, traffic_matrix, global_packet_size, result)
+        return result
+    if isinstance(graph, CompactGraph):
+        _flows_by_demand_compact(graph, connections, traffic_matrix, global_packet_size, result, progress)
+        return result
+
+    if graph is None:
+        graph = build_graph(nodes, connections)
+
+    conn_map = {}
+    for conn in connections:
+        key = frozenset([conn.node1.name, conn.node2.name])
+        conn_map[key] = conn
+
+    by_source = group_demands_by_source(traffic_matrix)
+    for i, (src, demands) in enumerate(by_source.items()):
+        if progress is not None:
+            progress(i, len(by_source))
+        if src not in graph:
+            continue
+        dist_map, pred_map = dijkstra_with_paths(graph, src)
+        add_tree_flows(pred_map, src, demands, conn_map, result, global_packet_size)
+
+    return result
+
+def add_tree_flows(pred_map: Dict[str, str], src: str, demands: List[Tuple[str, float]],
+                   conn_map: Dict[frozenset, Connection],
+                   result: Dict[Connection, Dict[str, float]],
+                   global_packet_size: float):
+    """
+    Добавляет в result потоки от источника src по его дереву кратчайших путей.
+    pred_map — словарь предков из dijkstra_with_paths, demands — [(dst, traffic), ...]
+    из group_demands_by_source, conn_map — {frozenset(имён): соединение}.
+    """
+    # Нагрузка, которая должна прийти в узел (только достижимые приёмники)
+    load = {}
+    for dst, traffic in demands:
+        if dst == src or pred_map.get(dst) is None:
+            continue
+        load[dst] = load.get(dst, 0.0) + traffic
+    if not load:
+        return
+
+    # Идём от листьев к корню и переносим нагрузку на ребро к предку
+    for node in reversed(_tree_order(pred_map.items(), src)):
+        if node == src or node not in load:
+            continue
+        parent = pred_map[node]
+        ckey = frozenset([parent, node])
+        if ckey in conn_map:
+            c = conn_map[ckey]
+            result[c]["flow"] += load[node]
+            result[c]["packet"] = global_packet_size
+        load[parent] = load.get(parent, 0.0) + load[node]
+
+def _flows_by_demand_compact(graph: CompactGraph,
+                             connections: List[Connection],
+                             traffic_matrix: TrafficMatrix,
+                             global_packet_size: float,
+                             result: Dict[Connection, Dict[str, float]],
+                             progress: Optional[ProgressCallback] = None):
+    """compute_flows_by_demand для CompactGraph: канал берём из pred_conn, без frozenset."""
+    index = graph.index
+    by_source = group_demands_by_source(traffic_matrix)
+    for i, (src, demands) in enumerate(by_source.items()):
+        if progress is not None:
+            progress(i, len(by_source))
+        src_id = index.get(src)
+        if src_id is None:
+            continue
+        dist, pred, pred_conn = graph.shortest_path_tree(src_id)
+
+        load = {}
+        for dst, traffic in demands:
+            dst_id = index.get(dst)
+            if dst_id is None or dst_id == src_id or pred[dst_id] == -1:
+                continue
+            load[dst_id] = load.get(dst_id, 0.0) + traffic
+        if not load:
+            continue
+
+        tree_edges = ((i, p) for i, p in enumerate(pred) if p != -1)
+        for node in reversed(_tree_order(tree_edges, src_id)):
+            if node == src_id or node not in load:
+                continue
+            parent = pred[node]
+            c = result[connections[pred_conn[node]]]
+            c["flow"] += load[node]
+            c["packet"] = global_packet_size
+            load[parent] = load.get(parent, 0.0) + load[node]
+
+def add_dense_flows(graph: DenseGraph,
+                 connections: List[Connection],
+                 traffic_matrix: TrafficMatrix,
+                 global_packet_size: float,
+                 result: Dict[Connection, Dict[str, float]]):
+    """
+    Добавляет в result потоки для DenseGraph: все записи матрицы нагрузки
+    раскладываются по матрице предков одновременно.
+    """
+    index = graph.index
+    src_ids, dst_ids, traffic = [], [], []
+    for key, value in traffic_matrix.demands.items():
+        if isinstance(key, tuple) and len(key) == 2:
+            src_id = index.get(key[0])
+            dst_id = index.get(key[1])
+            if src_id is not None and dst_id is not None:
+                src_ids.append(src_id)
+                dst_ids.append(dst_id)
+                traffic.append(value)
+
+    flow, used = graph.accumulate_flows(src_ids, dst_ids, traffic, len(connections))
+    for k, conn in enumerate(connections):
+        if used[k]:
+            result[conn]["flow"] += float(flow[k])
+            result[conn]["packet"] = global_packet_size
+
+def connection_delay(flow: float, packet_size: float, capacity: float) -> float:
+    """
+    Задержка на канале: packet_size / (capacity - flow);
+    inf, если поток не меньше пропускной способности.
+    """
+    if flow >= capacity:
+        return float('inf')
+    return packet_size / (capacity - flow)
+
+def _router_index(routers: Union[List[Router], CatalogueIndex]) -> CatalogueIndex:
+    return routers if isinstance(routers, CatalogueIndex) else CatalogueIndex.of_routers(routers)
+
+def _cable_index(cables: Union[List[Cable], CatalogueIndex]) -> CatalogueIndex:
+    return cables if isinstance(cables, CatalogueIndex) else CatalogueIndex.of_cables(cables)
+
+def find_min_router(routers: Union[List[Router], CatalogueIndex], traffic_matrix: TrafficMatrix):
     """
     По суммарному трафику ищем роутер, который имеет capacity >= total_traffic.
     Из таких - выбираем роутер с минимальной cost.
     Возвращаем None, если не нашли.
+    routers — список или готовый CatalogueIndex (его стоит держать, пока каталог не меняется).
     """
-    total_traffic = sum(traffic_matrix.demands.values())
-    feasible_routers = [r for r in routers if r.capacity >= total_traffic]
-    if feasible_routers:
-        return min(feasible_routers, key=lambda r: r.cost)
-    return None
+    return _router_index(routers).cheapest(traffic_matrix.total())
 
-def find_min_router_per_node(nodes: List[Node], routers: List[Router], traffic_matrix: TrafficMatrix) -> Dict[str, Router]:
+def find_min_router_per_node(nodes: List[Node], routers: Union[List[Router], CatalogueIndex],
+                             traffic_matrix: TrafficMatrix) -> Dict[str, Router]:
     """
     Для каждого узла находит минимальный по стоимости роутер, который может обработать
-    исходящий трафик этого узла.
-    """
-    node_traffic = {node.name: 0.0 for node in nodes}
-
-    # Считаем суммарный исходящий трафик для каждого узла
-    for (src, dst), traffic in traffic_matrix.demands.items():
-        if src in node_traffic:
-            node_traffic[src] += traffic
-
-    min_routers = {}
-    for node in nodes:
-        traffic = node_traffic.get(node.name, 0.0)
-        feasible_routers = [r for r in routers if r.capacity >= traffic]
-        if feasible_routers:
-            min_router = min(feasible_routers, key=lambda r: r.cost)
-            min_routers[node.name] = min_router
-        else:
-            min_routers[node.name] = None  # Нет подходящего роутера
-
-    return min_routers
-
-def find_min_cable(cables: List[Cable], traffic_matrix: TrafficMatrix):
+    исходящий трафик этого узла. Все узлы ищутся в индексе каталога одним вызовом.
+    """
+    # Суммарный исходящий трафик для каждого узла (сумма строки матрицы)
+    outgoing = traffic_matrix.source_totals()
+    names = nodes.names if isinstance(nodes, NodeTable) else [node.name for node in nodes]
+    loads = [outgoing.get(name, 0.0) for name in names]
+    # None — нет подходящего роутера
+    return dict(zip(names, _router_index(routers).cheapest_many(loads)))
+
+def find_min_cable(cables: Union[List[Cable], CatalogueIndex], traffic_matrix: TrafficMatrix):
     """
     Аналогично для кабеля: ищем кабель, у которого capacity >= total_traffic.
     Из подходящих - выбираем тот, у которого cost_per_unit минимален.
     """
-    total_traffic = sum(traffic_matrix.demands.values())
-    feasible_cables = [c for c in cables if c.capacity >= total_traffic]
-    if feasible_cables:
-        return min(feasible_cables, key=lambda c: c.cost_per_unit)
-    return None
+    return _cable_index(cables).cheapest(traffic_matrix.total())
 
 def sum_router_costs(nodes: List[Node]) -> float:
     """
@@ -201,8 +535,11 @@ def sum_cable_costs(connections: List[Connection]) -> float:
     """
     Считает сумму цен всех кабелей в соединениях.
     """
+    if isinstance(connections, ConnectionTable):
+        return sum(connections.cost)
     return sum(conn.connection_cost for conn in connections)
 
+@profiled("save_data_to_file")
 def save_data_to_file(filename, routers: List[Router], nodes: List[Node],
                      connections: List[Connection], traffic_matrix: TrafficMatrix,
                      cables: List[Cable]):
@@ -218,6 +555,15 @@ def save_data_to_file(filename, routers: List[Router], nodes: List[Node],
             }
             for r in routers
         ],
+        # Кабели пишем до соединений, чтобы файл можно было читать потоково
+        "cables": [
+            {
+                "cable_name": cab.cable_name,
+                "cost_per_unit": cab.cost_per_unit,
+                "capacity": cab.capacity
+            }
+            for cab in cables
+        ],
         "nodes": [
             {
                 "name": n.name,
@@ -238,14 +584,6 @@ def save_data_to_file(filename, routers: List[Router], nodes: List[Node],
             }
             for c in connections
         ],
-        "cables": [
-            {
-                "cable_name": cab.cable_name,
-                "cost_per_unit": cab.cost_per_unit,
-                "capacity": cab.capacity
-            }
-            for cab in cables
-        ],
         # Теперь в traffic_matrix.demands храним только traffic
         # Сериализуем как список словарей
         "traffic_matrix": [
@@ -261,77 +599,167 @@ def save_data_to_file(filename, routers: List[Router], nodes: List[Node],
     with open(filename, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=4, ensure_ascii=False)
 
-def load_data_from_file(filename):
-    """
-    Загружает все данные (включая полную матрицу нагрузок) из JSON.
+class _DataLoader:
     """
-    with open(filename, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    Собирает объекты модели из записей секций файла сохранения.
 
-    # --- Восстанавливаем роутеры ---
-    routers = []
-    for r_dict in data.get("routers", []):
+    Ссылки (узел -> роутер, соединение -> узлы и кабель) разрешаются через
+    словари имя -> объект, поэтому загрузка линейна по размеру файла.
+    Если секция ссылается на ещё не прочитанную (например, "cables" записаны
+    после "connections"), её записи откладываются до конца нужной секции.
+
+    compact=True — узлы и соединения складываются в NodeTable/ConnectionTable
+    вместо списков объектов (для очень больших сетей).
+    """
+    def __init__(self, compact: bool = False):
+        self.compact = compact
+        self.routers = []
+        self.cables = []
+        if compact:
+            self.nodes = NodeTable()
+            self.connections = ConnectionTable(self.nodes)
+        else:
+            self.nodes = []
+            self.connections = []
+        self.traffic_matrix = TrafficMatrix()
+        self._router_index = {}
+        self._cable_index = {}
+        self._node_index = {}
+        self._done = set()
+        self._current = None
+        self._pending_nodes = []
+        self._pending_connections = []
+
+    def add(self, section: str, row):
+        """Обрабатывает одну запись секции section."""
+        if section != self._current:
+            self._finish_section()
+            self._current = section
+        if section == "routers":
+            self._add_router(row)
+        elif section == "cables":
+            self._add_cable(row)
+        elif section == "nodes":
+            if "routers" in self._done:
+                self._add_node(row)
+            else:
+                self._pending_nodes.append(row)
+        elif section == "connections":
+            if self._connections_ready():
+                self._add_connection(row)
+            else:
+                self._pending_connections.append(row)
+        elif section == "traffic_matrix":
+            self.traffic_matrix.set_demand(row["src"], row["dst"], row["traffic"])
+
+    def _connections_ready(self) -> bool:
+        return "nodes" in self._done and "cables" in self._done and not self._pending_nodes
+
+    def _finish_section(self):
+        if self._current is not None:
+            self._done.add(self._current)
+        self._flush()
+
+    def _flush(self):
+        if self._pending_nodes and "routers" in self._done:
+            for row in self._pending_nodes:
+                self._add_node(row)
+            self._pending_nodes = []
+        if self._pending_connections and self._connections_ready():
+            for row in self._pending_connections:
+                self._add_connection(row)
+            self._pending_connections = []
+
+    def _add_router(self, r_dict):
         model_name = r_dict["model_name"]
         capacity = r_dict["capacity"]
         cost = r_dict["cost"]
-        routers.append(Router(model_name, capacity, cost))
+        router = Router(model_name, capacity, cost)
+        self.routers.append(router)
+        self._router_index.setdefault(model_name, router)
 
-    # --- Восстанавливаем кабели ---
-    cables = []
-    for c_dict in data.get("cables", []):
+    def _add_cable(self, c_dict):
         name = c_dict["cable_name"]
         c_cost = c_dict["cost_per_unit"]
         cap = c_dict["capacity"]
-        cables.append(Cable(name, c_cost, cap))
+        cable = Cable(name, c_cost, cap)
+        self.cables.append(cable)
+        self._cable_index.setdefault(name, cable)
 
-    # --- Восстанавливаем узлы ---
-    nodes = []
-    for n_dict in data.get("nodes", []):
+    def _add_node(self, n_dict):
         x = n_dict["x"]
         y = n_dict["y"]
         name = n_dict["name"]
+        found_router = self._router_index.get(n_dict["router_model_name"])
+        if self.compact:
+            node_obj = self.nodes.append(x, y, name, found_router)
+        else:
+            node_obj = Node(x, y, name, found_router)
+            self.nodes.append(node_obj)
+        self._node_index.setdefault(name, node_obj)
 
-        router_name = n_dict["router_model_name"]
-        found_router = next((r for r in routers if r.model_name == router_name), None)
-
-        node_obj = Node(x, y, name, found_router)
-        nodes.append(node_obj)
-
-    # --- Восстанавливаем соединения ---
-    connections = []
-    for c_dict in data.get("connections", []):
+    def _add_connection(self, c_dict):
         conn_name = c_dict["name"]
-        node1_name = c_dict["node1"]
-        node2_name = c_dict["node2"]
-        cable_name = c_dict["cable_name"]
-        distance = c_dict["distance"]
-        connection_cost = c_dict["connection_cost"]
-
-        node1_obj = next((n for n in nodes if n.name == node1_name), None)
-        node2_obj = next((n for n in nodes if n.name == node2_name), None)
-        cable_obj = next((c for c in cables if c.cable_name == cable_name), None)
+        node1_obj = self._node_index.get(c_dict["node1"])
+        node2_obj = self._node_index.get(c_dict["node2"])
+        cable_obj = self._cable_index.get(c_dict["cable_name"])
 
         if not node1_obj or not node2_obj or not cable_obj:
             raise ValueError(f"Connection '{conn_name}' refers to non-existent nodes or cable.")
 
+        if self.compact:
+            self.connections.append(conn_name, node1_obj.id, node2_obj.id, cable_obj,
+                                    c_dict["distance"], c_dict["connection_cost"])
+            return
         conn = Connection(conn_name, node1_obj, node2_obj, cable_obj)
         # Устанавливаем distance и connection_cost, чтобы избежать пересчёта
-        conn.distance = distance
-        conn.connection_cost = connection_cost
-        connections.append(conn)
-
-    # --- Восстанавливаем traffic_matrix ---
-    traffic_matrix = TrafficMatrix()
-    for row in data.get("traffic_matrix", []):
-        src = row["src"]
-        dst = row["dst"]
-        traffic = row["traffic"]
-        traffic_matrix.set_demand(src, dst, traffic)
-
-    return {
-        "routers": routers,
-        "nodes": nodes,
-        "connections": connections,
-        "traffic_matrix": traffic_matrix,
-        "cables": cables
-    }
+        conn.distance = c_dict["distance"]
+        conn.connection_cost = c_dict["connection_cost"]
+        self.connections.append(conn)
+
+    def result(self):
+        """Завершает загрузку и возвращает словарь в формате load_data_from_file."""
+        self._finish_section()
+        self._done.update(("routers", "cables", "nodes"))
+        self._flush()
+        return {
+            "routers": self.routers,
+            "nodes": self.nodes,
+            "connections": self.connections,
+            "traffic_matrix": self.traffic_matrix,
+            "cables": self.cables
+        }
+
+# Порядок, в котором секции зависят друг от друга
+_SECTION_ORDER = ("routers", "cables", "nodes", "connections", "traffic_matrix")
+
+@profiled("load_data_from_file")
+def load_data_from_file(filename, compact: bool = False):
+    """
+    Загружает все данные (включая полную матрицу нагрузок) из JSON.
+    compact=True — узлы и соединения возвращаются как NodeTable/ConnectionTable.
+    """
+    with open(filename, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    loader = _DataLoader(compact)
+    for section in _SECTION_ORDER:
+        for row in data.get(section, []):
+            loader.add(section, row)
+    return loader.result()
+
+@profiled("load_data_from_file_streaming")
+def load_data_from_file_streaming(filename, progress: Optional[ProgressCallback] = None,
+                                  compact: bool = False):
+    """
+    То же, что load_data_from_file, но файл разбирается по кускам
+    (json_stream.iter_sections): в памяти держится только текущая запись,
+    а не всё дерево JSON. progress(прочитано_байт, всего_байт) вызывается
+    по мере чтения.
+    """
+    loader = _DataLoader(compact)
+    with open(filename, "r", encoding="utf-8") as f:
+        for section, row in iter_sections(f, progress):
+            if section in _SECTION_ORDER:
+                loader.add(section, row)
+    return loader.result()
@@ -1,7 +1,18 @@
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
 from math import sqrt
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy нужен только для плотной ArrayTrafficMatrix и векторных сумм
+    np = None
 
 class Router:
     """Класс для описания роутера."""
+    __slots__ = ("model_name", "capacity", "cost")
+
     def __init__(self, model_name: str, capacity: int, cost: float):
         self.model_name = model_name
         self.capacity = capacity
@@ -13,6 +24,8 @@ class Router:
 
 class Node:
     """Класс для описания узла в сети."""
+    __slots__ = ("x", "y", "name", "router")
+
     def __init__(self, x: float, y: float, name: str, router: 'Router'):
         """
         :param x: Логическая координата X
@@ -31,6 +44,8 @@ class Node:
 
 class Cable:
     """Класс для хранения данных о кабеле."""
+    __slots__ = ("cable_name", "cost_per_unit", "capacity")
+
     def __init__(self, cable_name: str, cost_per_unit: float, capacity: int):
         self.cable_name = cable_name
         self.cost_per_unit = cost_per_unit
@@ -42,6 +57,8 @@ class Cable:
 
 class Connection:
     """Класс, описывающий соединение между двумя узлами."""
+    __slots__ = ("name", "node1", "node2", "cable", "distance", "connection_cost")
+
     def __init__(self, name: str, node1: Node, node2: Node, cable: Cable):
         self.name = name
         self.node1 = node1
@@ -50,9 +67,297 @@ class Connection:
         self.distance = self._calc_distance()
         self.connection_cost = self.distance * cable.cost_per_unit
 
+    @classmethod
+    def with_distance(cls, name: str, node1: Node, node2: Node, cable: Cable, distance: float) -> 'Connection':
+        """Соединение с уже посчитанной длиной (пакетное построение топологии)."""
+        conn = cls.__new__(cls)
+        conn.name = name
+        conn.node1 = node1
+        conn.node2 = node2
+        conn.cable = cable
+        conn.distance = distance
+        conn.connection_cost = distance * cable.cost_per_unit
+        return conn
+
     def _calc_distance(self):
         return sqrt((self.node2.x - self.node1.x)**2 + (self.node1.y - self.node2.y)**2)
 
+    def recalculate(self):
+        """Пересчитывает distance и connection_cost (после перемещения узла или смены кабеля)."""
+        self.distance = self._calc_distance()
+        self.connection_cost = self.distance * self.cable.cost_per_unit
+
+    def __repr__(self):
+        return (f"Connection({self.name}, {self.node1.name}-{self.node2.name}, "
+                f"dist={self.distance:.2f}, cost={self.connection_cost:.2f})")
+
+
+class NodeTable:
+    """Узлы по столбцам: для больших сетей вместо списка объектов Node.
+
+       Имена — списком, координаты — array('d'), роутеры — номерами в списке
+       routers (array('i'), -1 — без роутера). Таблица ведёт себя как
+       последовательность узлов: table[i] и обход возвращают NodeView с теми же
+       атрибутами, что у Node (x, y, name, router), поэтому её можно передавать
+       в функции logic вместо списка. Таблица только дополняется (append):
+       удаление сдвинуло бы номера строк, на которые ссылается ConnectionTable.
+    """
+    def __init__(self, routers: Optional[List[Router]] = None):
+        self.names: List[str] = []
+        self.x = array('d')
+        self.y = array('d')
+        self.router_ids = array('i')
+        self.routers: List[Router] = list(routers) if routers else []
+        self._router_index = {id(r): i for i, r in enumerate(self.routers)}
+        self.index: Dict[str, int] = {}  # имя -> номер первой строки с этим именем
+
+    @classmethod
+    def from_nodes(cls, nodes: Iterable[Node], routers: Optional[List[Router]] = None) -> 'NodeTable':
+        table = cls(routers)
+        for node in nodes:
+            table.append(node.x, node.y, node.name, node.router)
+        return table
+
+    def router_id(self, router: Optional[Router]) -> int:
+        """Номер роутера в routers (новый роутер добавляется); None -> -1."""
+        if router is None:
+            return -1
+        rid = self._router_index.get(id(router))
+        if rid is None:
+            rid = self._router_index[id(router)] = len(self.routers)
+            self.routers.append(router)
+        return rid
+
+    def append(self, x: float, y: float, name: str, router: Optional[Router]) -> 'NodeView':
+        i = len(self.names)
+        self.names.append(name)
+        self.x.append(x)
+        self.y.append(y)
+        self.router_ids.append(self.router_id(router))
+        self.index.setdefault(name, i)
+        return NodeView(self, i)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, i: int) -> 'NodeView':
+        n = len(self.names)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("NodeTable index out of range")
+        return NodeView(self, i)
+
+    def __iter__(self):
+        for i in range(len(self.names)):
+            yield NodeView(self, i)
+
+    def __repr__(self):
+        return f"NodeTable({len(self)} nodes)"
+
+
+class NodeView:
+    """Строка NodeTable с интерфейсом Node. Два вида одной строки равны и имеют одинаковый хэш."""
+    __slots__ = ("table", "id")
+
+    def __init__(self, table: NodeTable, node_id: int):
+        self.table = table
+        self.id = node_id
+
+    @property
+    def x(self) -> float:
+        return self.table.x[self.id]
+
+    @x.setter
+    def x(self, value: float):
+        self.table.x[self.id] = value
+
+    @property
+    def y(self) -> float:
+        return self.table.y[self.id]
+
+    @y.setter
+    def y(self, value: float):
+        self.table.y[self.id] = value
+
+    @property
+    def name(self) -> str:
+        return self.table.names[self.id]
+
+    @name.setter
+    def name(self, value: str):
+        table = self.table
+        old = table.names[self.id]
+        table.names[self.id] = value
+        if table.index.get(old) == self.id:
+            del table.index[old]
+        table.index.setdefault(value, self.id)
+
+    @property
+    def router(self) -> Optional[Router]:
+        rid = self.table.router_ids[self.id]
+        return self.table.routers[rid] if rid != -1 else None
+
+    @router.setter
+    def router(self, value: Optional[Router]):
+        self.table.router_ids[self.id] = self.table.router_id(value)
+
+    def __eq__(self, other):
+        return isinstance(other, NodeView) and other.table is self.table and other.id == self.id
+
+    def __hash__(self):
+        return hash((id(self.table), self.id))
+
+    def __repr__(self):
+        router = self.router
+        return f"Node({self.name}, x={self.x}, y={self.y}, router={router.model_name if router else None})"
+
+
+class ConnectionTable:
+    """Соединения по столбцам поверх NodeTable.
+
+       Концы хранятся номерами строк NodeTable (array('i')), кабели — номерами
+       в списке cables, длина и стоимость — array('d'). Как и NodeTable, это
+       последовательность: элементы — ConnectionView с интерфейсом Connection.
+       На миллионе соединений таблица занимает десятки МБ вместо сотен.
+    """
+    def __init__(self, nodes: NodeTable, cables: Optional[List[Cable]] = None):
+        self.nodes = nodes
+        self.names: List[str] = []
+        self.node1 = array('i')
+        self.node2 = array('i')
+        self.cable_ids = array('i')
+        self.distance = array('d')
+        self.cost = array('d')
+        self.cables: List[Cable] = list(cables) if cables else []
+        self._cable_index = {id(c): i for i, c in enumerate(self.cables)}
+
+    @classmethod
+    def from_connections(cls, connections: Iterable[Connection], nodes: NodeTable,
+                         cables: Optional[List[Cable]] = None) -> 'ConnectionTable':
+        """Переводит соединения; концы ищутся в nodes по имени."""
+        table = cls(nodes, cables)
+        for conn in connections:
+            table.append(conn.name, nodes.index[conn.node1.name], nodes.index[conn.node2.name],
+                         conn.cable, conn.distance, conn.connection_cost)
+        return table
+
+    def cable_id(self, cable: Cable) -> int:
+        cid = self._cable_index.get(id(cable))
+        if cid is None:
+            cid = self._cable_index[id(cable)] = len(self.cables)
+            self.cables.append(cable)
+        return cid
+
+    def append(self, name: str, node1: int, node2: int, cable: Cable,
+               distance: Optional[float] = None, cost: Optional[float] = None) -> 'ConnectionView':
+        """
+        Добавляет соединение между строками node1 и node2 таблицы узлов.
+        Без distance/cost они считаются, как в Connection.
+        """
+        if distance is None:
+            nodes = self.nodes
+            distance = sqrt((nodes.x[node2] - nodes.x[node1]) ** 2 + (nodes.y[node1] - nodes.y[node2]) ** 2)
+        if cost is None:
+            cost = distance * cable.cost_per_unit
+        i = len(self.names)
+        self.names.append(name)
+        self.node1.append(node1)
+        self.node2.append(node2)
+        self.cable_ids.append(self.cable_id(cable))
+        self.distance.append(distance)
+        self.cost.append(cost)
+        return ConnectionView(self, i)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, i: int) -> 'ConnectionView':
+        n = len(self.names)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("ConnectionTable index out of range")
+        return ConnectionView(self, i)
+
+    def __iter__(self):
+        for i in range(len(self.names)):
+            yield ConnectionView(self, i)
+
+    def __repr__(self):
+        return f"ConnectionTable({len(self)} connections)"
+
+
+class ConnectionView:
+    """Строка ConnectionTable с интерфейсом Connection (node1/node2 — NodeView)."""
+    __slots__ = ("table", "id")
+
+    def __init__(self, table: ConnectionTable, conn_id: int):
+        self.table = table
+        self.id = conn_id
+
+    @property
+    def name(self) -> str:
+        return self.table.names[self.id]
+
+    @name.setter
+    def name(self, value: str):
+        self.table.names[self.id] = value
+
+    @property
+    def node1(self) -> NodeView:
+        return NodeView(self.table.nodes, self.table.node1[self.id])
+
+    @node1.setter
+    def node1(self, node: NodeView):
+        self.table.node1[self.id] = node.id
+
+    @property
+    def node2(self) -> NodeView:
+        return NodeView(self.table.nodes, self.table.node2[self.id])
+
+    @node2.setter
+    def node2(self, node: NodeView):
+        self.table.node2[self.id] = node.id
+
+    @property
+    def cable(self) -> Cable:
+        return self.table.cables[self.table.cable_ids[self.id]]
+
+    @cable.setter
+    def cable(self, value: Cable):
+        self.table.cable_ids[self.id] = self.table.cable_id(value)
+
+    @property
+    def distance(self) -> float:
+        return self.table.distance[self.id]
+
+    @distance.setter
+    def distance(self, value: float):
+        self.table.distance[self.id] = value
+
+    @property
+    def connection_cost(self) -> float:
+        return self.table.cost[self.id]
+
+    @connection_cost.setter
+    def connection_cost(self, value: float):
+        self.table.cost[self.id] = value
+
+    def _calc_distance(self):
+        n1, n2 = self.node1, self.node2
+        return sqrt((n2.x - n1.x)**2 + (n1.y - n2.y)**2)
+
+    def recalculate(self):
+        self.distance = self._calc_distance()
+        self.connection_cost = self.distance * self.cable.cost_per_unit
+
+    def __eq__(self, other):
+        return isinstance(other, ConnectionView) and other.table is self.table and other.id == self.id
+
+    def __hash__(self):
+        return hash((id(self.table), self.id))
+
     def __repr__(self):
         return (f"Connection({self.name}, {self.node1.name}-{self.node2.name}, "
                 f"dist={self.distance:.2f}, cost={self.connection_cost:.2f})")
@@ -62,17 +367,319 @@ class TrafficMatrix:
     """Класс для представления матрицы нагрузки.
 
        Теперь храним только { (src, dst): traffic }.
+       version увеличивается при каждом изменении через set_demand —
+       по нему кэши понимают, что потоки нужно пересчитать.
     """
     def __init__(self):
         self.demands = {}  # {(src_name, dst_name): traffic}
+        self.version = 0
 
     def set_demand(self, source: str, target: str, traffic: float):
         if traffic < 0:
             raise ValueError("Нельзя использовать отрицательные значения traffic.")
         self.demands[(source, target)] = traffic
+        self.version += 1
 
     def get_demand(self, source: str, target: str):
         return self.demands.get((source, target), 0.0)
 
+    def total(self) -> float:
+        """Суммарный трафик по всей матрице."""
+        return sum(self.demands.values())
+
+    def source_totals(self) -> Dict[str, float]:
+        """Исходящий трафик каждого источника: {src_name: сумма по строке}."""
+        totals = {}
+        for (src, dst), traffic in self.demands.items():
+            totals[src] = totals.get(src, 0.0) + traffic
+        return totals
+
+    def target_totals(self) -> Dict[str, float]:
+        """Входящий трафик каждого приёмника: {dst_name: сумма по столбцу}."""
+        totals = {}
+        for (src, dst), traffic in self.demands.items():
+            totals[dst] = totals.get(dst, 0.0) + traffic
+        return totals
+
+    def demands_by_source(self) -> Dict[str, List[Tuple[str, float]]]:
+        """Записи, сгруппированные по источнику: { src_name: [(dst_name, traffic), ...], ... }"""
+        groups = {}
+        for key, traffic in self.demands.items():
+            if isinstance(key, tuple) and len(key) == 2:
+                src, dst = key
+                groups.setdefault(src, []).append((dst, traffic))
+        return groups
+
     def __repr__(self):
         return f"TrafficMatrix({self.demands})"
+
+
+class ArrayTrafficMatrix:
+    """Матрица нагрузки на массивах по номерам узлов.
+
+       Тот же интерфейс, что у TrafficMatrix (set_demand, get_demand, demands,
+       total, source_totals, ...), но вместо словаря с ключами-кортежами:
+         - для небольших сетей (и при наличии NumPy) — плотная матрица N×N;
+         - иначе — разреженная CSR-структура (array('q') / array('i') / array('d')),
+           новые записи копятся в небольшом словаре и периодически вливаются в CSR.
+       row_sums/col_sums возвращают суммы по номерам узлов (векторно при наличии NumPy).
+
+       Загрузчики (load_data_from_file, load_snapshot) и GUI создают обычную
+       TrafficMatrix; этот вариант включается явно — конструктором или
+       from_traffic_matrix.
+    """
+    DENSE_MAX_NODES = 2000
+    # Минимальный размер буфера новых записей перед слиянием с CSR
+    PENDING_LIMIT = 4096
+
+    def __init__(self, node_names: Iterable[str] = (), dense: Optional[bool] = None):
+        self.names = []   # номер -> имя
+        self.index = {}   # имя -> номер
+        for name in node_names:
+            if name not in self.index:
+                self.index[name] = len(self.names)
+                self.names.append(name)
+        n = len(self.names)
+        if dense is None:
+            dense = np is not None and n <= self.DENSE_MAX_NODES
+        if dense and np is None:
+            raise RuntimeError("Для плотной матрицы нагрузки нужен NumPy.")
+        self.dense = dense
+        if dense:
+            self._matrix = np.zeros((n, n))
+            self._present = np.zeros((n, n), dtype=bool)
+        else:
+            self._indptr = array('q', [0]) * (n + 1)
+            self._indices = array('i')
+            self._data = array('d')
+            self._pending = {}  # {(src_id, dst_id): traffic} — ещё не влитые в CSR
+        self.version = 0
+
+    @classmethod
+    def from_traffic_matrix(cls, traffic_matrix: 'TrafficMatrix', node_names: Iterable[str] = (),
+                            dense: Optional[bool] = None) -> 'ArrayTrafficMatrix':
+        """Переводит обычную TrafficMatrix; node_names задаёт порядок номеров."""
+        names = list(node_names)
+        for src, dst in traffic_matrix.demands:
+            names.append(src)
+            names.append(dst)
+        result = cls(names, dense)
+        for (src, dst), traffic in traffic_matrix.demands.items():
+            result.set_demand(src, dst, traffic)
+        return result
+
+    def to_traffic_matrix(self) -> 'TrafficMatrix':
+        result = TrafficMatrix()
+        for (src, dst), traffic in self.demands.items():
+            result.set_demand(src, dst, traffic)
+        return result
+
+    # ------------------------------------------------------------------
+    def _node_id(self, name: str) -> int:
+        """Номер узла; неизвестное имя получает новый номер."""
+        node_id = self.index.get(name)
+        if node_id is not None:
+            return node_id
+        node_id = len(self.names)
+        self.index[name] = node_id
+        self.names.append(name)
+        if self.dense:
+            if node_id >= self._matrix.shape[0]:
+                size = max(4, 2 * self._matrix.shape[0])
+                matrix = np.zeros((size, size))
+                present = np.zeros((size, size), dtype=bool)
+                old = self._matrix.shape[0]
+                matrix[:old, :old] = self._matrix
+                present[:old, :old] = self._present
+                self._matrix, self._present = matrix, present
+        else:
+            self._indptr.append(self._indptr[-1])
+        return node_id
+
+    def set_demand(self, source: str, target: str, traffic: float):
+        if traffic < 0:
+            raise ValueError("Нельзя использовать отрицательные значения traffic.")
+        i = self._node_id(source)
+        j = self._node_id(target)
+        if self.dense:
+            self._matrix[i, j] = traffic
+            self._present[i, j] = True
+        else:
+            self._pending[(i, j)] = traffic
+            if len(self._pending) > max(self.PENDING_LIMIT, len(self._data) // 4):
+                self._compact()
+        self.version += 1
+
+    def get_demand(self, source: str, target: str):
+        i = self.index.get(source)
+        j = self.index.get(target)
+        if i is None or j is None:
+            return 0.0
+        if self.dense:
+            return float(self._matrix[i, j]) if self._present[i, j] else 0.0
+        if (i, j) in self._pending:
+            return self._pending[(i, j)]
+        pos = self._find(i, j)
+        return self._data[pos] if pos >= 0 else 0.0
+
+    def _find(self, i: int, j: int) -> int:
+        """Позиция записи (i, j) в CSR или -1."""
+        lo, hi = self._indptr[i], self._indptr[i + 1]
+        pos = bisect_left(self._indices, j, lo, hi)
+        if pos < hi and self._indices[pos] == j:
+            return pos
+        return -1
+
+    def _compact(self):
+        """Вливает накопленные записи в CSR (при совпадении побеждает новая)."""
+        if self.dense or not self._pending:
+            return
+        by_row = {}
+        for (i, j), traffic in self._pending.items():
+            by_row.setdefault(i, []).append((j, traffic))
+
+        n = len(self.names)
+        old_indptr, old_indices, old_data = self._indptr, self._indices, self._data
+        indptr = array('q', [0])
+        indices = array('i')
+        data = array('d')
+        for i in range(n):
+            lo, hi = old_indptr[i], old_indptr[i + 1]
+            new = by_row.get(i)
+            if new is None:
+                indices.extend(old_indices[lo:hi])
+                data.extend(old_data[lo:hi])
+            else:
+                merged = dict(zip(old_indices[lo:hi], old_data[lo:hi]))
+                merged.update(new)
+                for j in sorted(merged):
+                    indices.append(j)
+                    data.append(merged[j])
+            indptr.append(len(indices))
+        self._indptr, self._indices, self._data = indptr, indices, data
+        self._pending = {}
+
+    # ------------------------------------------------------------------
+    def row_sums(self):
+        """Исходящий трафик по номерам узлов (массив длины N)."""
+        n = len(self.names)
+        if self.dense:
+            return self._matrix[:n, :n].sum(axis=1)
+        self._compact()
+        if np is not None:
+            rows = np.repeat(np.arange(n), np.diff(np.frombuffer(self._indptr, dtype=np.int64)))
+            return np.bincount(rows, weights=np.frombuffer(self._data), minlength=n)
+        sums = array('d', [0.0]) * n
+        for i in range(n):
+            sums[i] = sum(self._data[self._indptr[i]:self._indptr[i + 1]])
+        return sums
+
+    def col_sums(self):
+        """Входящий трафик по номерам узлов (массив длины N)."""
+        n = len(self.names)
+        if self.dense:
+            return self._matrix[:n, :n].sum(axis=0)
+        self._compact()
+        if np is not None:
+            return np.bincount(np.frombuffer(self._indices, dtype=np.int32),
+                               weights=np.frombuffer(self._data), minlength=n)
+        sums = array('d', [0.0]) * n
+        for j, traffic in zip(self._indices, self._data):
+            sums[j] += traffic
+        return sums
+
+    def total(self) -> float:
+        n = len(self.names)
+        if self.dense:
+            return float(self._matrix[:n, :n].sum())
+        self._compact()
+        return float(np.frombuffer(self._data).sum()) if np is not None else sum(self._data)
+
+    def source_totals(self) -> Dict[str, float]:
+        """row_sums по именам — только для узлов, у которых есть записи."""
+        present = self._row_present()
+        return {name: float(s) for name, s, p in zip(self.names, self.row_sums(), present) if p}
+
+    def target_totals(self) -> Dict[str, float]:
+        """col_sums по именам — только для узлов, у которых есть записи."""
+        targets = set(j for i, j, traffic in self._entries())
+        return {self.names[j]: float(s) for j, s in enumerate(self.col_sums()) if j in targets}
+
+    def _row_present(self):
+        n = len(self.names)
+        if self.dense:
+            return self._present[:n, :n].any(axis=1)
+        self._compact()
+        return [self._indptr[i + 1] > self._indptr[i] for i in range(n)]
+
+    def _entries(self):
+        """Все записи как (src_id, dst_id, traffic)."""
+        n = len(self.names)
+        if self.dense:
+            rows, cols = np.nonzero(self._present[:n, :n])
+            values = self._matrix[rows, cols]
+            return zip(rows.tolist(), cols.tolist(), values.tolist())
+        self._compact()
+        indptr = self._indptr
+        return ((i, self._indices[p], self._data[p]) for i in range(n) for p in range(indptr[i], indptr[i + 1]))
+
+    def demands_by_source(self) -> Dict[str, List[Tuple[str, float]]]:
+        names = self.names
+        groups = {}
+        for i, j, traffic in self._entries():
+            groups.setdefault(names[i], []).append((names[j], traffic))
+        return groups
+
+    @property
+    def demands(self) -> '_ArrayDemandsView':
+        """{(src_name, dst_name): traffic} только для чтения, как TrafficMatrix.demands."""
+        return _ArrayDemandsView(self)
+
+    def __len__(self):
+        if self.dense:
+            return int(self._present.sum())
+        self._compact()
+        return len(self._data)
+
+    def __repr__(self):
+        kind = "dense" if self.dense else "sparse"
+        return f"ArrayTrafficMatrix({len(self.names)} nodes, {len(self)} demands, {kind})"
+
+
+class _ArrayDemandsView(Mapping):
+    """ArrayTrafficMatrix.demands: отображение {(src, dst): traffic} поверх массивов."""
+    def __init__(self, matrix: ArrayTrafficMatrix):
+        self._matrix = matrix
+
+    def __getitem__(self, key):
+        if not (isinstance(key, tuple) and len(key) == 2):
+            raise KeyError(key)
+        matrix = self._matrix
+        src, dst = key
+        i = matrix.index.get(src)
+        j = matrix.index.get(dst)
+        if i is not None and j is not None:
+            if matrix.dense:
+                if matrix._present[i, j]:
+                    return float(matrix._matrix[i, j])
+            else:
+                if (i, j) in matrix._pending:
+                    return matrix._pending[(i, j)]
+                pos = matrix._find(i, j)
+                if pos >= 0:
+                    return matrix._data[pos]
+        raise KeyError(key)
+
+    def __iter__(self):
+        names = self._matrix.names
+        return ((names[i], names[j]) for i, j, traffic in self._matrix._entries())
+
+    def items(self):
+        names = self._matrix.names
+        return (((names[i], names[j]), traffic) for i, j, traffic in self._matrix._entries())
+
+    def values(self):
+        return (traffic for i, j, traffic in self._matrix._entries())
+
+    def __len__(self):
+        return len(self._matrix)
@@ -0,0 +1,180 @@
+from typing import Dict, Iterable, List, Optional
+
+from models import Node, Connection
+
+
+class Network:
+    """
+    Узлы и соединения сети с индексами для правок на больших топологиях.
+
+    Индексы:
+      имя -> узлы с этим именем (первый — тот, что вернёт node());
+      пара имён -> соединения между ними (действует последнее добавленное,
+                   как в build_graph);
+      узел -> инцидентные соединения.
+    Поиск узла и соединения пары — O(1), удаление и перемещение узла —
+    O(степени), удаление и правка соединения — O(1).
+
+    nodes и connections — списки в порядке добавления для функций logic.
+    Они строятся при первом обращении после изменения и больше не меняются:
+    правка сети создаёт новый список, поэтому фоновый расчёт может спокойно
+    работать с полученным ранее.
+    """
+    def __init__(self, nodes: Iterable[Node] = (), connections: Iterable[Connection] = ()):
+        self.reset(nodes, connections)
+
+    def clear(self):
+        # Словари вместо списков: порядок добавления и удаление за O(1)
+        self._nodes: Dict[Node, None] = {}
+        self._connections: Dict[Connection, int] = {}  # соединение -> порядковый номер добавления
+        self._by_name: Dict[str, Dict[Node, None]] = {}
+        self._pairs: Dict[frozenset, Dict[Connection, None]] = {}
+        self._incident: Dict[Node, Dict[Connection, None]] = {}
+        self._seq = 0
+        self._node_list: Optional[List[Node]] = None
+        self._conn_list: Optional[List[Connection]] = None
+
+    def reset(self, nodes: Iterable[Node], connections: Iterable[Connection]):
+        """Заменяет всё содержимое (например, после загрузки файла)."""
+        self.clear()
+        for node in nodes:
+            self.add_node(node)
+        for conn in connections:
+            self.add_connection(conn)
+
+    # ------------------------------------------------------------------
+    @property
+    def nodes(self) -> List[Node]:
+        if self._node_list is None:
+            self._node_list = list(self._nodes)
+        return self._node_list
+
+    @property
+    def connections(self) -> List[Connection]:
+        if self._conn_list is None:
+            self._conn_list = list(self._connections)
+        return self._conn_list
+
+    def node_count(self) -> int:
+        return len(self._nodes)
+
+    def connection_count(self) -> int:
+        return len(self._connections)
+
+    def __contains__(self, item) -> bool:
+        return item in self._nodes or item in self._connections
+
+    def node(self, name: str) -> Optional[Node]:
+        """Узел с именем name (при повторах — добавленный раньше) или None."""
+        same = self._by_name.get(name)
+        return next(iter(same)) if same else None
+
+    def connections_of(self, node: Node) -> List[Connection]:
+        """Соединения, один из концов которых — node."""
+        return list(self._incident.get(node, ()))
+
+    def connection_between(self, n1: str, n2: str) -> Optional[Connection]:
+        """Действующее соединение между узлами с именами n1 и n2 (последнее добавленное) или None."""
+        same = self._pairs.get(frozenset((n1, n2)))
+        if not same:
+            return None
+        return max(same, key=self._connections.__getitem__)
+
+    def has_pair(self, n1: str, n2: str) -> bool:
+        return bool(self._pairs.get(frozenset((n1, n2))))
+
+    # ------------------------------------------------------------------
+    def add_node(self, node: Node):
+        self._nodes[node] = None
+        self._by_name.setdefault(node.name, {})[node] = None
+        self._incident.setdefault(node, {})
+        self._node_list = None
+
+    def remove_node(self, node: Node) -> List[Connection]:
+        """Удаляет узел вместе с его соединениями; возвращает удалённые соединения."""
+        removed = self.connections_of(node)
+        for conn in removed:
+            self.remove_connection(conn)
+        del self._nodes[node]
+        del self._incident[node]
+        self._drop_name(node, node.name)
+        self._node_list = None
+        return removed
+
+    def rename_node(self, node: Node, new_name: str):
+        """Меняет имя узла и переносит индексы имени и пар его соединений."""
+        old_name = node.name
+        if old_name == new_name:
+            return
+        incident = self.connections_of(node)
+        for conn in incident:
+            self._unlink_pair(conn)
+        self._drop_name(node, old_name)
+        node.name = new_name
+        self._by_name.setdefault(new_name, {})[node] = None
+        for conn in incident:
+            self._link_pair(conn)
+
+    def move_node(self, node: Node, x: float, y: float) -> List[Connection]:
+        """
+        Перемещает узел и пересчитывает длину и стоимость только его соединений.
+        Возвращает эти соединения (их веса изменились).
+        """
+        node.x = x
+        node.y = y
+        changed = self.connections_of(node)
+        for conn in changed:
+            conn.recalculate()
+        return changed
+
+    def add_connection(self, conn: Connection):
+        self._connections[conn] = self._seq
+        self._seq += 1
+        self._link(conn)
+        self._conn_list = None
+
+    def remove_connection(self, conn: Connection):
+        self._unlink(conn)
+        del self._connections[conn]
+        self._conn_list = None
+
+    def reconnect(self, conn: Connection, node1: Node, node2: Node):
+        """Переносит соединение на другие узлы (концы меняются только через этот метод)."""
+        self._unlink(conn)
+        conn.node1 = node1
+        conn.node2 = node2
+        self._link(conn)
+
+    # ------------------------------------------------------------------
+    def _drop_name(self, node: Node, name: str):
+        same = self._by_name.get(name)
+        if same is not None:
+            same.pop(node, None)
+            if not same:
+                del self._by_name[name]
+
+    def _link_pair(self, conn: Connection):
+        self._pairs.setdefault(frozenset((conn.node1.name, conn.node2.name)), {})[conn] = None
+
+    def _unlink_pair(self, conn: Connection):
+        key = frozenset((conn.node1.name, conn.node2.name))
+        same = self._pairs.get(key)
+        if same is not None:
+            same.pop(conn, None)
+            if not same:
+                del self._pairs[key]
+
+    def _link(self, conn: Connection):
+        self._link_pair(conn)
+        for node in (conn.node1, conn.node2):
+            self._incident.setdefault(node, {})[conn] = None
+
+    def _unlink(self, conn: Connection):
+        self._unlink_pair(conn)
+        for node in (conn.node1, conn.node2):
+            incident = self._incident.get(node)
+            if incident is not None:
+                incident.pop(conn, None)
+
+    def __repr__(self):
+        return f"Network({len(self._nodes)} nodes, {len(self._connections)} connections)"
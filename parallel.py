@@ -0,0 +1,99 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from graph import CompactGraph
+from json_stream import ProgressCallback
+from profiling import PROFILER, profiled
+
+# Меньше этого числа узлов пул процессов не окупает свой запуск
+PARALLEL_MIN_NODES = 300
+
+# Граф, полученный процессом-исполнителем в инициализаторе (один раз на процесс)
+_worker_graph = None
+
+
+def _init_worker(graph: CompactGraph, profile: bool = False):
+    global _worker_graph
+    _worker_graph = graph
+    # При fork процесс наследует накопленное родителем — его не пересылаем обратно
+    PROFILER.reset()
+    if profile:
+        PROFILER.enable()
+
+
+def _route_sources(sources: range):
+    """
+    Задача для процесса: деревья путей для части источников, только массивы dist/pred.
+    Третий элемент — статистика профилирования этой задачи (None, если оно выключено).
+    """
+    graph = _worker_graph
+    trees = []
+    for src in sources:
+        dist, pred, _ = graph.shortest_path_tree(src)
+        trees.append((dist, pred))
+    phases = None
+    if PROFILER.enabled:
+        phases = PROFILER.stats().to_dict()
+        PROFILER.reset()
+    return sources, trees, phases
+
+
+def _chunks(n: int, workers: int) -> List[range]:
+    """Делит номера источников на куски — по несколько на процесс для балансировки."""
+    size = max(1, n // (workers * 4))
+    return [range(lo, min(n, lo + size)) for lo in range(0, n, size)]
+
+
+@profiled("shortest_path_trees")
+def shortest_path_trees(graph: CompactGraph, workers: Optional[int] = None,
+                        min_parallel_nodes: int = PARALLEL_MIN_NODES,
+                        progress: Optional[ProgressCallback] = None) -> Tuple[list, list]:
+    """
+    Деревья кратчайших путей от каждого узла графа.
+    Возвращает (dists, preds): списки по номеру источника, элементы —
+    array('d') расстояний и array('i') предков из CompactGraph.shortest_path_tree.
+
+    workers — число процессов (None — по числу ядер). Граф передаётся каждому
+    процессу один раз через инициализатор, задачи — это диапазоны номеров.
+    Для маленьких графов и workers=1 расчёт идёт последовательно.
+    progress(готово_источников, всего), если задан, вызывается по мере расчёта.
+    При включённом профилировании процессы возвращают свою статистику
+    (фаза CompactGraph.shortest_path_tree), и она добавляется к общей.
+    """
+    n = len(graph)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    dists = [None] * n
+    preds = [None] * n
+
+    if workers <= 1 or n < min_parallel_nodes:
+        for src in range(n):
+            dist, pred, _ = graph.shortest_path_tree(src)
+            dists[src] = dist
+            preds[src] = pred
+            if progress is not None:
+                progress(src + 1, n)
+        return dists, preds
+
+    done = 0
+    chunks = _chunks(n, workers)
+    profile = PROFILER.enabled
+    if profile:
+        PROFILER.add_counts("shortest_path_trees", workers=workers, chunks=len(chunks))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(graph, profile)) as pool:
+        try:
+            for sources, trees, phases in pool.map(_route_sources, chunks):
+                for src, (dist, pred) in zip(sources, trees):
+                    dists[src] = dist
+                    preds[src] = pred
+                if phases:
+                    PROFILER.merge(phases)
+                done += len(sources)
+                if progress is not None:
+                    progress(done, n)
+        except BaseException:
+            # Отмена из progress (или ошибка): ещё не начатые куски не ждём
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+    return dists, preds
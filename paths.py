@@ -0,0 +1,180 @@
+from bisect import bisect_right
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Callable, Iterator, List, Optional, Tuple
+
+# Функция восстановления пути: (src_name, dst_name) -> [src, ..., dst] или []
+PathFunction = Callable[[str, str], List[str]]
+# Длина кратчайшего пути: (src_name, dst_name) -> стоимость (inf, если пути нет)
+CostFunction = Callable[[str, str], float]
+
+
+class ShortestPathsView(Mapping):
+    """
+    Ленивое представление кратчайших путей в формате
+    { src_name: { dst_name: [src, ..., dst], ... }, ... }.
+
+    Хранит только деревья предков (внутри path_fn), а списки узлов строит при
+    обращении к view[src][dst]. Поддерживает всё, что раньше делали со словарём:
+    [], get, in, items, len, сравнение с dict.
+
+    cache_size > 0 включает LRU-кэш на столько последних восстановленных путей.
+    cost_fn — стоимость пути из тех же деревьев (их таблицы расстояний), см. cost().
+    """
+    def __init__(self, names: List[str], path_fn: PathFunction, cache_size: Optional[int] = None,
+                 cost_fn: Optional[CostFunction] = None):
+        self._names = list(dict.fromkeys(names))
+        self._name_set = set(self._names)
+        self._path_fn = path_fn
+        self._cost_fn = cost_fn
+        self._cache_size = cache_size or 0
+        self._cache = OrderedDict()
+
+    def path(self, src: str, dst: str) -> List[str]:
+        """Путь из src в dst (с учётом LRU-кэша)."""
+        if not self._cache_size:
+            return self._path_fn(src, dst)
+        key = (src, dst)
+        cache = self._cache
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        path = self._path_fn(src, dst)
+        cache[key] = path
+        if len(cache) > self._cache_size:
+            cache.popitem(last=False)
+        return path
+
+    def cost(self, src: str, dst: str) -> Optional[float]:
+        """Стоимость пути из src в dst по расстояниям деревьев (None, если пути нет)."""
+        if self._cost_fn is None:
+            return None
+        cost = self._cost_fn(src, dst)
+        return None if cost == float('inf') else cost
+
+    def to_dict(self):
+        """Материализует все пути в обычный словарь словарей."""
+        return {src: dict(paths.items()) for src, paths in self.items()}
+
+    def __getitem__(self, src):
+        if src not in self._name_set:
+            raise KeyError(src)
+        return _PathsFromSource(self, src)
+
+    def __contains__(self, src):
+        return src in self._name_set
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __repr__(self):
+        return f"ShortestPathsView({len(self._names)} nodes)"
+
+
+class _PathsFromSource(Mapping):
+    """view[src]: { dst_name: path } без самого src."""
+    def __init__(self, view: ShortestPathsView, src: str):
+        self._view = view
+        self._src = src
+
+    def __getitem__(self, dst):
+        if dst == self._src or dst not in self._view._name_set:
+            raise KeyError(dst)
+        return self._view.path(self._src, dst)
+
+    def __contains__(self, dst):
+        return dst != self._src and dst in self._view._name_set
+
+    def __iter__(self):
+        src = self._src
+        return (name for name in self._view._names if name != src)
+
+    def __len__(self):
+        return len(self._view._names) - 1
+
+
+class PathsTable:
+    """
+    Пары (src, dst) из ShortestPathsView как виртуальная таблица для VirtualTreeview.
+
+    Строки не хранятся: номер строки переводится в пару арифметически (по
+    префиксным суммам числа приёмников у каждого источника), а путь и его
+    стоимость восстанавливаются только для показываемых строк. Стоимость
+    берётся из paths.cost(), если не передана своя функция path_cost(path).
+    Фильтры — по префиксу имени источника и приёмника.
+    """
+    columns = ("src", "dst", "hops", "cost", "path")
+
+    def __init__(self, paths: ShortestPathsView,
+                 path_cost: Optional[Callable[[List[str]], Optional[float]]] = None):
+        self.paths = paths
+        self.path_cost = path_cost
+        self.src_prefix = ""
+        self.dst_prefix = ""
+        self._apply()
+
+    def _apply(self):
+        names = list(self.paths)
+        self._sources = [n for n in names if n.startswith(self.src_prefix)]
+        self._targets = [n for n in names if n.startswith(self.dst_prefix)]
+        self._target_pos = {name: j for j, name in enumerate(self._targets)}
+        # _starts[k] — номер первой строки источника _sources[k]
+        starts = []
+        total = 0
+        n_targets = len(self._targets)
+        for src in self._sources:
+            starts.append(total)
+            total += n_targets - (1 if src in self._target_pos else 0)
+        self._starts = starts
+        self._total = total
+
+    def set_filters(self, src_prefix: str = "", dst_prefix: str = ""):
+        self.src_prefix = src_prefix.strip()
+        self.dst_prefix = dst_prefix.strip()
+        self._apply()
+
+    # Интерфейс модели VirtualTreeview
+    def set_filter(self, text: str):
+        self.set_filters(text, "")
+
+    def sort_by(self, column: str, descending: Optional[bool] = None):
+        """Сортировка не поддерживается: она потребовала бы построить все пути."""
+
+    def invalidate(self):
+        """Пути — неизменяемый снимок; пересчитываются только фильтры."""
+        self._apply()
+
+    def __len__(self):
+        return self._total
+
+    def key(self, i: int):
+        if not 0 <= i < self._total:
+            raise IndexError(i)
+        k = bisect_right(self._starts, i) - 1
+        src = self._sources[k]
+        offset = i - self._starts[k]
+        own = self._target_pos.get(src)
+        if own is not None and offset >= own:
+            offset += 1
+        return src, self._targets[offset]
+
+    def row(self, i: int) -> Tuple:
+        src, dst = self.key(i)
+        return self._row(src, dst)
+
+    def _row(self, src: str, dst: str) -> Tuple:
+        path = self.paths.path(src, dst)
+        if not path:
+            return (src, dst, "", "", "(нет пути)")
+        cost = self.paths.cost(src, dst) if self.path_cost is None else self.path_cost(path)
+        return (src, dst, len(path) - 1, "" if cost is None else f"{cost:.2f}", " -> ".join(path))
+
+    def iter_rows(self) -> Iterator[Tuple]:
+        """Все строки с учётом фильтров по одной, без построения списка."""
+        for src in self._sources:
+            for dst in self._targets:
+                if dst != src:
+                    yield self._row(src, dst)
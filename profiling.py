@@ -0,0 +1,240 @@
+"""
+Необязательное профилирование горячих функций logic.
+
+Функции помечаются декоратором @profiled("фаза"). Пока профилирование
+выключено, обёртка лишь проверяет один флаг и вызывает функцию; включённое
+(enable()) — считает по каждой фазе число вызовов и время, а функции могут
+добавлять свои счётчики (вставки/извлечения из кучи, релаксации рёбер и т. п.)
+через add_counts(). С track_allocations=True через tracemalloc замеряется и
+память: сколько байт фаза оставила и пик внутри вызова.
+
+Время фаз включающее: время dijkstra_with_paths входит и в фазу
+calculate_all_shortest_paths, которая её вызывает.
+
+Процессы-исполнители (parallel) копят статистику у себя и возвращают её
+вместе с результатом, а основной процесс прибавляет её через merge().
+Время таких фаз — сумма по всем процессам, оно может превышать общее.
+
+    import profiling
+    profiling.enable()
+    ...расчёт...
+    print(profiling.stats().format_table())
+"""
+import functools
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+
+class PhaseStats:
+    """Накопленная статистика одной фазы."""
+    __slots__ = ("name", "calls", "seconds", "counters", "allocated_bytes", "peak_bytes")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0
+        self.counters: Dict[str, int] = {}
+        self.allocated_bytes: Optional[int] = None
+        self.peak_bytes: Optional[int] = None
+
+    def copy(self) -> 'PhaseStats':
+        other = PhaseStats(self.name)
+        other.calls = self.calls
+        other.seconds = self.seconds
+        other.counters = dict(self.counters)
+        other.allocated_bytes = self.allocated_bytes
+        other.peak_bytes = self.peak_bytes
+        return other
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "seconds": self.seconds,
+            "counters": dict(self.counters),
+            "allocated_bytes": self.allocated_bytes,
+            "peak_bytes": self.peak_bytes,
+        }
+
+
+class ProfileStats:
+    """Снимок статистики по фазам (для CLI — to_dict(), для людей — format_table())."""
+    def __init__(self, phases: Dict[str, PhaseStats]):
+        self.phases = phases
+
+    def __getitem__(self, name: str) -> PhaseStats:
+        return self.phases[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.phases
+
+    def __len__(self):
+        return len(self.phases)
+
+    def ordered(self) -> List[PhaseStats]:
+        """Фазы по убыванию времени."""
+        return sorted(self.phases.values(), key=lambda p: p.seconds, reverse=True)
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {p.name: p.to_dict() for p in self.ordered()}
+
+    def format_table(self) -> str:
+        lines = [f"{'фаза':<40} {'вызовов':>9} {'время, с':>10} {'пик, КиБ':>10}  счётчики"]
+        for p in self.ordered():
+            peak = "-" if p.peak_bytes is None else f"{p.peak_bytes / 1024:.1f}"
+            counters = ", ".join(f"{k}={v}" for k, v in sorted(p.counters.items()))
+            lines.append(f"{p.name:<40} {p.calls:>9} {p.seconds:>10.4f} {peak:>10}  {counters}")
+        return "\n".join(lines)
+
+
+class Profiler:
+    """
+    Накопитель статистики. Обычно используется общий экземпляр PROFILER через
+    функции модуля. Фазы могут вызываться из разных потоков (фоновые задачи
+    GUI): стек вложенных фаз у каждого потока свой, запись — под блокировкой.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.track_allocations = False
+        self._phases: Dict[str, PhaseStats] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._started_tracemalloc = False
+
+    def enable(self, track_allocations: bool = False):
+        self.track_allocations = track_allocations
+        if track_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        elif not track_allocations and self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        self.track_allocations = False
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def reset(self):
+        with self._lock:
+            self._phases = {}
+
+    def stats(self) -> ProfileStats:
+        with self._lock:
+            return ProfileStats({name: p.copy() for name, p in self._phases.items()})
+
+    def _phase(self, name: str) -> PhaseStats:
+        phase = self._phases.get(name)
+        if phase is None:
+            phase = self._phases[name] = PhaseStats(name)
+        return phase
+
+    def add_counts(self, name: str, **counts: int):
+        """Прибавляет счётчики к фазе name (вызывать, только если enabled)."""
+        with self._lock:
+            counters = self._phase(name).counters
+            for key, value in counts.items():
+                counters[key] = counters.get(key, 0) + value
+
+    def merge(self, phases: Dict[str, Dict[str, Any]]):
+        """Прибавляет статистику в формате ProfileStats.to_dict() (например, из другого процесса)."""
+        with self._lock:
+            for name, data in phases.items():
+                stats = self._phase(name)
+                stats.calls += data["calls"]
+                stats.seconds += data["seconds"]
+                for key, value in data["counters"].items():
+                    stats.counters[key] = stats.counters.get(key, 0) + value
+                if data["allocated_bytes"] is not None:
+                    stats.allocated_bytes = (stats.allocated_bytes or 0) + data["allocated_bytes"]
+                if data["peak_bytes"] is not None:
+                    stats.peak_bytes = max(stats.peak_bytes or 0, data["peak_bytes"])
+
+    @contextmanager
+    def phase(self, name: str):
+        """Замеряет блок кода как вызов фазы name."""
+        if not self.enabled:
+            yield
+            return
+        memory = self.track_allocations and tracemalloc.is_tracing()
+        if memory:
+            # Стек [память на входе, пик вложенных фаз]: вложенная фаза сбрасывает
+            # пик tracemalloc, поэтому её пик переносится во внешнюю вручную
+            stack = getattr(self._local, "stack", None)
+            if stack is None:
+                stack = self._local.stack = []
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1][1] = max(stack[-1][1], peak)
+            tracemalloc.reset_peak()
+            stack.append([current, current])
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            allocated = peak = None
+            if memory:
+                start_current, nested_peak = stack.pop()
+                current, traced_peak = tracemalloc.get_traced_memory()
+                absolute_peak = max(traced_peak, nested_peak)
+                allocated = current - start_current
+                peak = absolute_peak - start_current
+                if stack:
+                    stack[-1][1] = max(stack[-1][1], absolute_peak)
+                tracemalloc.reset_peak()
+            with self._lock:
+                stats = self._phase(name)
+                stats.calls += 1
+                stats.seconds += elapsed
+                if memory:
+                    stats.allocated_bytes = (stats.allocated_bytes or 0) + allocated
+                    stats.peak_bytes = max(stats.peak_bytes or 0, peak)
+
+
+PROFILER = Profiler()
+
+
+def profiled(name: str) -> Callable[[Callable], Callable]:
+    """Декоратор: вызовы функции учитываются как фаза name, если профилирование включено."""
+    def decorate(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return fn(*args, **kwargs)
+            with PROFILER.phase(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def enable(track_allocations: bool = False):
+    """Включает профилирование; track_allocations=True — ещё и память (заметно медленнее)."""
+    PROFILER.enable(track_allocations)
+
+
+def disable():
+    PROFILER.disable()
+
+
+def is_enabled() -> bool:
+    return PROFILER.enabled
+
+
+def reset():
+    """Обнуляет накопленную статистику."""
+    PROFILER.reset()
+
+
+def stats() -> ProfileStats:
+    return PROFILER.stats()
+
+
+def add_counts(name: str, **counts: int):
+    PROFILER.add_counts(name, **counts)
+
@@ -0,0 +1,244 @@
+import heapq
+from typing import List, Dict, Tuple, Optional, Union
+
+from models import Node, Connection, TrafficMatrix
+from network import Network
+from logic import (build_graph, dijkstra_with_paths, reconstruct_path, group_demands_by_source,
+                   add_tree_flows, add_dense_flows)
+from dense import DenseGraph, dense_engine_suits
+from paths import ShortestPathsView
+from json_stream import ProgressCallback
+
+
+class RoutingCache:
+    """
+    Кэш маршрутизации для приложения.
+
+    Деревья кратчайших путей (результаты dijkstra_with_paths) хранятся по
+    источникам и переиспользуются, пока не изменится топология. Каждое
+    добавление, изменение или удаление узла/соединения должно вызывать
+    invalidate(), которое увеличивает topology_version.
+
+    Изменения матрицы нагрузки маршруты не сбрасывают: пересчитываются только
+    потоки (по TrafficMatrix.version и размеру пакета).
+
+    Для правки одного соединения вместо invalidate() можно вызвать
+    update_pair(): при удешевлении/добавлении канала деревья чинятся локально,
+    при удорожании/удалении пересчитываются только источники, чьё дерево
+    проходило через этот канал. Новый узел добавляется через node_added().
+    Починенное дерево — это новые словари: деревья, уже выданные через
+    shortest_paths() или tree(), не меняются и остаются снимком.
+
+    Для небольших плотных сетей (dense_engine_suits) пути и потоки считаются
+    на матрицах (DenseGraph) с теми же путями; его точечно не чинят, а пересчитывают.
+    """
+    def __init__(self):
+        self.topology_version = 0
+        self._built_version = None
+        self._graph = {}
+        self._conn_map = {}
+        self._trees = {}      # {src_name: (distances, predecessors)}
+        self._dense = None    # DenseGraph, если сеть плотная
+        self._flows = None
+        self._flows_key = None
+
+    def invalidate(self):
+        """Топология изменилась: кэшированные деревья и потоки больше не действительны."""
+        self.topology_version += 1
+
+    def _commit_edit(self) -> bool:
+        """
+        Увеличивает версию топологии после точечной правки.
+        Возвращает True, если кэш был актуален и его можно чинить на месте.
+        """
+        in_sync = self._built_version == self.topology_version and self._dense is None
+        self.topology_version += 1
+        self._flows = None
+        self._flows_key = None
+        if in_sync:
+            self._built_version = self.topology_version
+        return in_sync
+
+    def node_added(self, name: str):
+        """Добавлен изолированный узел: во всех деревьях он просто недостижим."""
+        if not self._commit_edit():
+            return
+        self._graph[name] = {}
+        # Новые ключи не меняют ни одного пути в уже выданных деревьях
+        for dist_map, pred_map in self._trees.values():
+            dist_map[name] = float('inf')
+            pred_map[name] = None
+
+    def update_pair(self, connections: Union[Network, List[Connection]], n1: str, n2: str):
+        """
+        Соединения между узлами n1 и n2 изменились (добавлено, удалено,
+        сменился кабель или длина). Как и в build_graph, действует последнее
+        соединение пары в списке connections. Если передана Network, это
+        соединение берётся из её индекса пар, без просмотра списка.
+        """
+        in_sync = self._commit_edit()
+        if not in_sync:
+            return
+        if n1 not in self._graph or n2 not in self._graph:
+            self.invalidate()
+            return
+
+        key = frozenset([n1, n2])
+        new_conn = None
+        if isinstance(connections, Network):
+            new_conn = connections.connection_between(n1, n2)
+        else:
+            for conn in reversed(connections):
+                if frozenset([conn.node1.name, conn.node2.name]) == key:
+                    new_conn = conn
+                    break
+
+        old_weight = self._graph[n1].get(n2)
+        if new_conn is None:
+            new_weight = None
+            self._graph[n1].pop(n2, None)
+            self._graph[n2].pop(n1, None)
+            self._conn_map.pop(key, None)
+        else:
+            new_weight = new_conn.connection_cost
+            self._graph[n1][n2] = new_weight
+            self._graph[n2][n1] = new_weight
+            self._conn_map[key] = new_conn
+
+        if new_weight == old_weight:
+            return
+        if new_weight is not None and (old_weight is None or new_weight < old_weight):
+            for src, (dist_map, pred_map) in list(self._trees.items()):
+                repaired = self._repair_decrease(dist_map, pred_map, n1, n2, new_weight)
+                if repaired is not None:
+                    self._trees[src] = repaired
+        else:
+            # Канал подорожал или исчез: задеты только деревья, где он был ребром
+            stale = [src for src, (dist_map, pred_map) in self._trees.items()
+                     if pred_map.get(n2) == n1 or pred_map.get(n1) == n2]
+            for src in stale:
+                del self._trees[src]
+
+    def _repair_decrease(self, dist_map: Dict[str, float], pred_map: Dict[str, Optional[str]],
+                         n1: str, n2: str, weight: float
+                         ) -> Optional[Tuple[Dict[str, float], Dict[str, Optional[str]]]]:
+        """
+        Починка дерева после уменьшения веса ребра n1-n2 (Ramalingam–Reps):
+        Дейкстра запускается только от узлов, расстояние до которых уменьшилось.
+        Возвращает новое дерево (копии словарей) или None, если дерево не изменилось;
+        переданные словари не меняются.
+        """
+        seeds = []
+        for a, b in ((n1, n2), (n2, n1)):
+            dist = dist_map[a] + weight
+            if dist < dist_map[b]:
+                seeds.append((a, b, dist))
+        if not seeds:
+            return None
+
+        dist_map = dict(dist_map)
+        pred_map = dict(pred_map)
+        queue = []
+        for a, b, dist in seeds:
+            if dist < dist_map[b]:
+                dist_map[b] = dist
+                pred_map[b] = a
+                heapq.heappush(queue, (dist, b))
+
+        graph = self._graph
+        while queue:
+            cur_dist, node = heapq.heappop(queue)
+            if cur_dist > dist_map[node]:
+                continue
+            for neighbor, w in graph[node].items():
+                dist = cur_dist + w
+                if dist < dist_map[neighbor]:
+                    dist_map[neighbor] = dist
+                    pred_map[neighbor] = node
+                    heapq.heappush(queue, (dist, neighbor))
+        return dist_map, pred_map
+
+    def _sync(self, nodes: List[Node], connections: List[Connection]):
+        """Перестраивает граф, если с момента последнего расчёта менялась топология."""
+        if self._built_version == self.topology_version:
+            return
+        self._graph = build_graph(nodes, connections)
+        self._conn_map = {}
+        for conn in connections:
+            self._conn_map[frozenset([conn.node1.name, conn.node2.name])] = conn
+        self._trees = {}
+        self._dense = DenseGraph.from_network(nodes, connections) if dense_engine_suits(nodes, connections) else None
+        self._flows = None
+        self._flows_key = None
+        self._built_version = self.topology_version
+
+    def tree(self, nodes: List[Node], connections: List[Connection], src: str) -> Tuple[Dict[str, float], Dict[str, Optional[str]]]:
+        """Возвращает (distances, predecessors) для источника src, считая Дейкстру только при промахе."""
+        self._sync(nodes, connections)
+        tree = self._trees.get(src)
+        if tree is None:
+            tree = dijkstra_with_paths(self._graph, src)
+            self._trees[src] = tree
+        return tree
+
+    def shortest_paths(self, nodes: List[Node], connections: List[Connection],
+                       progress: Optional[ProgressCallback] = None) -> ShortestPathsView:
+        """
+        То же, что calculate_all_shortest_paths, но на закэшированных деревьях.
+        Пути восстанавливаются при обращении к результату.
+        progress(готово, всего) вызывается по мере расчёта деревьев.
+        """
+        self._sync(nodes, connections)
+        if self._dense is not None:
+            if self._dense.pred is None:
+                self._dense.solve(progress)
+            return self._dense.all_paths()
+        trees = {}
+        for i, node in enumerate(nodes):
+            trees[node.name] = self.tree(nodes, connections, node.name)
+            if progress is not None:
+                progress(i + 1, len(nodes))
+
+        def path_fn(src: str, dst: str) -> List[str]:
+            return reconstruct_path(trees[src][1], src, dst)
+
+        def cost_fn(src: str, dst: str) -> float:
+            return trees[src][0][dst]
+
+        return ShortestPathsView([node.name for node in nodes], path_fn, cost_fn=cost_fn)
+
+    def flows(self, nodes: List[Node], connections: List[Connection],
+              traffic_matrix: TrafficMatrix, global_packet_size: float,
+              progress: Optional[ProgressCallback] = None) -> Dict[Connection, Dict[str, float]]:
+        """
+        То же, что compute_flows_by_demand. Результат кэшируется до изменения
+        топологии, матрицы нагрузки или размера пакета.
+        progress(готово, всего) вызывается по мере обхода источников.
+        """
+        self._sync(nodes, connections)
+        key = (id(traffic_matrix), traffic_matrix.version, global_packet_size)
+        if self._flows is not None and self._flows_key == key:
+            return self._flows
+
+        result = {}
+        for conn in connections:
+            result[conn] = {"flow": 0.0, "packet": 0.0}
+        if self._dense is not None:
+            if self._dense.pred is None:
+                self._dense.solve(progress)
+            add_dense_flows(self._dense, connections, traffic_matrix, global_packet_size, result)
+            self._flows = result
+            self._flows_key = key
+            return result
+        by_source = group_demands_by_source(traffic_matrix)
+        for i, (src, demands) in enumerate(by_source.items()):
+            if progress is not None:
+                progress(i, len(by_source))
+            if src not in self._graph:
+                continue
+            dist_map, pred_map = self.tree(nodes, connections, src)
+            add_tree_flows(pred_map, src, demands, self._conn_map, result, global_packet_size)
+
+        self._flows = result
+        self._flows_key = key
+        return result
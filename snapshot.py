@@ -0,0 +1,353 @@
+"""
+Компактный бинарный снимок сети и матрицы нагрузки (альтернатива JSON).
+
+Формат (little-endian):
+  заголовок   MAGIC, версия (u32), число секций (u32);
+  оглавление  для каждой секции: имя (16 байт), тип элементов (array typecode),
+              смещение и число элементов (u64);
+  секции      выровненные по 8 байт плотные массивы.
+
+Имена хранятся таблицами строк (смещения 'q' + байты UTF-8), ссылки между
+объектами — целочисленными номерами, координаты, стоимости и нагрузки — массивами
+float64 (или int64, если все значения целые и укладываются в int64). Файл
+открывается через mmap, массивы читаются как memoryview без разбора и копирования.
+
+Команды:
+    python snapshot.py to-binary network.json network.gvms
+    python snapshot.py to-json network.gvms network.json
+    python snapshot.py check firstSave.json     # проверка JSON -> снимок -> JSON
+"""
+import mmap
+import struct
+import sys
+from array import array
+from typing import Dict, List, Optional
+
+from models import Node, Connection, TrafficMatrix, Router, Cable, NodeTable, ConnectionTable
+from profiling import profiled
+
+MAGIC = b"GVMSNAP\0"
+VERSION = 1
+SNAPSHOT_EXTENSION = ".gvms"
+
+_HEADER = struct.Struct("<8sII")
+_ENTRY = struct.Struct("<16sc7xQQ")
+_ALIGN = 8
+
+
+def _numbers(values) -> array:
+    """int64, если все значения целые (как в JSON) и помещаются в него, иначе float64."""
+    values = list(values)
+    if all(type(v) is int for v in values):
+        try:
+            return array('q', values)
+        except OverflowError:  # целые вне int64 сохраняются как float64
+            pass
+    return array('d', values)
+
+
+def _string_table(strings: List[str]):
+    """Таблица строк: (смещения 'q' длиной n + 1, байты UTF-8)."""
+    offsets = array('q', [0])
+    blob = bytearray()
+    for s in strings:
+        blob += s.encode("utf-8")
+        offsets.append(len(blob))
+    return offsets, array('B', blob)
+
+
+def _first_index(names: List[str]) -> Dict[str, int]:
+    """Имя -> номер первого объекта с таким именем (как next(...) при загрузке JSON)."""
+    index = {}
+    for i, name in enumerate(names):
+        index.setdefault(name, i)
+    return index
+
+
+@profiled("save_snapshot")
+def save_snapshot(filename, routers: List[Router], nodes: List[Node],
+                  connections: List[Connection], traffic_matrix: TrafficMatrix,
+                  cables: List[Cable]):
+    """Сохраняет те же данные, что save_data_to_file, в бинарный снимок."""
+    router_names = [r.model_name for r in routers]
+    cable_names = [c.cable_name for c in cables]
+    node_names = [n.name for n in nodes]
+    router_index = _first_index(router_names)
+    cable_index = _first_index(cable_names)
+
+    # Матрица нагрузки может ссылаться на имена, которых нет среди узлов:
+    # они дописываются в конец таблицы имён узлов
+    names = list(node_names)
+    name_index = _first_index(names)
+    for src, dst in traffic_matrix.demands:
+        for name in (src, dst):
+            if name not in name_index:
+                name_index[name] = len(names)
+                names.append(name)
+
+    sections = {}
+    sections["router.name.off"], sections["router.name.str"] = _string_table(router_names)
+    sections["router.capacity"] = _numbers(r.capacity for r in routers)
+    sections["router.cost"] = _numbers(r.cost for r in routers)
+
+    sections["cable.name.off"], sections["cable.name.str"] = _string_table(cable_names)
+    sections["cable.cost"] = _numbers(c.cost_per_unit for c in cables)
+    sections["cable.capacity"] = _numbers(c.capacity for c in cables)
+
+    sections["node.name.off"], sections["node.name.str"] = _string_table(names)
+    sections["node.count"] = array('q', [len(nodes)])
+    sections["node.x"] = _numbers(n.x for n in nodes)
+    sections["node.y"] = _numbers(n.y for n in nodes)
+    sections["node.router"] = array('i', (router_index.get(n.router.model_name, -1) if n.router else -1
+                                          for n in nodes))
+
+    sections["conn.name.off"], sections["conn.name.str"] = _string_table([c.name for c in connections])
+    sections["conn.node1"] = array('i', (name_index.get(c.node1.name, -1) for c in connections))
+    sections["conn.node2"] = array('i', (name_index.get(c.node2.name, -1) for c in connections))
+    sections["conn.cable"] = array('i', (cable_index.get(c.cable.cable_name, -1) for c in connections))
+    sections["conn.distance"] = _numbers(c.distance for c in connections)
+    sections["conn.cost"] = _numbers(c.connection_cost for c in connections)
+
+    demands = traffic_matrix.demands
+    sections["tm.src"] = array('i', (name_index[src] for src, dst in demands))
+    sections["tm.dst"] = array('i', (name_index[dst] for src, dst in demands))
+    sections["tm.traffic"] = _numbers(demands.values())
+
+    if sys.byteorder != "little":
+        for arr in sections.values():
+            arr.byteswap()
+
+    offset = _HEADER.size + _ENTRY.size * len(sections)
+    entries = []
+    for name, arr in sections.items():
+        offset = (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+        entries.append((name, arr, offset))
+        offset += len(arr) * arr.itemsize
+
+    with open(filename, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(sections)))
+        for name, arr, off in entries:
+            f.write(_ENTRY.pack(name.encode("ascii"), arr.typecode.encode("ascii"), off, len(arr)))
+        for name, arr, off in entries:
+            f.write(b"\0" * (off - f.tell()))
+            arr.tofile(f)
+
+
+class Snapshot:
+    """
+    Открытый снимок: файл отображён в память, секции доступны как memoryview
+    без разбора. Закрывается через close() или with.
+    """
+    def __init__(self, filename):
+        self._file = open(filename, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # пустой файл
+            self._file.close()
+            raise ValueError(f"'{filename}' не является снимком сети.")
+        self._view = memoryview(self._mm)
+        self._sections = {}
+        try:
+            magic, version, count = _HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC:
+                raise ValueError(f"'{filename}' не является снимком сети.")
+            if version != VERSION:
+                raise ValueError(f"Неподдерживаемая версия снимка: {version}.")
+            for i in range(count):
+                name, typecode, off, length = _ENTRY.unpack_from(self._mm, _HEADER.size + i * _ENTRY.size)
+                self._sections[name.rstrip(b"\0").decode("ascii")] = (typecode.decode("ascii"), off, length)
+        except (struct.error, ValueError):
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+            self._mm.close()
+            self._file.close()
+
+    def array(self, name: str):
+        """Секция как типизированный memoryview (или копия array на big-endian машинах)."""
+        typecode, off, length = self._sections[name]
+        size = array(typecode).itemsize
+        raw = self._view[off:off + length * size]
+        if sys.byteorder != "little":
+            arr = array(typecode, raw.tobytes())
+            arr.byteswap()
+            return arr
+        return raw.cast(typecode)
+
+    def strings(self, table: str) -> List[str]:
+        """Все строки таблицы (node.name, conn.name, ...)."""
+        offsets = self.array(table + ".off")
+        blob = self.array(table + ".str")
+        return [bytes(blob[offsets[i]:offsets[i + 1]]).decode("utf-8") for i in range(len(offsets) - 1)]
+
+    def string(self, table: str, i: int) -> str:
+        """Одна строка таблицы без разбора остальных."""
+        offsets = self.array(table + ".off")
+        return bytes(self.array(table + ".str")[offsets[i]:offsets[i + 1]]).decode("utf-8")
+
+    def count(self, name: str) -> int:
+        """Число элементов секции."""
+        return self._sections[name][2]
+
+    def to_network(self, compact: bool = False):
+        """
+        Создаёт объекты модели; результат в формате load_data_from_file.
+        compact=True — узлы и соединения как NodeTable/ConnectionTable: столбцы
+        копируются из секций целиком, объекты на каждую строку не создаются.
+        """
+        routers = [Router(name, cap, cost) for name, cap, cost in
+                   zip(self.strings("router.name"), self.array("router.capacity").tolist(),
+                       self.array("router.cost").tolist())]
+        cables = [Cable(name, cost, cap) for name, cost, cap in
+                  zip(self.strings("cable.name"), self.array("cable.cost").tolist(),
+                      self.array("cable.capacity").tolist())]
+
+        names = self.strings("node.name")
+        n_nodes = self.array("node.count")[0]
+        if compact:
+            nodes, connections = self._tables(names[:n_nodes], n_nodes, routers, cables)
+        else:
+            nodes, connections = self._objects(names[:n_nodes], n_nodes, routers, cables)
+
+        traffic_matrix = TrafficMatrix()
+        for src, dst, traffic in zip(self.array("tm.src").tolist(), self.array("tm.dst").tolist(),
+                                     self.array("tm.traffic").tolist()):
+            traffic_matrix.set_demand(names[src], names[dst], traffic)
+
+        return {
+            "routers": routers,
+            "nodes": nodes,
+            "connections": connections,
+            "traffic_matrix": traffic_matrix,
+            "cables": cables
+        }
+
+    def _tables(self, names: List[str], n_nodes: int, routers: List[Router], cables: List[Cable]):
+        nodes = NodeTable(routers)
+        nodes.names = names
+        nodes.x = array('d', self.array("node.x").tolist())
+        nodes.y = array('d', self.array("node.y").tolist())
+        nodes.router_ids = array('i', self.array("node.router").tolist())
+        for i, name in enumerate(names):
+            nodes.index.setdefault(name, i)
+
+        connections = ConnectionTable(nodes, cables)
+        connections.names = self.strings("conn.name")
+        connections.node1 = array('i', self.array("conn.node1").tolist())
+        connections.node2 = array('i', self.array("conn.node2").tolist())
+        connections.cable_ids = array('i', self.array("conn.cable").tolist())
+        connections.distance = array('d', self.array("conn.distance").tolist())
+        connections.cost = array('d', self.array("conn.cost").tolist())
+        for conn_name, a, b, k in zip(connections.names, connections.node1, connections.node2,
+                                      connections.cable_ids):
+            if not (0 <= a < n_nodes) or not (0 <= b < n_nodes) or k == -1:
+                raise ValueError(f"Connection '{conn_name}' refers to non-existent nodes or cable.")
+        return nodes, connections
+
+    def _objects(self, names: List[str], n_nodes: int, routers: List[Router], cables: List[Cable]):
+        nodes = [Node(x, y, name, routers[r] if r != -1 else None) for x, y, name, r in
+                 zip(self.array("node.x").tolist(), self.array("node.y").tolist(),
+                     names, self.array("node.router").tolist())]
+
+        connections = []
+        for conn_name, a, b, k, distance, cost in zip(self.strings("conn.name"),
+                                                      self.array("conn.node1").tolist(),
+                                                      self.array("conn.node2").tolist(),
+                                                      self.array("conn.cable").tolist(),
+                                                      self.array("conn.distance").tolist(),
+                                                      self.array("conn.cost").tolist()):
+            if not (0 <= a < n_nodes) or not (0 <= b < n_nodes) or k == -1:
+                raise ValueError(f"Connection '{conn_name}' refers to non-existent nodes or cable.")
+            conn = Connection(conn_name, nodes[a], nodes[b], cables[k])
+            conn.distance = distance
+            conn.connection_cost = cost
+            connections.append(conn)
+        return nodes, connections
+
+
+@profiled("load_snapshot")
+def load_snapshot(filename, compact: bool = False):
+    """Загружает снимок; результат в формате load_data_from_file (compact — см. Snapshot.to_network)."""
+    with Snapshot(filename) as snap:
+        return snap.to_network(compact)
+
+
+def _check_round_trip(json_filename) -> bool:
+    """JSON -> снимок -> JSON: данные должны совпасть с исходным файлом."""
+    import json
+    import os
+    import tempfile
+    from logic import load_data_from_file, save_data_to_file
+
+    with open(json_filename, "r", encoding="utf-8") as f:
+        original = json.load(f)
+    tmp_dir = tempfile.mkdtemp()
+    bin_path = os.path.join(tmp_dir, "snapshot.gvms")
+    json_path = os.path.join(tmp_dir, "restored.json")
+    try:
+        data = load_data_from_file(json_filename)
+        save_snapshot(bin_path, data["routers"], data["nodes"], data["connections"],
+                      data["traffic_matrix"], data["cables"])
+        restored = load_snapshot(bin_path)
+        save_data_to_file(json_path, restored["routers"], restored["nodes"], restored["connections"],
+                          restored["traffic_matrix"], restored["cables"])
+        with open(json_path, "r", encoding="utf-8") as f:
+            result = json.load(f)
+        json_size = os.path.getsize(json_filename)
+        bin_size = os.path.getsize(bin_path)
+    finally:
+        for path in (bin_path, json_path):
+            if os.path.exists(path):
+                os.remove(path)
+        os.rmdir(tmp_dir)
+
+    ok = True
+    for key in ("routers", "cables", "nodes", "connections", "traffic_matrix"):
+        if original.get(key, []) != result.get(key, []):
+            print(f"Секция '{key}' после преобразования отличается.")
+            ok = False
+    print(f"JSON: {json_size} байт, снимок: {bin_size} байт. Совпадение: {'да' if ok else 'нет'}.")
+    return ok
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    from logic import load_data_from_file, save_data_to_file
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("to-binary", help="JSON -> бинарный снимок")
+    p.add_argument("source")
+    p.add_argument("target")
+    p = sub.add_parser("to-json", help="бинарный снимок -> JSON")
+    p.add_argument("source")
+    p.add_argument("target")
+    p = sub.add_parser("check", help="проверка преобразования JSON -> снимок -> JSON")
+    p.add_argument("source")
+    args = parser.parse_args(argv)
+
+    if args.command == "check":
+        return 0 if _check_round_trip(args.source) else 1
+    if args.command == "to-binary":
+        data = load_data_from_file(args.source)
+        save_snapshot(args.target, data["routers"], data["nodes"], data["connections"],
+                      data["traffic_matrix"], data["cables"])
+    else:
+        data = load_snapshot(args.source)
+        save_data_to_file(args.target, data["routers"], data["nodes"], data["connections"],
+                          data["traffic_matrix"], data["cables"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+import math
+from typing import Dict, Hashable, Iterator, Set, Tuple
+
+# Ячейка равномерной сетки: (номер столбца, номер строки)
+Cell = Tuple[int, int]
+
+
+class GridIndex:
+    """
+    Равномерная сетка над точками: ячейка -> множество объектов.
+
+    Вставка, удаление и перемещение — O(1); запрос прямоугольника обходит
+    только ячейки, которые он покрывает (или только занятые ячейки, если их
+    меньше — это важно при сильном отдалении, когда окно покрывает всю сеть).
+    """
+    def __init__(self, cell_size: float):
+        if cell_size <= 0:
+            raise ValueError("Размер ячейки должен быть положительным.")
+        self.cell_size = float(cell_size)
+        self._cells: Dict[Cell, Set[Hashable]] = {}
+        self._where: Dict[Hashable, Tuple[Cell, float, float]] = {}
+
+    def _cell(self, x: float, y: float) -> Cell:
+        size = self.cell_size
+        return (math.floor(x / size), math.floor(y / size))
+
+    def insert(self, item: Hashable, x: float, y: float):
+        if item in self._where:
+            self.remove(item)
+        cell = self._cell(x, y)
+        self._cells.setdefault(cell, set()).add(item)
+        self._where[item] = (cell, x, y)
+
+    def remove(self, item: Hashable):
+        entry = self._where.pop(item, None)
+        if entry is None:
+            return
+        cell = entry[0]
+        bucket = self._cells[cell]
+        bucket.discard(item)
+        if not bucket:
+            del self._cells[cell]
+
+    def move(self, item: Hashable, x: float, y: float):
+        """Перемещает объект; ячейки меняются, только если он пересёк их границу."""
+        entry = self._where.get(item)
+        cell = self._cell(x, y)
+        if entry is not None and entry[0] == cell:
+            self._where[item] = (cell, x, y)
+            return
+        self.insert(item, x, y)
+
+    def position(self, item: Hashable) -> Tuple[float, float]:
+        _, x, y = self._where[item]
+        return x, y
+
+    def query(self, x0: float, y0: float, x1: float, y1: float) -> Iterator[Hashable]:
+        """Объекты, точки которых лежат в прямоугольнике [x0, x1] × [y0, y1]."""
+        cx0, cy0 = self._cell(x0, y0)
+        cx1, cy1 = self._cell(x1, y1)
+        where = self._where
+        n_covered = (cx1 - cx0 + 1) * (cy1 - cy0 + 1)
+        if n_covered > len(self._cells):
+            cells = (bucket for (cx, cy), bucket in self._cells.items()
+                     if cx0 <= cx <= cx1 and cy0 <= cy <= cy1)
+        else:
+            cells = (self._cells[(cx, cy)]
+                     for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1)
+                     if (cx, cy) in self._cells)
+        for bucket in cells:
+            for item in bucket:
+                _, x, y = where[item]
+                if x0 <= x <= x1 and y0 <= y <= y1:
+                    yield item
+
+    def __len__(self):
+        return len(self._where)
+
+    def __contains__(self, item):
+        return item in self._where
+
+    def __iter__(self):
+        return iter(self._where)
+
+
+class SegmentIndex:
+    """
+    Индекс отрезков («рыхлая» сетка): отрезок хранится по своей середине
+    в сетке уровня, соответствующего его длине. На уровне k половина размаха
+    отрезка не больше base_size * 2**k, поэтому при запросе прямоугольник
+    этого уровня достаточно расширить на ту же величину. Кандидаты затем
+    проверяются на пересечение описанных прямоугольников.
+    """
+    def __init__(self, base_size: float):
+        if base_size <= 0:
+            raise ValueError("Размер ячейки должен быть положительным.")
+        self.base_size = float(base_size)
+        self._levels: Dict[int, GridIndex] = {}
+        self._boxes: Dict[Hashable, Tuple[int, float, float, float, float]] = {}
+
+    def _level(self, half_extent: float) -> int:
+        if half_extent <= self.base_size:
+            return 0
+        return math.ceil(math.log2(half_extent / self.base_size))
+
+    def insert(self, item: Hashable, x1: float, y1: float, x2: float, y2: float):
+        if item in self._boxes:
+            self.remove(item)
+        bx0, bx1 = min(x1, x2), max(x1, x2)
+        by0, by1 = min(y1, y2), max(y1, y2)
+        level = self._level(max(bx1 - bx0, by1 - by0) / 2)
+        grid = self._levels.get(level)
+        if grid is None:
+            grid = self._levels[level] = GridIndex(self.base_size * 2 ** level)
+        grid.insert(item, (bx0 + bx1) / 2, (by0 + by1) / 2)
+        self._boxes[item] = (level, bx0, by0, bx1, by1)
+
+    def remove(self, item: Hashable):
+        entry = self._boxes.pop(item, None)
+        if entry is None:
+            return
+        grid = self._levels[entry[0]]
+        grid.remove(item)
+        if not len(grid):
+            del self._levels[entry[0]]
+
+    def query(self, x0: float, y0: float, x1: float, y1: float) -> Iterator[Hashable]:
+        """Отрезки, описанный прямоугольник которых пересекает [x0, x1] × [y0, y1]."""
+        boxes = self._boxes
+        for level, grid in list(self._levels.items()):
+            pad = self.base_size * 2 ** level
+            for item in grid.query(x0 - pad, y0 - pad, x1 + pad, y1 + pad):
+                _, bx0, by0, bx1, by1 = boxes[item]
+                if bx0 <= x1 and bx1 >= x0 and by0 <= y1 and by1 >= y0:
+                    yield item
+
+    def __len__(self):
+        return len(self._boxes)
+
+    def __contains__(self, item):
+        return item in self._boxes
@@ -0,0 +1,128 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Optional
+
+
+class TaskCancelled(Exception):
+    """Задача отменена: бросается из TaskContext.progress/check внутри расчёта."""
+
+
+class TaskContext:
+    """
+    Передаётся функции фоновой задачи.
+
+    progress(готово, всего) подходит как ProgressCallback для функций logic
+    и RoutingCache: он пересылает прогресс в поток Tk (не чаще MIN_INTERVAL)
+    и бросает TaskCancelled, если пользователь нажал «Отмена» — так расчёт
+    останавливается в ближайшей точке, где сообщает о прогрессе.
+    """
+    # Минимальный интервал между сообщениями о прогрессе, секунд
+    MIN_INTERVAL = 0.05
+
+    def __init__(self, messages: queue.Queue):
+        self._messages = messages
+        self._cancel = threading.Event()
+        self._last_report = 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def check(self):
+        """Бросает TaskCancelled, если задачу отменили."""
+        if self._cancel.is_set():
+            raise TaskCancelled()
+
+    def progress(self, done: int, total: int):
+        self.check()
+        now = time.monotonic()
+        if now - self._last_report >= self.MIN_INTERVAL or done >= total:
+            self._last_report = now
+            self._messages.put(("progress", done, total))
+
+    def status(self, text: str):
+        """Текст текущего этапа (например, «Загрузка файла…»)."""
+        self._messages.put(("status", text))
+
+
+class BackgroundTask:
+    """
+    Выполняет fn(context) в рабочем потоке, не блокируя главный цикл Tk.
+
+    Рабочий поток не трогает виджеты: всё, что он сообщает (прогресс, этап,
+    результат, ошибка), кладётся в очередь, а поток Tk забирает сообщения,
+    опрашивая её через widget.after каждые POLL_MS. Все обратные вызовы
+    (on_done, on_error, on_cancel, on_progress, on_status) выполняются в
+    потоке Tk.
+    """
+    POLL_MS = 50
+
+    def __init__(self, widget, fn: Callable[[TaskContext], Any],
+                 on_done: Callable[[Any], None],
+                 on_error: Optional[Callable[[BaseException], None]] = None,
+                 on_cancel: Optional[Callable[[], None]] = None,
+                 on_progress: Optional[Callable[[int, int], None]] = None,
+                 on_status: Optional[Callable[[str], None]] = None):
+        self.widget = widget
+        self.fn = fn
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_cancel = on_cancel
+        self.on_progress = on_progress
+        self.on_status = on_status
+        self._messages = queue.Queue()
+        self.context = TaskContext(self._messages)
+        self._thread = None
+        self.finished = False
+
+    def start(self) -> 'BackgroundTask':
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self.widget.after(self.POLL_MS, self._poll)
+        return self
+
+    def cancel(self):
+        """Просит задачу остановиться; on_cancel будет вызван, когда поток завершится."""
+        self.context.cancel()
+
+    def _run(self):
+        try:
+            result = self.fn(self.context)
+            # Отмена могла прийти уже после последней проверки
+            self.context.check()
+        except TaskCancelled:
+            self._messages.put(("cancelled",))
+        except BaseException as e:
+            self._messages.put(("error", e))
+        else:
+            self._messages.put(("done", result))
+
+    def _poll(self):
+        while True:
+            try:
+                message = self._messages.get_nowait()
+            except queue.Empty:
+                break
+            kind = message[0]
+            if kind == "progress":
+                if self.on_progress is not None:
+                    self.on_progress(message[1], message[2])
+            elif kind == "status":
+                if self.on_status is not None:
+                    self.on_status(message[1])
+            else:
+                self.finished = True
+                if kind == "done":
+                    self.on_done(message[1])
+                elif kind == "error":
+                    if self.on_error is not None:
+                        self.on_error(message[1])
+                elif kind == "cancelled":
+                    if self.on_cancel is not None:
+                        self.on_cancel()
+                return
+        self.widget.after(self.POLL_MS, self._poll)
@@ -0,0 +1,550 @@
+"""
+Пакетное построение топологии по координатам узлов.
+
+Вместо перебора пар с созданием Connection на каждую (и своим sqrt) рёбра
+сначала считаются целиком — номера концов i < j и длины — в EdgeList, а уже
+потом одним проходом превращаются в соединения: make_connections() — список
+Connection для GUI, append_connections() — столбцы ConnectionTable.
+
+Способы (topology_edges, method):
+  complete — все пары; длины — одним векторным расчётом NumPy (O(n²) памяти,
+             разумно до нескольких тысяч узлов);
+  knn      — каждый узел соединяется с k ближайшими (граф симметризуется);
+  radius   — все пары не дальше radius;
+  delaunay — рёбра триангуляции Делоне (планарный граф, ≤ 3n − 6 рёбер);
+  gabriel  — подграф Делоне: ребро остаётся, если в круге на нём как на
+             диаметре (с границей) нет других узлов.
+Разреженные способы работают за ~O(n log n) и годятся для 100k узлов. Если
+установлен SciPy, используются cKDTree и Delaunay из scipy.spatial, иначе —
+равномерная сетка (spatial.GridIndex) и собственная инкрементная триангуляция
+с точными предикатами.
+"""
+import math
+from array import array
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from models import Cable, Connection, NodeTable, ConnectionTable
+from spatial import GridIndex
+from profiling import profiled
+
+try:
+    import numpy as np
+except ImportError:  # NumPy необязателен, без него работаем на array
+    np = None
+
+try:
+    from scipy.spatial import cKDTree, Delaunay
+except ImportError:  # SciPy необязателен: есть запасные реализации на сетке
+    cKDTree = Delaunay = None
+
+METHODS = ("complete", "knn", "radius", "delaunay", "gabriel")
+DEFAULT_K = 6
+
+
+class EdgeList:
+    """
+    Рёбра топологии: k-е ребро соединяет узлы с номерами i[k] < j[k] и имеет
+    длину distance[k]. Рёбра упорядочены по (i, j) и не повторяются.
+    Массивы — NumPy, если он установлен, иначе array('i')/array('d').
+    """
+    __slots__ = ("i", "j", "distance")
+
+    def __init__(self, i, j, distance):
+        self.i = i
+        self.j = j
+        self.distance = distance
+
+    def __len__(self):
+        return len(self.i)
+
+    def pairs(self) -> List[Tuple[int, int]]:
+        return list(zip(self.i.tolist(), self.j.tolist()))
+
+    def exclude(self, pairs: Iterable[Tuple[int, int]]) -> 'EdgeList':
+        """Рёбра без пар pairs (порядок концов в паре не важен)."""
+        skip = {(a, b) if a < b else (b, a) for a, b in pairs}
+        if not skip:
+            return self
+        if np is not None:
+            n = int(max(self.j.max(initial=0), max(b for _, b in skip))) + 1
+            keys = self.i.astype(np.int64) * n + self.j
+            drop = np.fromiter((a * n + b for a, b in skip), dtype=np.int64, count=len(skip))
+            keep = ~np.isin(keys, drop)
+            return EdgeList(self.i[keep], self.j[keep], self.distance[keep])
+        keep = [k for k, pair in enumerate(zip(self.i, self.j)) if pair not in skip]
+        return EdgeList(array('i', (self.i[k] for k in keep)), array('i', (self.j[k] for k in keep)),
+                        array('d', (self.distance[k] for k in keep)))
+
+    def __repr__(self):
+        return f"EdgeList({len(self)} edges)"
+
+
+def node_coordinates(nodes) -> Tuple[Sequence[float], Sequence[float]]:
+    """Координаты узлов (список Node или NodeTable) — массивы NumPy или array('d')."""
+    if isinstance(nodes, NodeTable):
+        xs, ys = nodes.x, nodes.y
+    else:
+        xs = array('d', (node.x for node in nodes))
+        ys = array('d', (node.y for node in nodes))
+    if np is not None:
+        # Копия, а не frombuffer: пока жив вид на буфер, array нельзя дополнять
+        return np.array(xs, dtype=float), np.array(ys, dtype=float)
+    return xs, ys
+
+
+def _edge_list(pairs: Iterable[Tuple[int, int]], xs, ys) -> EdgeList:
+    """EdgeList из пар номеров (повторы и порядок концов не важны); длины — как в Connection."""
+    unique = sorted({(a, b) if a < b else (b, a) for a, b in pairs if a != b})
+    if np is not None:
+        if unique:
+            ij = np.array(unique, dtype=np.int64)
+            i, j = ij[:, 0], ij[:, 1]
+        else:
+            i = j = np.zeros(0, dtype=np.int64)
+        return EdgeList(i, j, _distances(xs, ys, i, j))
+    i = array('i', (a for a, _ in unique))
+    j = array('i', (b for _, b in unique))
+    return EdgeList(i, j, _distances(xs, ys, i, j))
+
+
+def _edge_arrays(i, j, xs, ys) -> EdgeList:
+    """EdgeList из массивов NumPy концов (повторы и порядок концов не важны)."""
+    a = np.minimum(i, j).astype(np.int64)
+    b = np.maximum(i, j).astype(np.int64)
+    keep = a != b
+    a, b = a[keep], b[keep]
+    n = len(xs)
+    keys = np.unique(a * n + b)
+    i, j = keys // n, keys % n
+    return EdgeList(i, j, _distances(xs, ys, i, j))
+
+
+def _distances(xs, ys, i, j):
+    # Формула Connection._calc_distance (возведение в квадрат — умножением, отличие — в последнем разряде)
+    if np is not None:
+        dx = xs[j] - xs[i]
+        dy = ys[i] - ys[j]
+        return np.sqrt(dx * dx + dy * dy)
+    return array('d', (math.sqrt((xs[b] - xs[a]) ** 2 + (ys[a] - ys[b]) ** 2) for a, b in zip(i, j)))
+
+
+# --------------------------------------------------------------------------
+# Полный граф
+def complete_edges(xs, ys) -> EdgeList:
+    """Все пары узлов; с NumPy — одним векторным расчётом по верхнему треугольнику."""
+    n = len(xs)
+    if np is not None:
+        i, j = np.triu_indices(n, 1)
+        return EdgeList(i, j, _distances(xs, ys, i, j))
+    i = array('i')
+    j = array('i')
+    for a in range(n):
+        i.extend([a] * (n - a - 1))
+        j.extend(range(a + 1, n))
+    return EdgeList(i, j, _distances(xs, ys, i, j))
+
+
+# --------------------------------------------------------------------------
+# k ближайших соседей и радиус
+def knn_edges(xs, ys, k: int = DEFAULT_K) -> EdgeList:
+    """
+    Граф k ближайших соседей: каждый узел соединяется с k ближайшими к нему,
+    ребро появляется, если хотя бы один из концов выбрал другой.
+    """
+    n = len(xs)
+    k = min(k, n - 1)
+    if k <= 0:
+        return _edge_list((), xs, ys)
+    if cKDTree is not None:
+        points = np.column_stack((xs, ys))
+        _, idx = cKDTree(points).query(points, k=k + 1)
+        idx = idx.reshape(n, k + 1)
+        rows = np.arange(n)[:, None]
+        # Обычно сам узел — первый, но при совпадающих точках может оказаться дальше
+        others = idx != rows
+        others &= np.cumsum(others, axis=1) <= k
+        return _edge_arrays(np.broadcast_to(rows, idx.shape)[others], idx[others], xs, ys)
+
+    # В циклах — списки: обращение к элементу массива NumPy намного дороже
+    lx, ly = xs.tolist(), ys.tolist()
+    span = max(max(lx) - min(lx), max(ly) - min(ly))
+    if span == 0:
+        return _edge_list(((a, b) for a in range(n) for b in range(a + 1, min(n, a + k + 1))), xs, ys)
+    # Ячейка, в которую в среднем попадает ~k узлов; окно поиска удваивается,
+    # пока k-й сосед не окажется внутри него
+    cell = span * math.sqrt(k / n)
+    index = GridIndex(cell)
+    for a in range(n):
+        index.insert(a, lx[a], ly[a])
+    pairs = []
+    for a in range(n):
+        x, y = lx[a], ly[a]
+        h = cell
+        while True:
+            found = sorted(((lx[b] - x) ** 2 + (ly[b] - y) ** 2, b)
+                           for b in index.query(x - h, y - h, x + h, y + h) if b != a)
+            if (len(found) >= k and found[k - 1][0] <= h * h) or h >= span:
+                break
+            h *= 2
+        pairs.extend((a, b) for _, b in found[:k])
+    return _edge_list(pairs, xs, ys)
+
+
+def radius_edges(xs, ys, radius: float) -> EdgeList:
+    """Все пары узлов на расстоянии не больше radius."""
+    if radius <= 0:
+        raise ValueError("Радиус должен быть положительным.")
+    n = len(xs)
+    if cKDTree is not None and n:
+        ij = cKDTree(np.column_stack((xs, ys))).query_pairs(radius, output_type='ndarray')
+        return _edge_arrays(ij[:, 0], ij[:, 1], xs, ys)
+    lx, ly = xs.tolist(), ys.tolist()
+    index = GridIndex(radius)
+    for a in range(n):
+        index.insert(a, lx[a], ly[a])
+    r2 = radius * radius
+    pairs = []
+    for a in range(n):
+        x, y = lx[a], ly[a]
+        for b in index.query(x - radius, y - radius, x + radius, y + radius):
+            if b > a and (lx[b] - x) ** 2 + (ly[b] - y) ** 2 <= r2:
+                pairs.append((a, b))
+    return _edge_list(pairs, xs, ys)
+
+
+# --------------------------------------------------------------------------
+# Делоне и Габриэль
+def delaunay_edges(xs, ys) -> EdgeList:
+    """Рёбра триангуляции Делоне (совпадающие узлы соединяются с первым из них)."""
+    triangles, extra = _triangulate(xs, ys)
+    pairs = list(extra)
+    for a, b, c in triangles:
+        pairs += ((a, b), (b, c), (c, a))
+    return _edge_list(pairs, xs, ys)
+
+
+def gabriel_edges(xs, ys) -> EdgeList:
+    """
+    Граф Габриэля. Ребро Делоне (u, v) входит в него, если в круге с
+    диаметром uv (включая окружность) нет других узлов; для этого достаточно
+    проверить вершины двух прилегающих треугольников: угол при них должен
+    быть острым. Окружность включается, чтобы граф не зависел от выбора
+    триангуляции при точках на одной окружности (например, на решётке).
+    """
+    triangles, extra = _triangulate(xs, ys)
+    lx, ly = xs.tolist(), ys.tolist()
+    pairs = set(extra)
+    blocked = set()
+    for tri in triangles:
+        for w, u, v in ((tri[0], tri[1], tri[2]), (tri[1], tri[2], tri[0]), (tri[2], tri[0], tri[1])):
+            pair = (u, v) if u < v else (v, u)
+            pairs.add(pair)
+            if (lx[u] - lx[w]) * (lx[v] - lx[w]) + (ly[u] - ly[w]) * (ly[v] - ly[w]) <= 0:
+                blocked.add(pair)
+    return _edge_list(pairs - blocked, xs, ys)
+
+
+def _triangulate(xs, ys) -> Tuple[List[Tuple[int, int, int]], List[Tuple[int, int]]]:
+    """
+    Триангуляция Делоне узлов без повторов точек. Возвращает треугольники (номера узлов)
+    и дополнительные рёбра: у выпуклой оболочки и при точках на одной прямой
+    (их нет ни в одном треугольнике), а также от повторов точки к её первому узлу.
+    """
+    lx, ly = xs.tolist(), ys.tolist()
+    first = {}
+    unique: List[int] = []
+    extra: List[Tuple[int, int]] = []
+    for a, point in enumerate(zip(lx, ly)):
+        b = first.setdefault(point, a)
+        if b == a:
+            unique.append(a)
+        else:
+            extra.append((b, a))
+    if len(unique) < 2:
+        return [], extra
+    if Delaunay is not None and len(unique) >= 3:
+        try:
+            tri = Delaunay(np.column_stack((xs[unique], ys[unique])))
+        except RuntimeError:  # QhullError: все точки на одной прямой
+            pass
+        else:
+            ids = np.asarray(unique)[tri.simplices]
+            return [tuple(t) for t in ids.tolist()], extra
+    px = [lx[a] for a in unique]
+    py = [ly[a] for a in unique]
+    local_triangles, local_edges = _delaunay_python(px, py)
+    triangles = [(unique[a], unique[b], unique[c]) for a, b, c in local_triangles]
+    extra += ((unique[a], unique[b]) for a, b in local_edges)
+    return triangles, extra
+
+
+# Погрешность предикатов в float относительно суммы модулей слагаемых;
+# если определитель меньше этой границы, знак пересчитывается точно в целых числах
+_ORIENT_BOUND = 1e-15
+_INCIRCLE_BOUND = 1e-14
+
+
+def _exact(*values: float) -> List[int]:
+    """
+    Координаты, умноженные на общий знаменатель (степень двойки), — целые.
+    Знак предикатов от такого масштаба не меняется, а считать их можно точно.
+    """
+    ratios = [v.as_integer_ratio() for v in values]
+    den = max(d for _, d in ratios)
+    return [num * (den // d) for num, d in ratios]
+
+
+def _orient(px, py, a, b, c):
+    """> 0, если a, b, c обходятся против часовой стрелки; 0 — на одной прямой."""
+    left = (px[b] - px[a]) * (py[c] - py[a])
+    right = (py[b] - py[a]) * (px[c] - px[a])
+    det = left - right
+    if abs(det) > _ORIENT_BOUND * (abs(left) + abs(right)):
+        return det
+    ax, ay, bx, by, cx, cy = _exact(px[a], py[a], px[b], py[b], px[c], py[c])
+    return (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+
+
+def _incircle(px, py, a, b, c, d):
+    """> 0, если d строго внутри окружности треугольника a, b, c (обход против часовой)."""
+    adx, ady = px[a] - px[d], py[a] - py[d]
+    bdx, bdy = px[b] - px[d], py[b] - py[d]
+    cdx, cdy = px[c] - px[d], py[c] - py[d]
+    alift = adx * adx + ady * ady
+    blift = bdx * bdx + bdy * bdy
+    clift = cdx * cdx + cdy * cdy
+    det = (alift * (bdx * cdy - bdy * cdx) + blift * (cdx * ady - cdy * adx)
+           + clift * (adx * bdy - ady * bdx))
+    permanent = (alift * (abs(bdx * cdy) + abs(bdy * cdx)) + blift * (abs(cdx * ady) + abs(cdy * adx))
+                 + clift * (abs(adx * bdy) + abs(ady * bdx)))
+    if abs(det) > _INCIRCLE_BOUND * permanent:
+        return det
+    ax, ay, bx, by, cx, cy, dx, dy = _exact(px[a], py[a], px[b], py[b], px[c], py[c], px[d], py[d])
+    adx, ady = ax - dx, ay - dy
+    bdx, bdy = bx - dx, by - dy
+    cdx, cdy = cx - dx, cy - dy
+    return ((adx * adx + ady * ady) * (bdx * cdy - bdy * cdx)
+            + (bdx * bdx + bdy * bdy) * (cdx * ady - cdy * adx)
+            + (cdx * cdx + cdy * cdy) * (adx * bdy - ady * bdx))
+
+
+def _replace_neighbor(nbr: List[int], t: int, old: int, new: int):
+    base = 3 * t
+    if nbr[base] == old:
+        nbr[base] = new
+    elif nbr[base + 1] == old:
+        nbr[base + 1] = new
+    else:
+        nbr[base + 2] = new
+
+
+def _delaunay_python(px: List[float], py: List[float]):
+    """
+    Инкрементная триангуляция Делоне с перекладкой рёбер (Lawson) для
+    различных точек. Точки вставляются в порядке змейки по сетке, поэтому
+    поиск треугольника обходом от предыдущего короткий и вся вставка — около
+    O(n log n). Точки лежат внутри большого опорного треугольника; его
+    вершины в результат не попадают.
+
+    Треугольник t — вершины vert[3t:3t+3] против часовой стрелки и соседи
+    nbr[3t:3t+3]: nbr[3t+k] — треугольник за ребром напротив vert[3t+k] (-1 — нет).
+    Возвращает треугольники из исходных точек и рёбра между исходными точками
+    из треугольников с опорной вершиной.
+    """
+    n = len(px)
+    x0, y0, x1, y1 = min(px), min(py), max(px), max(py)
+    span = max(x1 - x0, y1 - y0) or 1.0
+    cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+    # Опорный треугольник очень велик: тогда треугольники у выпуклой оболочки
+    # почти не искажаются, а рёбра оболочки всё равно возвращаются
+    big = span * 1e4
+    px = px + [cx - 2 * big, cx + 2 * big, cx]
+    py = py + [cy - big, cy - big, cy + 2 * big]
+    vert = [n, n + 1, n + 2]
+    nbr = [-1, -1, -1]
+
+    side = max(1, int(math.sqrt(n / 4)))
+    cell = span / side
+
+    def snake(a):
+        row = min(side - 1, int((py[a] - y0) / cell))
+        col = min(side - 1, int((px[a] - x0) / cell))
+        return row, col if row % 2 == 0 else -col
+
+    t = 0
+    for p in sorted(range(n), key=snake):
+        # Поиск треугольника, содержащего p: шаг через ребро, от которого p справа
+        while True:
+            base = 3 * t
+            a, b, c = vert[base], vert[base + 1], vert[base + 2]
+            o0 = _orient(px, py, b, c, p)
+            if o0 < 0:
+                t = nbr[base]
+                continue
+            o1 = _orient(px, py, c, a, p)
+            if o1 < 0:
+                t = nbr[base + 1]
+                continue
+            o2 = _orient(px, py, a, b, p)
+            if o2 < 0:
+                t = nbr[base + 2]
+                continue
+            break
+
+        new = len(vert) // 3
+        if o0 and o1 and o2:
+            # Внутри треугольника: делим его на три
+            na, nb, nc = nbr[base], nbr[base + 1], nbr[base + 2]
+            t1, t2 = new, new + 1
+            vert[base:base + 3] = (a, b, p)
+            nbr[base:base + 3] = (t1, t2, nc)
+            vert += (b, c, p, c, a, p)
+            nbr += (t2, t, na, t, t1, nb)
+            if na >= 0:
+                _replace_neighbor(nbr, na, t, t1)
+            if nb >= 0:
+                _replace_neighbor(nbr, nb, t, t2)
+            stack = [(t, 2), (t1, 2), (t2, 2)]
+        else:
+            # На ребре напротив вершины k: делим два прилегающих треугольника на четыре
+            k = 0 if not o0 else 1 if not o1 else 2
+            a, b, c = vert[base + k], vert[base + (k + 1) % 3], vert[base + (k + 2) % 3]
+            x_ca, x_ab = nbr[base + (k + 1) % 3], nbr[base + (k + 2) % 3]
+            u = nbr[base + k]
+            ub = 3 * u
+            m = 0 if nbr[ub] == t else 1 if nbr[ub + 1] == t else 2
+            d = vert[ub + m]
+            x_bd, x_dc = nbr[ub + (m + 1) % 3], nbr[ub + (m + 2) % 3]
+            t2, u2 = new, new + 1
+            vert[base:base + 3] = (a, b, p)
+            nbr[base:base + 3] = (u2, t2, x_ab)
+            vert[ub:ub + 3] = (d, c, p)
+            nbr[ub:ub + 3] = (t2, u2, x_dc)
+            vert += (a, p, c, d, p, b)
+            nbr += (u, x_ca, t, t, x_bd, u)
+            if x_ca >= 0:
+                _replace_neighbor(nbr, x_ca, t, t2)
+            if x_bd >= 0:
+                _replace_neighbor(nbr, x_bd, u, u2)
+            stack = [(t, 2), (t2, 1), (u, 2), (u2, 1)]
+
+        # Перекладка рёбер напротив p, пока они не станут локально Делоне
+        while stack:
+            s, k = stack.pop()
+            sb = 3 * s
+            u = nbr[sb + k]
+            if u < 0:
+                continue
+            q, r = vert[sb + (k + 1) % 3], vert[sb + (k + 2) % 3]
+            ub = 3 * u
+            m = 0 if nbr[ub] == s else 1 if nbr[ub + 1] == s else 2
+            d = vert[ub + m]
+            if _incircle(px, py, p, q, r, d) <= 0:
+                continue
+            na, nb = nbr[sb + (k + 1) % 3], nbr[sb + (k + 2) % 3]
+            nc, nd = nbr[ub + (m + 1) % 3], nbr[ub + (m + 2) % 3]
+            vert[sb:sb + 3] = (p, q, d)
+            nbr[sb:sb + 3] = (nc, u, nb)
+            vert[ub:ub + 3] = (p, d, r)
+            nbr[ub:ub + 3] = (nd, na, s)
+            if nc >= 0:
+                _replace_neighbor(nbr, nc, u, s)
+            if na >= 0:
+                _replace_neighbor(nbr, na, s, u)
+            stack.append((s, 0))
+            stack.append((u, 0))
+
+    triangles = []
+    hull_edges = set()
+    for base in range(0, len(vert), 3):
+        a, b, c = vert[base], vert[base + 1], vert[base + 2]
+        if a < n and b < n and c < n:
+            triangles.append((a, b, c))
+        else:
+            for u, v in ((a, b), (b, c), (c, a)):
+                if u < n and v < n:
+                    hull_edges.add((u, v) if u < v else (v, u))
+    return triangles, sorted(hull_edges)
+
+
+# --------------------------------------------------------------------------
+@profiled("topology_edges")
+def topology_edges(nodes, method: str = "complete", k: int = DEFAULT_K,
+                   radius: Optional[float] = None) -> EdgeList:
+    """
+    Рёбра топологии method (см. METHODS) для узлов (список Node или NodeTable);
+    номера в EdgeList — позиции узлов. k — для knn, radius — для radius.
+    """
+    xs, ys = node_coordinates(nodes)
+    if method == "complete":
+        return complete_edges(xs, ys)
+    if method == "knn":
+        return knn_edges(xs, ys, k)
+    if method == "radius":
+        if radius is None:
+            raise ValueError("Для графа по радиусу нужен radius.")
+        return radius_edges(xs, ys, radius)
+    if method == "delaunay":
+        return delaunay_edges(xs, ys)
+    if method == "gabriel":
+        return gabriel_edges(xs, ys)
+    raise ValueError(f"Неизвестный способ построения топологии: {method}")
+
+
+def edges_from_pairs(nodes, pairs: Iterable[Tuple[int, int]]) -> EdgeList:
+    """EdgeList для пар позиций узлов (повторы и порядок концов не важны)."""
+    xs, ys = node_coordinates(nodes)
+    return _edge_list(pairs, xs, ys)
+
+
+def existing_pairs(nodes, connections) -> List[Tuple[int, int]]:
+    """Пары позиций узлов, уже связанных соединениями (концы сопоставляются по имени)."""
+    if isinstance(nodes, NodeTable):
+        index = nodes.index
+    else:
+        index = {}
+        for pos, node in enumerate(nodes):
+            index.setdefault(node.name, pos)
+    if isinstance(connections, ConnectionTable) and connections.nodes is nodes:
+        return list(zip(connections.node1, connections.node2))
+    pairs = []
+    for conn in connections:
+        a = index.get(conn.node1.name)
+        b = index.get(conn.node2.name)
+        if a is not None and b is not None:
+            pairs.append((a, b))
+    return pairs
+
+
+def make_connections(nodes, edges: EdgeList, cable: Cable, prefix: str = "auto_") -> List[Connection]:
+    """
+    Соединения по рёбрам: имена "<prefix><узел1>_<узел2>", длины берутся из
+    EdgeList (без пересчёта), стоимость — длина × cost_per_unit кабеля.
+    """
+    names = nodes.names if isinstance(nodes, NodeTable) else [node.name for node in nodes]
+    with_distance = Connection.with_distance
+    return [with_distance(f"{prefix}{names[a]}_{names[b]}", nodes[a], nodes[b], cable, d)
+            for a, b, d in zip(edges.i.tolist(), edges.j.tolist(), edges.distance.tolist())]
+
+
+def append_connections(table: ConnectionTable, edges: EdgeList, cable: Cable, prefix: str = "auto_") -> int:
+    """
+    Дописывает рёбра в ConnectionTable пачкой — столбцы расширяются целиком,
+    без ConnectionView на каждую строку. Номера в edges — строки table.nodes.
+    Возвращает число добавленных соединений.
+    """
+    names = table.nodes.names
+    i, j, distance = edges.i, edges.j, edges.distance
+    table.names.extend([f"{prefix}{names[a]}_{names[b]}" for a, b in zip(i.tolist(), j.tolist())])
+    if np is not None:
+        table.node1.frombytes(np.asarray(i, dtype=np.intc).tobytes())
+        table.node2.frombytes(np.asarray(j, dtype=np.intc).tobytes())
+        table.distance.frombytes(np.asarray(distance, dtype=float).tobytes())
+        table.cost.frombytes((np.asarray(distance, dtype=float) * cable.cost_per_unit).tobytes())
+    else:
+        table.node1.extend(i)
+        table.node2.extend(j)
+        table.distance.extend(distance)
+        table.cost.extend(d * cable.cost_per_unit for d in distance)
+    table.cable_ids.extend(array('i', [table.cable_id(cable)]) * len(edges))
+    return len(edges)
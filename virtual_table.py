@@ -0,0 +1,289 @@
+import tkinter as tk
+from bisect import bisect_left
+from tkinter import ttk
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Ключ строки таблицы: узел, соединение, пара (src, dst) и т. п.
+RowKey = Any
+
+
+class TableModel:
+    """
+    Модель таблицы без Tk: строки, сортировка и фильтр по имени узла.
+
+    load_rows()   — список ключей строк (узлы, соединения, пары матрицы трафика);
+    row_values(k) — значения колонок для отображения;
+    row_names(k)  — имена узлов строки, по которым работает фильтр;
+    sort_keys     — ключи сортировки по колонкам (по умолчанию — отображаемое значение).
+
+    Строки читаются лениво, при первом обращении после invalidate().
+    Фильтр ищет имена по префиксу через отсортированный список имён и индекс
+    «имя -> номера строк»; порядок сортировки по каждой колонке считается один
+    раз и переиспользуется, пока данные не изменились.
+    """
+    def __init__(self, columns: Sequence[str],
+                 load_rows: Callable[[], Sequence[RowKey]],
+                 row_values: Callable[[RowKey], Tuple],
+                 row_names: Callable[[RowKey], Iterable[str]],
+                 sort_keys: Optional[Dict[str, Callable[[RowKey], Any]]] = None):
+        self.columns = tuple(columns)
+        self._load_rows = load_rows
+        self._row_values = row_values
+        self._row_names = row_names
+        self._sort_keys = sort_keys or {}
+        self.filter_text = ""
+        self.sort_column: Optional[str] = None
+        self.sort_descending = False
+        self.invalidate()
+
+    def invalidate(self):
+        """Данные изменились: индексы и порядки сортировки будут построены заново."""
+        self._rows: Optional[Sequence[RowKey]] = None
+        self._name_index: Optional[Dict[str, List[int]]] = None
+        self._sorted_names: List[str] = []
+        self._orders: Dict[str, List[int]] = {}
+        self._view: Optional[List[int]] = None
+
+    @property
+    def rows(self) -> Sequence[RowKey]:
+        if self._rows is None:
+            self._rows = self._load_rows()
+            self._apply()
+        return self._rows
+
+    def _sort_key(self, column: str) -> Callable[[RowKey], Any]:
+        key = self._sort_keys.get(column)
+        if key is not None:
+            return key
+        i = self.columns.index(column)
+        return lambda k: self._row_values(k)[i]
+
+    def _build_name_index(self):
+        index: Dict[str, List[int]] = {}
+        for pos, key in enumerate(self.rows):
+            for name in set(self._row_names(key)):
+                index.setdefault(name, []).append(pos)
+        self._name_index = index
+        self._sorted_names = sorted(index)
+
+    def _filtered(self) -> Optional[List[int]]:
+        """Номера строк, у которых есть имя с префиксом filter_text (None — без фильтра)."""
+        prefix = self.filter_text
+        if not prefix:
+            return None
+        if self._name_index is None:
+            self._build_name_index()
+        names = self._sorted_names
+        matched = set()
+        i = bisect_left(names, prefix)
+        while i < len(names) and names[i].startswith(prefix):
+            matched.update(self._name_index[names[i]])
+            i += 1
+        return sorted(matched)
+
+    def _apply(self):
+        rows = self._rows
+        view = self._filtered()
+        column = self.sort_column
+        if column is not None:
+            key = self._sort_key(column)
+            if view is None:
+                order = self._orders.get(column)
+                if order is None:
+                    order = sorted(range(len(rows)), key=lambda pos: key(rows[pos]))
+                    self._orders[column] = order
+                view = order[::-1] if self.sort_descending else order
+            else:
+                view.sort(key=lambda pos: key(rows[pos]), reverse=self.sort_descending)
+        self._view = view
+
+    def set_filter(self, text: str):
+        self.filter_text = text.strip()
+        if self._rows is not None:
+            self._apply()
+
+    def sort_by(self, column: str, descending: Optional[bool] = None):
+        """Сортирует по колонке; повторный вызов без descending меняет направление."""
+        if descending is None:
+            descending = not self.sort_descending if column == self.sort_column else False
+        self.sort_column = column
+        self.sort_descending = descending
+        if self._rows is not None:
+            self._apply()
+
+    def __len__(self):
+        rows = self.rows
+        return len(rows) if self._view is None else len(self._view)
+
+    def key(self, i: int) -> RowKey:
+        rows = self.rows
+        return rows[i] if self._view is None else rows[self._view[i]]
+
+    def row(self, i: int) -> Tuple:
+        return self._row_values(self.key(i))
+
+
+class VirtualTreeview(ttk.Frame):
+    """
+    Таблица на ttk.Treeview, которая держит в Tk только видимое окно строк.
+
+    Строки Treeview создаются один раз по числу видимых позиций и при прокрутке
+    лишь получают новые значения из модели. Полоса прокрутки управляет смещением
+    в модели, а не в Treeview. Над таблицей — поле фильтра по имени узла
+    (show_filter=False — без него, если фильтры задаются снаружи); при
+    sortable=True щелчок по заголовку сортирует по колонке.
+
+    Модель — TableModel или любой объект с тем же интерфейсом
+    (columns, __len__, key, row, set_filter, sort_by, invalidate).
+    """
+    def __init__(self, master, model: TableModel, height: int = 10, headings: Optional[Sequence[str]] = None,
+                 filter_label: str = "Фильтр по узлу:", show_filter: bool = True, sortable: bool = True):
+        super().__init__(master)
+        self.model = model
+        self.offset = 0
+        self._selected: Optional[RowKey] = None
+
+        filter_frame = ttk.Frame(self)
+        filter_frame.pack(side=tk.TOP, fill=tk.X)
+        self.filter_var = tk.StringVar()
+        if show_filter:
+            ttk.Label(filter_frame, text=filter_label).pack(side=tk.LEFT, padx=5)
+            ttk.Entry(filter_frame, textvariable=self.filter_var).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+            self.filter_var.trace_add("write", lambda *_: self._on_filter())
+        self.count_label = ttk.Label(filter_frame, text="")
+        self.count_label.pack(side=tk.RIGHT, padx=5)
+
+        self.tree = ttk.Treeview(self, columns=model.columns, show="headings", height=height,
+                                 selectmode="browse")
+        for col, text in zip(model.columns, headings or model.columns):
+            if sortable:
+                self.tree.heading(col, text=text, command=lambda c=col: self._on_sort(c))
+            else:
+                self.tree.heading(col, text=text)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.LEFT, fill=tk.Y)
+
+        self._item_ids: List[str] = []
+        self._set_visible_rows(height)
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", self._on_wheel)
+        self.tree.bind("<Button-5>", self._on_wheel)
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<Up>", lambda e: self._step_selection(-1))
+        self.tree.bind("<Down>", lambda e: self._step_selection(1))
+        self.tree.bind("<Prior>", lambda e: self._scroll_rows(-len(self._item_ids)) or "break")
+        self.tree.bind("<Next>", lambda e: self._scroll_rows(len(self._item_ids)) or "break")
+        self.refresh()
+
+    # ------------------------------------------------------------------
+    def _set_visible_rows(self, count: int):
+        """Число строк Treeview = число видимых позиций; лишние удаляются, недостающие создаются."""
+        count = max(1, count)
+        while len(self._item_ids) < count:
+            self._item_ids.append(self.tree.insert("", tk.END, values=()))
+        while len(self._item_ids) > count:
+            self.tree.delete(self._item_ids.pop())
+
+    def _on_resize(self, event):
+        rowheight = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        # Одна строка высоты уходит на заголовок
+        rows = max(1, event.height // rowheight - 1)
+        if rows != len(self._item_ids):
+            self._set_visible_rows(rows)
+            self.refresh()
+
+    def refresh(self, reload: bool = False):
+        """Перерисовывает видимое окно; reload=True — данные модели изменились."""
+        if reload:
+            self.model.invalidate()
+        total = len(self.model)
+        window = len(self._item_ids)
+        self.offset = max(0, min(self.offset, total - window))
+        selected_item = None
+        for k, iid in enumerate(self._item_ids):
+            pos = self.offset + k
+            if pos < total:
+                key = self.model.key(pos)
+                self.tree.move(iid, "", k)  # возвращаем строку, если она была скрыта
+                self.tree.item(iid, values=self.model.row(pos))
+                if self._selected is not None and key == self._selected:
+                    selected_item = iid
+            else:
+                self.tree.detach(iid)
+        if selected_item is not None:
+            self.tree.selection_set(selected_item)
+        else:
+            self.tree.selection_set(())
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + window) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        self.count_label.configure(text=f"{total} строк")
+
+    # ------------------------------------------------------------------
+    def _scroll_rows(self, delta: int):
+        self.offset += delta
+        self.refresh()
+
+    def _on_scrollbar(self, *args):
+        total = len(self.model)
+        window = len(self._item_ids)
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * total)
+            self.refresh()
+        elif args[0] == "scroll":
+            step = window if args[2] == "pages" else 1
+            self._scroll_rows(int(args[1]) * step)
+
+    def _on_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self._scroll_rows(-3)
+        elif event.num == 5 or event.delta < 0:
+            self._scroll_rows(3)
+        return "break"
+
+    def _on_select(self, event):
+        selection = self.tree.selection()
+        if not selection:
+            return
+        k = self._item_ids.index(selection[0])
+        pos = self.offset + k
+        if pos < len(self.model):
+            self._selected = self.model.key(pos)
+
+    def _step_selection(self, delta: int):
+        """Стрелки: у края окна сдвигаем окно, а не уходим за пределы Treeview."""
+        selection = self.tree.selection()
+        k = self._item_ids.index(selection[0]) if selection else 0
+        pos = min(max(self.offset + k + delta, 0), max(len(self.model) - 1, 0))
+        if not len(self.model):
+            return "break"
+        self._selected = self.model.key(pos)
+        if pos < self.offset:
+            self.offset = pos
+        elif pos >= self.offset + len(self._item_ids):
+            self.offset = pos - len(self._item_ids) + 1
+        self.refresh()
+        self.tree.focus(self._item_ids[pos - self.offset])
+        return "break"
+
+    def _on_filter(self):
+        self.model.set_filter(self.filter_var.get())
+        self.reset_view()
+
+    def reset_view(self):
+        """Фильтр или порядок изменились: возвращаемся к первой строке."""
+        self.offset = 0
+        self.refresh()
+
+    def _on_sort(self, column: str):
+        self.model.sort_by(column)
+        self.reset_view()
+
+    # ------------------------------------------------------------------
+    def selected_key(self):
+        """Ключ выбранной строки (узел, соединение, пара) или None."""
+        return self._selected